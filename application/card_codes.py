@@ -0,0 +1,34 @@
+from typing import Dict, Tuple
+
+from common.types import COLORS, FACES
+
+# Card codes are numbered in common.types; every Card carries its own in Card.code.
+
+WILD_COLOR = COLORS.index("Wild")
+CODE_COUNT = len(COLORS) << 4
+
+COLOR_INDEX: Dict[str, int] = {color: index for index, color in enumerate(COLORS)}
+FACE_INDEX: Dict[str, int] = {face: index for index, face in enumerate(FACES)}
+
+
+def decode(code: int) -> Tuple[str, str]:
+    return COLORS[code >> 4], FACES[code & 0xF]
+
+
+def build_play_table() -> bytes:
+    """Row-major CODE_COUNT x CODE_COUNT table: table[card * CODE_COUNT + top] is 1 if card can go on top."""
+    table = bytearray(CODE_COUNT * CODE_COUNT)
+    for card in range(CODE_COUNT):
+        for top in range(CODE_COUNT):
+            if (card >> 4 == top >> 4 or
+                    card & 0xF == top & 0xF or
+                    card >> 4 == WILD_COLOR):
+                table[card * CODE_COUNT + top] = 1
+    return bytes(table)
+
+
+PLAY_TABLE = build_play_table()
+
+
+def can_play(card_code: int, top_code: int) -> bool:
+    return PLAY_TABLE[card_code * CODE_COUNT + top_code] == 1
@@ -0,0 +1,187 @@
+import random
+import struct
+from enum import IntEnum
+from typing import BinaryIO, Dict, Iterator, List, Tuple
+
+from application import card_codes
+from application.game_logic import GameLogic
+from application.snapshot import decode_game, encode_game
+from application.types import GameCheat
+
+# Every record is a header followed by its payload (little endian):
+#   header  : game id u64, event type u8, payload length u16
+#   START   : seed u64, player count u8, then per player: id length u8, id utf-8 (join order)
+#   PLAY    : seat u8, card id u32
+#   DRAW    : seat u8
+#   SAY_UNO : seat u8
+#   COLOR   : card id u32, color index u8 (card_codes.COLORS)
+#   CHEAT   : seat u8, cheat index u8 (GameCheat order)
+#   RESTORE : seed u64, application.snapshot game snapshot
+#   END     : empty
+# Only actions that succeeded are logged; everything they cause follows from the game's own RNG.
+HEADER = struct.Struct("<QBH")
+SEED = struct.Struct("<Q")
+SEAT = struct.Struct("<B")
+SEAT_CARD = struct.Struct("<BI")
+CARD_COLOR = struct.Struct("<IB")
+SEAT_CHEAT = struct.Struct("<BB")
+
+CHEATS = list(GameCheat)
+
+
+class EventType(IntEnum):
+    START = 1
+    PLAY = 2
+    DRAW = 3
+    SAY_UNO = 4
+    COLOR = 5
+    CHEAT = 6
+    RESTORE = 7
+    END = 8
+
+
+def pack_start(seed: int, player_ids: List[str]) -> bytes:
+    parts = [SEED.pack(seed), bytes([len(player_ids)])]
+    for player_id in player_ids:
+        encoded = player_id.encode()
+        parts.append(bytes([len(encoded)]) + encoded)
+    return b"".join(parts)
+
+
+def unpack_start(payload: memoryview) -> Tuple[int, List[str]]:
+    (seed,) = SEED.unpack_from(payload, 0)
+    offset = SEED.size + 1
+    player_ids = []
+    for _ in range(payload[SEED.size]):
+        length = payload[offset]
+        player_ids.append(bytes(payload[offset + 1:offset + 1 + length]).decode())
+        offset += 1 + length
+    return seed, player_ids
+
+
+class EventLogWriter:
+    """Appends game events to a binary log file.
+
+    Records go through a large write buffer, so logging an action is a struct pack and a
+    memory copy; the buffer reaches the file when it fills up, when a game ends and on close().
+    """
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16):
+        self.file: BinaryIO = open(path, "ab", buffering=buffer_size)
+        self.events_written = 0
+
+    def append(self, game_id: int, event_type: EventType, payload: bytes = b"") -> None:
+        self.file.write(HEADER.pack(game_id, event_type, len(payload)) + payload)
+        self.events_written += 1
+
+    def start(self, game_id: int, seed: int, player_ids: List[str]) -> None:
+        self.append(game_id, EventType.START, pack_start(seed, player_ids))
+
+    def play(self, game_id: int, seat: int, card_id: int) -> None:
+        self.append(game_id, EventType.PLAY, SEAT_CARD.pack(seat, card_id))
+
+    def draw(self, game_id: int, seat: int) -> None:
+        self.append(game_id, EventType.DRAW, SEAT.pack(seat))
+
+    def say_uno(self, game_id: int, seat: int) -> None:
+        self.append(game_id, EventType.SAY_UNO, SEAT.pack(seat))
+
+    def color(self, game_id: int, card_id: int, color: str) -> None:
+        self.append(game_id, EventType.COLOR, CARD_COLOR.pack(card_id, card_codes.COLOR_INDEX[color]))
+
+    def cheat(self, game_id: int, seat: int, game_cheat: GameCheat) -> None:
+        self.append(game_id, EventType.CHEAT, SEAT_CHEAT.pack(seat, CHEATS.index(game_cheat)))
+
+    def restore(self, game_id: int, seed: int, snapshot: bytes) -> None:
+        self.append(game_id, EventType.RESTORE, SEED.pack(seed) + snapshot)
+
+    def end(self, game_id: int) -> None:
+        self.append(game_id, EventType.END)
+        self.file.flush()
+
+    def resume(self, game_logic: GameLogic) -> None:
+        """Continues logging a game restored from a snapshot, under a new game id and RNG stream."""
+        game_logic.event_log = self
+        game_logic.game_id = random.getrandbits(64)
+        game_logic.seed_rng(random.getrandbits(64))
+        self.restore(game_logic.game_id, game_logic.seed, encode_game(game_logic))
+
+    def flush(self) -> None:
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_events(file: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[Tuple[int, EventType, memoryview]]:
+    """Yields (game id, event type, payload) for every complete record in a log, reading it in large chunks."""
+    buffer = b""
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            return
+        buffer = buffer + chunk if buffer else chunk
+        view = memoryview(buffer)
+
+        offset = 0
+        end = len(buffer)
+        while offset + HEADER.size <= end:
+            game_id, event_type, length = HEADER.unpack_from(view, offset)
+            payload_start = offset + HEADER.size
+            if payload_start + length > end:
+                break
+            yield game_id, EventType(event_type), view[payload_start:payload_start + length]
+            offset = payload_start + length
+
+        # A record cut off by the chunk boundary is completed by the next chunk.
+        buffer = bytes(view[offset:])
+
+
+def apply_event(game_logic: GameLogic, event_type: EventType, payload: memoryview) -> None:
+    """Replays one logged action on a GameLogic that is not writing to a log itself."""
+    if event_type == EventType.START:
+        seed, player_ids = unpack_start(payload)
+        game_logic.start_game(player_ids, seed=seed)
+    elif event_type == EventType.PLAY:
+        seat, card_id = SEAT_CARD.unpack_from(payload)
+        game_logic.play_card(game_logic.game_state.players[seat].id, card_id)
+    elif event_type == EventType.DRAW:
+        (seat,) = SEAT.unpack_from(payload)
+        game_logic.draw_card(game_logic.game_state.players[seat].id)
+    elif event_type == EventType.SAY_UNO:
+        (seat,) = SEAT.unpack_from(payload)
+        game_logic.say_uno(game_logic.game_state.players[seat].id)
+    elif event_type == EventType.COLOR:
+        card_id, color_index = CARD_COLOR.unpack_from(payload)
+        game_logic.change_wild_card_color(card_id, card_codes.COLORS[color_index])
+    elif event_type == EventType.CHEAT:
+        seat, cheat_index = SEAT_CHEAT.unpack_from(payload)
+        game_logic.activate_cheat_code(game_logic.game_state.players[seat].id, CHEATS[cheat_index])
+    elif event_type == EventType.RESTORE:
+        (seed,) = SEED.unpack_from(payload)
+        restored, _ = decode_game(bytes(payload[SEED.size:]))
+        game_logic.game_state = restored.game_state
+        game_logic.index_players()
+        game_logic.seed_rng(seed)
+
+
+def replay_games(file: BinaryIO) -> Iterator[Tuple[int, GameLogic]]:
+    """Rebuilds every game in a log and yields (game id, GameLogic) as each one ends.
+
+    Games from many lobbies are interleaved in one log, so only the games still running
+    are kept in memory. Games that never logged an END are yielded when the log runs out.
+    """
+    games: Dict[int, GameLogic] = {}
+    for game_id, event_type, payload in read_events(file):
+        if event_type == EventType.END:
+            game_logic = games.pop(game_id, None)
+            if game_logic is not None:
+                yield game_id, game_logic
+            continue
+
+        game_logic = games.get(game_id)
+        if game_logic is None:
+            game_logic = games[game_id] = GameLogic()
+        apply_event(game_logic, event_type, payload)
+
+    yield from games.items()
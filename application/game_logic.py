@@ -1,19 +1,55 @@
+import functools
+import itertools
+import logging
 import random
-from typing import List, Dict, Optional, TypeVar
+from typing import Callable, List, Dict, Optional, Set, Tuple, TypeVar
 
+from application import card_codes
 from application.types import GameCheat, Result, success, error
+from common.types import Card, GameState, Player
+from common.metrics import metrics
 
 T = TypeVar('T')
 
+logger = logging.getLogger(__name__)
+
+GAME_OPERATIONS = metrics.counter("uno_game_operations_total", "GameLogic actions by outcome", ["operation", "result"])
+RESHUFFLES = metrics.counter("uno_deck_reshuffles_total", "Times the discard pile was shuffled back into the deck")
+
+
+def counted(operation: str) -> Callable:
+    """Counts every call of a GameLogic action by whether it returned an error result.
+
+    Successful calls also bump GameLogic.version, which tells state stores whether a game changed.
+    """
+    succeeded = GAME_OPERATIONS.labels(operation, "success")
+    failed = GAME_OPERATIONS.labels(operation, "error")
+
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            result = method(*args, **kwargs)
+            if result is not None and not result:
+                failed.inc()
+            else:
+                args[0].version += 1
+                succeeded.inc()
+            return result
+
+        return wrapper
+
+    return decorate
+
 
 # Fisher-Yates shuffle algorithm
-def shuffle(array: List[T]) -> List[T]:
+def shuffle(array: List[T], rng: Optional[random.Random] = None) -> List[T]:
     """Shuffle array in-place using Fisher-Yates algorithm."""
+    randint = (rng or random).randint
     array_copy = array.copy()
     m = len(array_copy)
 
     while m:
-        i = random.randint(0, m - 1)
+        i = randint(0, m - 1)
         m -= 1
         array_copy[m], array_copy[i] = array_copy[i], array_copy[m]
 
@@ -21,24 +57,46 @@ def shuffle(array: List[T]) -> List[T]:
 
 
 class GameLogic:
-    def __init__(self):
-        self.game_state = {
-            "current_player_index": 0,
-            "deck": [],
-            "discard": [],
-            "is_reversed": False,
-            "players": []
-        }
+    def __init__(self, event_log=None):
+        self.game_state = GameState()
+        # player id -> seat index, and player id -> (card id -> position in hand)
+        self.player_seats: Dict[str, int] = {}
+        self.card_positions: Dict[str, Dict[int, int]] = {}
+        self.reshuffle_count = 0
+        # player id -> (playable cards in hand order, their ids); dropped when the hand or the top card changes.
+        self.playable_cards: Dict[str, Tuple[List[Card], Set[int]]] = {}
+        # player id -> version that changes whenever the hand does; versions are never reused within a GameLogic.
+        self.hand_versions: Dict[str, int] = {}
+        self.hand_version_counter = itertools.count(1)
+        # Number of successful actions and resets; see counted().
+        self.version = 0
+
+        # Every game draws from its own seeded RNG, so its event log is enough to replay it.
+        self.event_log = event_log
+        self.game_id = 0
+        self.seed = 0
+        # A Random takes about 2.5 KB, so an idle lobby has none until its game is seeded.
+        self.seeded_rng: Optional[random.Random] = None
+
+    @property
+    def rng(self) -> random.Random:
+        if self.seeded_rng is None:
+            self.seeded_rng = random.Random()
+        return self.seeded_rng
+
+    def seed_rng(self, seed: int) -> None:
+        self.seed = seed
+        self.seeded_rng = random.Random(seed)
 
     @staticmethod
-    def create_cards() -> List[Dict]:
+    def create_cards() -> List[Card]:
         colors = ["Blue", "Green", "Red", "Yellow"]
         faces = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "Skip", "Reverse", "Draw Two"]
         wild_faces = ["Wild", "Wild Draw Four"]
         cards = []
 
         def add_card(color, face):
-            cards.append({"color": color, "face": face, "id": len(cards)})
+            cards.append(Card(color, face, len(cards)))
 
         for color in colors:
             for face in faces:
@@ -54,203 +112,308 @@ class GameLogic:
         return cards
 
     @staticmethod
-    def distribute_cards(players, cards):
+    def distribute_cards(players: List[Player], cards: List[Card]) -> None:
         for player in players:
-            player["hand"] = cards[0:7]
+            player.hand = cards[0:7]
             del cards[0:7]
 
+    def is_started(self) -> bool:
+        return len(self.game_state.players) > 0
+
     def is_reversed(self) -> bool:
-        return self.game_state["is_reversed"]
+        return self.game_state.is_reversed
 
     def reset(self) -> None:
-        self.game_state["current_player_index"] = 0
-        self.game_state["deck"] = []
-        self.game_state["discard"] = []
-        self.game_state["is_reversed"] = False
-        self.game_state["players"] = []
-
-    def start_game(self, player_ids: List[str]) -> None:
-        players = [{"hand": [], "has_played_card": False, "has_said_uno": False, "id": pid} for pid in player_ids]
-        self.game_state["players"] = shuffle(players)
+        if self.event_log is not None and self.is_started():
+            self.event_log.end(self.game_id)
+
+        self.version += 1
+        self.game_state.current_player_index = 0
+        self.game_state.deck = []
+        self.game_state.discard = []
+        self.game_state.is_reversed = False
+        self.game_state.players = []
+        self.player_seats = {}
+        self.card_positions = {}
+        self.reshuffle_count = 0
+        self.playable_cards = {}
+        self.hand_versions = {}
+        self.seeded_rng = None
+
+    @counted("start_game")
+    def start_game(self, player_ids: List[str], seed: Optional[int] = None) -> None:
+        self.seed_rng(seed if seed is not None else random.getrandbits(64))
+        self.game_id = random.getrandbits(64)
+        if self.event_log is not None:
+            self.event_log.start(self.game_id, self.seed, player_ids)
+
+        players = [Player(pid) for pid in player_ids]
+        self.game_state.players = shuffle(players, self.rng)
 
         cards = GameLogic.create_cards()
-        self.game_state["deck"] = shuffle(cards)
+        self.game_state.deck = shuffle(cards, self.rng)
 
-        GameLogic.distribute_cards(self.game_state["players"], self.game_state["deck"])
+        GameLogic.distribute_cards(self.game_state.players, self.game_state.deck)
+        self.index_players()
 
-    def get_players(self) -> List[Dict]:
-        return self.game_state["players"].copy()
+    def index_players(self) -> None:
+        players = self.game_state.players
+        self.player_seats = {player.id: seat for seat, player in enumerate(players)}
+        self.card_positions = {
+            player.id: {card.id: position for position, card in enumerate(player.hand)}
+            for player in players
+        }
+        self.playable_cards = {}
+        self.hand_versions = {player.id: next(self.hand_version_counter) for player in players}
 
-    def get_player_cards(self, user_id: str) -> List[Dict]:
-        player = next((p for p in self.game_state["players"] if p["id"] == user_id), None)
-        if player is None:
+    def get_player(self, player_id: str) -> Player:
+        seat = self.player_seats.get(player_id)
+        if seat is None:
             raise ValueError("Player not found")
-        return player["hand"]
+        return self.game_state.players[seat]
+
+    def add_to_hand(self, player: Player, card: Card) -> None:
+        self.card_positions[player.id][card.id] = len(player.hand)
+        player.hand.append(card)
+        self.playable_cards.pop(player.id, None)
+        self.hand_versions[player.id] = next(self.hand_version_counter)
+
+    def remove_from_hand(self, player: Player, card_id: int) -> Card:
+        # The hand keeps its order, which is the order the hand view shows; only the cards after it move up.
+        hand = player.hand
+        positions = self.card_positions[player.id]
+        position = positions.pop(card_id)
+        self.playable_cards.pop(player.id, None)
+        self.hand_versions[player.id] = next(self.hand_version_counter)
+        card = hand.pop(position)
+        for index in range(position, len(hand)):
+            positions[hand[index].id] = index
+        return card
+
+    def get_players(self) -> List[Player]:
+        return self.game_state.players.copy()
+
+    def get_player_cards(self, user_id: str) -> List[Card]:
+        return self.get_player(user_id).hand
+
+    def get_player_card(self, user_id: str, card_id: int) -> Optional[Card]:
+        player = self.get_player(user_id)
+        position = self.card_positions[player.id].get(card_id)
+        if position is None:
+            return None
+        return player.hand[position]
 
-    def get_top_card(self) -> Optional[Dict]:
-        if len(self.game_state["discard"]) == 0:
+    def get_hand_version(self, user_id: str) -> int:
+        return self.hand_versions.get(user_id, 0)
+
+    def get_hand_size(self, user_id: str) -> int:
+        return len(self.get_player(user_id).hand)
+
+    def get_top_card(self) -> Optional[Card]:
+        if len(self.game_state.discard) == 0:
             return None
-        return self.game_state["discard"][-1]
+        return self.game_state.discard[-1]
+
+    def get_deck_cards(self) -> List[Card]:
+        return self.game_state.deck.copy()
+
+    def get_discard_cards(self) -> List[Card]:
+        return self.game_state.discard.copy()
 
-    def get_deck_cards(self) -> List[Dict]:
-        return self.game_state["deck"].copy()
+    def get_deck_count(self) -> int:
+        return len(self.game_state.deck)
 
-    def get_discard_cards(self) -> List[Dict]:
-        return self.game_state["discard"].copy()
+    def get_discard_count(self) -> int:
+        return len(self.game_state.discard)
 
-    def get_current_player(self) -> Dict:
-        return self.game_state["players"][self.game_state["current_player_index"]]
+    def get_current_player(self) -> Player:
+        return self.game_state.players[self.game_state.current_player_index]
 
     def next_turn(self) -> None:
         current_player = self.get_current_player()
 
-        if len(current_player["hand"]) == 1 and not current_player["has_said_uno"]:
+        if len(current_player.hand) == 1 and not current_player.has_said_uno:
             self.draw_cards(current_player, 2)
 
-        current_player["has_played_card"] = False
-        current_player["has_said_uno"] = False
+        current_player.has_played_card = False
+        current_player.has_said_uno = False
 
-        self.game_state["current_player_index"] = self.game_state["players"].index(self.get_next_player())
+        self.game_state.current_player_index = self.get_next_player_index()
 
-    def can_play_card(self, card: Dict, player_id: str) -> bool:
-        if len(self.game_state["discard"]) == 0:
+    def can_play_card(self, card: Card, player_id: str) -> bool:
+        if len(self.game_state.discard) == 0:
             return True
 
-        top_card = self.game_state["discard"][-1]
-        print(top_card)
-        can_play_others = (card["color"] == top_card["color"] or
-                           card["face"] == top_card["face"] or
-                           card["color"] == "Wild")
-        return can_play_others
+        top_card = self.game_state.discard[-1]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checking card against top card", extra={"card": card.id, "top_card": top_card.id})
+        return card_codes.can_play(card.code, top_card.code)
 
+    def get_playable(self, player_id: str) -> Tuple[List[Card], Set[int]]:
+        cached = self.playable_cards.get(player_id)
+        if cached is not None:
+            return cached
+
+        hand = self.get_player(player_id).hand
+        if not self.game_state.discard:
+            playable = list(hand)
+        else:
+            top_code = self.game_state.discard[-1].code
+            playable = [card for card in hand if card_codes.can_play(card.code, top_code)]
+
+        cached = self.playable_cards[player_id] = (playable, {card.id for card in playable})
+        return cached
+
+    def get_playable_cards(self, player_id: str) -> List[Card]:
+        """Cards the player could put on the current top card, in hand order. The list is shared, do not modify it."""
+        return self.get_playable(player_id)[0]
+
+    def get_playable_card_ids(self, player_id: str) -> Set[int]:
+        return self.get_playable(player_id)[1]
+
+    @counted("play_card")
     def play_card(self, player_id: str, card_id: int) -> Result:
-        player = next((p for p in self.game_state["players"] if p["id"] == player_id), None)
-        if player is None:
-            raise ValueError("Player not found")
+        player = self.get_player(player_id)
 
-        if player["id"] != self.get_current_player()["id"]:
+        if player.id != self.get_current_player().id:
             return error("Not the player's turn")
 
-        if player["has_played_card"]:
+        if player.has_played_card:
             return error("Player has already played a card")
 
-        card_index = next((i for i, card in enumerate(player["hand"]) if card["id"] == card_id), -1)
-        if card_index == -1:
+        card_index = self.card_positions[player.id].get(card_id)
+        if card_index is None:
             return error("Card not found in player's hand")
 
-        card = player["hand"][card_index]
+        card = player.hand[card_index]
         if not self.can_play_card(card, player_id):
             return error("Cannot play this card")
 
-        player["hand"].pop(card_index)
-        self.game_state["discard"].append(card)
-        player["has_played_card"] = True
+        if self.event_log is not None:
+            self.event_log.play(self.game_id, self.player_seats[player_id], card_id)
 
-        if card["face"] == "Wild Draw Four":
+        self.remove_from_hand(player, card_id)
+        self.game_state.discard.append(card)
+        self.playable_cards.clear()
+        player.has_played_card = True
+
+        if card.face == "Wild Draw Four":
             self.draw_cards(self.get_next_player(), 4)
-        elif card["face"] == "Wild Draw Eight":
+        elif card.face == "Wild Draw Eight":
             self.draw_cards(self.get_next_player(), 8)
             self.next_turn()
-        elif card["face"] == "Reverse":
-            self.game_state["is_reversed"] = not self.game_state["is_reversed"]
-        elif card["face"] == "Skip":
+        elif card.face == "Reverse":
+            self.game_state.is_reversed = not self.game_state.is_reversed
+        elif card.face == "Skip":
             self.next_turn()
-        elif card["face"] == "Draw Two":
+        elif card.face == "Draw Two":
             self.draw_cards(self.get_next_player(), 2)
             self.next_turn()
 
         self.next_turn()
         return success(None)
 
+    @counted("change_wild_card_color")
     def change_wild_card_color(self, card_id: int, new_color: str) -> Result:
-        last_card = self.game_state["discard"][-1]
-        if last_card["id"] != card_id:
+        last_card = self.game_state.discard[-1]
+        if last_card.id != card_id:
             return error("Last card is not this one.")
 
-        if last_card["color"] != "Wild":
+        if last_card.color != "Wild":
             raise ValueError("Last card in deck is not a Wild card")
 
-        last_card["color"] = new_color
+        if self.event_log is not None:
+            self.event_log.color(self.game_id, card_id, new_color)
+
+        last_card.color = new_color
+        self.playable_cards.clear()
         return success(None)
 
+    @counted("draw_card")
     def draw_card(self, player_id: str) -> Result:
-        player = next((p for p in self.game_state["players"] if p["id"] == player_id), None)
-        if player is None:
-            raise ValueError("Player not found")
+        player = self.get_player(player_id)
 
-        if player["id"] != self.get_current_player()["id"]:
+        if player.id != self.get_current_player().id:
             return error("Not the player's turn")
 
-        if player["has_played_card"]:
+        if player.has_played_card:
             return error("Player has already played a card")
 
+        if self.event_log is not None:
+            self.event_log.draw(self.game_id, self.player_seats[player_id])
+
         self.draw_cards(player, 1)
-        player["has_played_card"] = True
+        player.has_played_card = True
 
         self.next_turn()
         return success(None)
 
     def is_winner(self, id: str) -> bool:
-        player = next((p for p in self.game_state["players"] if p["id"] == id), None)
-        if player is None:
-            raise ValueError("Player not found")
+        player = self.get_player(id)
 
-        return len(player["hand"]) == 0
+        return len(player.hand) == 0
 
+    @counted("say_uno")
     def say_uno(self, id: str) -> Result:
-        player = next((p for p in self.game_state["players"] if p["id"] == id), None)
-        if player is None:
-            raise ValueError("Player not found")
+        player = self.get_player(id)
 
-        if player["has_said_uno"]:
+        if player.has_said_uno:
             return error("Player has already called UNO")
 
-        if len(player["hand"]) != 2:
+        if len(player.hand) != 2:
             return error("Player cannot call UNO unless they have exactly two cards")
 
-        player["has_said_uno"] = True
+        if self.event_log is not None:
+            self.event_log.say_uno(self.game_id, self.player_seats[id])
+
+        player.has_said_uno = True
         return success(None)
 
+    @counted("activate_cheat_code")
     def activate_cheat_code(self, player_id: str, game_cheat: GameCheat) -> Result:
-        if len(self.game_state["players"]) == 0:
+        if len(self.game_state.players) == 0:
             return error("Game has not started yet")
 
-        player = next((p for p in self.game_state["players"] if p["id"] == player_id), None)
-        if player is None:
-            raise ValueError("Player not found")
+        player = self.get_player(player_id)
 
         if game_cheat == GameCheat.GIVE_WILD_FOUR:
-            new_card_id = random.randint(10000, 10000000)
-            new_card = {"color": "Wild", "face": "Wild Draw Four", "id": new_card_id}
-            player["hand"].append(new_card)
+            new_card_id = self.rng.randint(10000, 10000000)
+            new_card = Card("Wild", "Wild Draw Four", new_card_id)
+            self.add_to_hand(player, new_card)
         elif game_cheat == GameCheat.GIVE_WILD_EIGHT:
-            new_card_id = random.randint(10000, 10000000)
-            new_card = {"color": "Wild", "face": "Wild Draw Eight", "id": new_card_id}
-            player["hand"].append(new_card)
+            new_card_id = self.rng.randint(10000, 10000000)
+            new_card = Card("Wild", "Wild Draw Eight", new_card_id)
+            self.add_to_hand(player, new_card)
         else:
             return error("Invalid cheat code")
 
+        if self.event_log is not None:
+            self.event_log.cheat(self.game_id, self.player_seats[player_id], game_cheat)
+
         return success(None)
 
-    def draw_cards(self, player: Dict, count: int) -> None:
+    def draw_cards(self, player: Player, count: int) -> None:
         for _ in range(count):
-            if len(self.game_state["deck"]) == 0:
-                discard_pile = self.game_state["discard"][:-1]
-                self.game_state["deck"] = shuffle(discard_pile)
-                self.game_state["discard"] = self.game_state["discard"][-1:]
-
-                for card in self.game_state["deck"]:
-                    if card["face"].startswith("Wild"):
-                        card["color"] = "Wild"
-
-            if self.game_state["deck"]:
-                card = self.game_state["deck"].pop()
-                player["hand"].append(card)
-
-    def get_next_player(self) -> Dict:
-        players_count = len(self.game_state["players"])
-        if self.game_state["is_reversed"]:
-            next_index = (self.game_state["current_player_index"] - 1) % players_count
-        else:
-            next_index = (self.game_state["current_player_index"] + 1) % players_count
-        return self.game_state["players"][next_index]
+            if len(self.game_state.deck) == 0:
+                discard_pile = self.game_state.discard[:-1]
+                self.game_state.deck = shuffle(discard_pile, self.rng)
+                self.game_state.discard = self.game_state.discard[-1:]
+                self.reshuffle_count += 1
+                RESHUFFLES.inc()
+
+                for card in self.game_state.deck:
+                    if card.face.startswith("Wild"):
+                        card.color = "Wild"
+
+            if self.game_state.deck:
+                card = self.game_state.deck.pop()
+                self.add_to_hand(player, card)
+
+    def get_next_player_index(self) -> int:
+        players_count = len(self.game_state.players)
+        if self.game_state.is_reversed:
+            return (self.game_state.current_player_index - 1) % players_count
+        return (self.game_state.current_player_index + 1) % players_count
+
+    def get_next_player(self) -> Player:
+        return self.game_state.players[self.get_next_player_index()]
@@ -0,0 +1,83 @@
+import struct
+from typing import List, Tuple
+
+from application import card_codes
+from application.game_logic import GameLogic
+from common.types import Card, GameState, Player
+
+# Layout (little endian):
+#   header  : magic "UNOG", version u8
+#   state   : current player index u16, is reversed u8, player count u16
+#   player  : id length u8, id utf-8, flags u8 (bit 0 has played, bit 1 said UNO), hand pile
+#   piles   : deck pile, discard pile
+#   pile    : card count u16, then per card: code u8 (see card_codes), id u32
+SNAPSHOT_MAGIC = b"UNOG"
+SNAPSHOT_VERSION = 1
+
+HEADER = struct.Struct("<4sB")
+STATE = struct.Struct("<HBH")
+CARD = struct.Struct("<BI")
+COUNT = struct.Struct("<H")
+
+
+def encode_pile(parts: List[bytes], cards: List[Card]) -> None:
+    parts.append(COUNT.pack(len(cards)))
+    pile = bytearray(CARD.size * len(cards))
+    for index, card in enumerate(cards):
+        CARD.pack_into(pile, index * CARD.size, card.code, card.id)
+    parts.append(bytes(pile))
+
+
+def decode_pile(data: memoryview, offset: int) -> Tuple[List[Card], int]:
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    cards = []
+    for code, card_id in CARD.iter_unpack(data[offset:offset + count * CARD.size]):
+        color, face = card_codes.decode(code)
+        cards.append(Card(color, face, card_id))
+    return cards, offset + count * CARD.size
+
+
+def encode_game(game_logic: GameLogic) -> bytes:
+    state = game_logic.game_state
+    parts = [HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION),
+             STATE.pack(state.current_player_index, int(state.is_reversed), len(state.players))]
+
+    for player in state.players:
+        player_id = player.id.encode()
+        flags = int(player.has_played_card) | int(player.has_said_uno) << 1
+        parts.append(bytes([len(player_id)]) + player_id + bytes([flags]))
+        encode_pile(parts, player.hand)
+
+    encode_pile(parts, state.deck)
+    encode_pile(parts, state.discard)
+    return b"".join(parts)
+
+
+def decode_game(data: bytes) -> Tuple[GameLogic, int]:
+    """Rebuilds a GameLogic from encode_game output and returns it with the number of bytes read."""
+    view = memoryview(data)
+    magic, version = HEADER.unpack_from(view, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a game snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported game snapshot version: {version}")
+
+    current_player_index, is_reversed, player_count = STATE.unpack_from(view, HEADER.size)
+    offset = HEADER.size + STATE.size
+
+    players = []
+    for _ in range(player_count):
+        id_length = view[offset]
+        player_id = bytes(view[offset + 1:offset + 1 + id_length]).decode()
+        flags = view[offset + 1 + id_length]
+        hand, offset = decode_pile(view, offset + 2 + id_length)
+        players.append(Player(player_id, hand, has_played_card=bool(flags & 1), has_said_uno=bool(flags & 2)))
+
+    deck, offset = decode_pile(view, offset)
+    discard, offset = decode_pile(view, offset)
+
+    game_logic = GameLogic()
+    game_logic.game_state = GameState(current_player_index, deck, discard, bool(is_reversed), players)
+    game_logic.index_players()
+    return game_logic, offset
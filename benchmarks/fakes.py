@@ -0,0 +1,149 @@
+"""In-memory stand-ins for the parts of discord's Interaction, Message and Context that GameUi touches."""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+# Seconds every fake Discord call takes; the load generator sets it, benchmarks keep it at 0.
+rest_latency = 0.0
+
+
+async def simulate_rest() -> None:
+    if rest_latency:
+        await asyncio.sleep(rest_latency)
+
+
+class FakeUser:
+    def __init__(self, user_id: int):
+        self.id = user_id
+        self.mention = f"<@{user_id}>"
+        self.name = f"player-{user_id}"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FakeUser) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+
+class FakeGuild:
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.sent: List["FakeMessage"] = []
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> "FakeMessage":
+        await simulate_rest()
+        message = FakeMessage(self, content=content, **kwargs)
+        self.sent.append(message)
+        return message
+
+
+class FakeMessage:
+    next_id = 1
+
+    def __init__(self, channel: Optional[FakeChannel] = None, **kwargs: Any):
+        self.id = FakeMessage.next_id
+        FakeMessage.next_id += 1
+        self.channel = channel
+        self.state: Dict[str, Any] = dict(kwargs)
+        # Filenames of the files on the message. Like Discord, an edit keeps them unless attachments= is passed.
+        self.attachments: List[str] = []
+        self.add_files(kwargs)
+        self.edits = 0
+        self.deleted = False
+
+    def add_files(self, kwargs: Dict[str, Any]) -> None:
+        if "attachments" in kwargs:
+            self.attachments = [getattr(attachment, "filename", attachment) for attachment in kwargs["attachments"]]
+        files = kwargs.get("files") or ([kwargs["file"]] if kwargs.get("file") is not None else [])
+        self.attachments.extend(file.filename for file in files)
+
+    async def edit(self, **kwargs: Any) -> "FakeMessage":
+        await simulate_rest()
+        self.state.update(kwargs)
+        self.add_files(kwargs)
+        self.edits += 1
+        return self
+
+    async def delete(self) -> None:
+        await simulate_rest()
+        self.deleted = True
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self.interaction = interaction
+        self.done = False
+
+    def is_done(self) -> bool:
+        return self.done
+
+    async def send_message(self, content: Optional[str] = None, **kwargs: Any) -> None:
+        await simulate_rest()
+        self.done = True
+        self.interaction.original_response = FakeMessage(content=content, **kwargs)
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        # Edits the message whose component was clicked.
+        self.done = True
+        if self.interaction.message is not None:
+            await self.interaction.message.edit(**kwargs)
+        else:
+            await simulate_rest()
+
+    async def defer(self, **kwargs: Any) -> None:
+        self.done = True
+
+
+class FakeInteraction:
+    def __init__(self, user: FakeUser, guild_id: int = 1, channel_id: int = 1, custom_id: str = "",
+                 message: Optional[FakeMessage] = None, interaction_type: Any = None):
+        self.user = user
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.data = {"custom_id": custom_id}
+        # The message the clicked component is on, and the discord.InteractionType main.on_interaction checks.
+        self.message = message
+        self.type = interaction_type
+        self.command = None
+        self.response = FakeResponse(self)
+        self.original_response: Optional[FakeMessage] = None
+        self.deleted = False
+
+    async def delete_original_response(self) -> None:
+        await simulate_rest()
+        self.deleted = True
+
+    async def edit_original_response(self, **kwargs: Any) -> Optional[FakeMessage]:
+        if self.original_response is None:
+            await simulate_rest()
+            return None
+        await self.original_response.edit(**kwargs)
+        return self.original_response
+
+
+class FakeContext:
+    def __init__(self, author: FakeUser, guild_id: int = 1, channel_id: int = 1):
+        self.author = author
+        self.guild = FakeGuild(guild_id)
+        self.channel = FakeChannel(channel_id)
+
+    async def send(self, content: Optional[str] = None, **kwargs: Any) -> FakeMessage:
+        return await self.channel.send(content=content, **kwargs)
+
+
+class FakeUploader:
+    """Stand-in for the asset channel upload used by CardImageUrlCache."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.uploaded: List[str] = []
+
+    async def upload(self, file: Any) -> str:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.uploaded.append(file.filename)
+        return f"https://cdn.example.invalid/cards/{file.filename}"
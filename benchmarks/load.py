@@ -0,0 +1,234 @@
+"""End-to-end load test of the bot against a fake Discord.
+
+Virtual players open lobbies with the real !uno command and play them through the real
+main.on_interaction, so every click goes through the interaction router, the lobby
+actors, GameUi and the REST scheduler. Only the Discord objects are fakes (see
+benchmarks.fakes), answering after --rest-latency seconds. Each stage runs more lobbies
+at once and reports interactions per second, handler latency and event-loop lag.
+
+    python -m benchmarks.load                                # 10, 100 and 1000 lobbies
+    python -m benchmarks.load --lobbies 500 --click-rate 2   # one stage, 2 clicks/s per lobby
+    python -m benchmarks.load --rest-latency 0.05 --json     # 50 ms Discord round trips, JSON report
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from benchmarks import fakes
+from benchmarks.fakes import FakeContext, FakeInteraction, FakeMessage, FakeUser
+from commands.ai_players import ai_players
+from commands.card_assets import card_images
+from commands.game_ui import HAND_DRAW_CUSTOM_ID
+from commands.snapshot_store import MemorySnapshotStore, SnapshotWriter
+
+# Real user ids are snowflakes; these stay clear of the ids AI seats use.
+USER_ID_BASE = 10 ** 15
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class LoadHarness:
+    def __init__(self, bot_module, click_rate: float, players: int, bots: int, bystander_ratio: float, seed: int):
+        self.bot = bot_module
+        self.click_rate = click_rate
+        self.players = players
+        self.bots = bots
+        self.bystander_ratio = bystander_ratio
+        self.rng = random.Random(seed)
+
+        self.measuring = False
+        self.latencies: List[float] = []
+        self.lags: List[float] = []
+        self.errors = 0
+        self.first_error: Optional[str] = None
+        self.games_finished = 0
+
+    def think_time(self) -> float:
+        return self.rng.expovariate(self.click_rate)
+
+    async def timed(self, call) -> None:
+        started_at = time.perf_counter()
+        try:
+            await call
+        except Exception as e:
+            if self.measuring:
+                self.errors += 1
+                self.first_error = self.first_error or repr(e)
+        if self.measuring:
+            self.latencies.append(time.perf_counter() - started_at)
+
+    async def monitor_lag(self, interval: float = 0.01) -> None:
+        # How late a short sleep wakes up is how long the loop was busy with something else.
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(interval)
+            if self.measuring:
+                self.lags.append(time.perf_counter() - started_at - interval)
+
+    async def run_stage(self, lobbies: int, warmup: float, duration: float) -> Dict[str, Any]:
+        virtual_lobbies = [VirtualLobby(self, index) for index in range(lobbies)]
+        tasks = [asyncio.create_task(lobby.run()) for lobby in virtual_lobbies]
+        monitor = asyncio.create_task(self.monitor_lag())
+
+        await asyncio.sleep(warmup)
+        self.latencies, self.lags, self.errors, self.first_error, self.games_finished = [], [], 0, None, 0
+        self.measuring = True
+        started_at = time.perf_counter()
+        await asyncio.sleep(duration)
+        elapsed = time.perf_counter() - started_at
+        self.measuring = False
+
+        for task in (*tasks, monitor):
+            task.cancel()
+        await asyncio.gather(*tasks, monitor, return_exceptions=True)
+        for game_ui in list(self.bot.game_registry.games.values()):
+            game_ui.reset_game()
+
+        return {
+            "lobbies": lobbies,
+            "interactions": len(self.latencies),
+            "interactions_per_second": len(self.latencies) / elapsed,
+            "latency_p50_ms": percentile(self.latencies, 0.5) * 1000,
+            "latency_p99_ms": percentile(self.latencies, 0.99) * 1000,
+            "latency_max_ms": max(self.latencies, default=0.0) * 1000,
+            "loop_lag_p50_ms": percentile(self.lags, 0.5) * 1000,
+            "loop_lag_p99_ms": percentile(self.lags, 0.99) * 1000,
+            "loop_lag_max_ms": max(self.lags, default=0.0) * 1000,
+            "games_finished": self.games_finished,
+            "errors": self.errors,
+            "first_error": self.first_error,
+        }
+
+
+class VirtualLobby:
+    """One channel whose players open a lobby, play it to the end, close it and start over."""
+
+    def __init__(self, harness: LoadHarness, index: int):
+        self.harness = harness
+        self.guild_id = self.channel_id = index + 1
+        self.users = [FakeUser(USER_ID_BASE + index * 100 + seat) for seat in range(harness.players)]
+        self.users_by_id = {str(user.id): user for user in self.users}
+        self.board: Optional[FakeMessage] = None
+
+    async def click(self, user: FakeUser, custom_id: str, message: Optional[FakeMessage] = None) -> FakeInteraction:
+        await asyncio.sleep(self.harness.think_time())
+        interaction = FakeInteraction(user, self.guild_id, self.channel_id, custom_id, message=message or self.board,
+                                      interaction_type=discord.InteractionType.component)
+        await self.harness.timed(self.harness.bot.on_interaction(interaction))
+        return interaction
+
+    async def open_lobby(self) -> None:
+        initiator = self.users[0]
+        await asyncio.sleep(self.harness.think_time())
+        context = FakeContext(initiator, self.guild_id, self.channel_id)
+        await self.harness.timed(self.harness.bot.start.callback(context))
+        self.board = context.channel.sent[-1] if context.channel.sent else None
+
+        for user in self.users[1:]:
+            await self.click(user, "join-btn")
+        for _ in range(self.harness.bots):
+            await self.click(initiator, "add-bot-btn")
+        await self.click(initiator, "start-btn")
+
+    async def take_turn(self, game_ui, user: FakeUser) -> None:
+        player_id = str(user.id)
+        if game_ui.game_logic.get_hand_size(player_id) == 2:
+            await self.click(user, "say-uno-btn")
+
+        hand = (await self.click(user, "show-cards-btn")).original_response
+        view = hand.state.get("view") if hand is not None else None
+        if view is None:
+            return
+
+        cards = [button for button in view.children
+                 if button.custom_id.startswith("card-") and not button.disabled]
+        if not cards:
+            await self.click(user, HAND_DRAW_CUSTOM_ID, message=hand)
+            return
+
+        prompt = (await self.click(user, self.harness.rng.choice(cards).custom_id, message=hand)).original_response
+        # A wild card answers with a color picker instead of playing the card.
+        colors = prompt.state.get("view") if prompt is not None else None
+        if colors is not None:
+            await self.click(user, self.harness.rng.choice(colors.children).custom_id, message=prompt)
+
+    async def run(self) -> None:
+        registry = self.harness.bot.game_registry
+        while True:
+            await self.open_lobby()
+            while True:
+                game_ui = registry.get(self.guild_id, self.channel_id)
+                if game_ui is None or game_ui.message is None or not game_ui.game_logic.is_started():
+                    break
+                if game_ui.winner_message is not None:
+                    if self.harness.measuring:
+                        self.harness.games_finished += 1
+                    await self.click(self.users[0], "cancel-btn")
+                    break
+
+                user = self.users_by_id.get(game_ui.game_logic.get_current_player().id)
+                if user is None or self.harness.rng.random() < self.harness.bystander_ratio:
+                    # An AI seat is moving, or someone who is waiting looks at their cards.
+                    await self.click(self.harness.rng.choice(self.users), "show-cards-btn")
+                else:
+                    await self.take_turn(game_ui, user)
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    # Imported here so the bot's module-level setup only runs when a load test does.
+    import main
+
+    fakes.rest_latency = args.rest_latency
+    card_images.load()
+    ai_players.move_delay = args.ai_delay
+    if args.snapshots:
+        main.game_registry.set_snapshots(SnapshotWriter(MemorySnapshotStore()))
+
+    harness = LoadHarness(main, args.click_rate, args.players, args.bots, args.bystander_ratio, args.seed)
+    results = []
+    for lobbies in args.lobbies:
+        result = await harness.run_stage(lobbies, args.warmup, args.duration)
+        results.append(result)
+        if not args.json:
+            print(f"{lobbies:>6} lobbies {result['interactions_per_second']:>9,.0f} interactions/s "
+                  f"latency p50 {result['latency_p50_ms']:7.2f} ms p99 {result['latency_p99_ms']:8.2f} ms "
+                  f"loop lag p99 {result['loop_lag_p99_ms']:7.2f} ms  games {result['games_finished']:>5} "
+                  f"errors {result['errors']}", flush=True)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lobbies", type=lambda value: [int(part) for part in value.split(",")],
+                        default=[10, 100, 1000], help="Concurrent lobbies per stage, comma separated")
+    parser.add_argument("--players", type=int, default=4, help="Virtual players per lobby")
+    parser.add_argument("--bots", type=int, default=0, help="AI seats added to every lobby")
+    parser.add_argument("--click-rate", type=float, default=5.0, help="Average clicks per second per lobby")
+    parser.add_argument("--bystander-ratio", type=float, default=0.2,
+                        help="Share of clicks by players who are not on turn")
+    parser.add_argument("--rest-latency", type=float, default=0.0, help="Seconds every fake Discord call takes")
+    parser.add_argument("--ai-delay", type=float, default=0.0, help="Pause before every AI move")
+    parser.add_argument("--snapshots", action="store_true", help="Write lobby snapshots to an in-memory store")
+    parser.add_argument("--warmup", type=float, default=2.0)
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Memory used per lobby and per game, for sizing hosts.
+
+Builds many copies of each object under tracemalloc and reports the bytes each copy
+adds, plus the total for --tables simultaneous tables. Discord members are created
+outside the measurement, since the gateway caches them whether or not they play.
+
+    python -m benchmarks.memory                        # 4 players, projected for 10k tables
+    python -m benchmarks.memory --players 8 --tables 50000 --json
+"""
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List
+
+from application.game_logic import GameLogic
+from application.snapshot import encode_game
+from common.types import Card
+
+
+def measure(build: Callable[[int], Any], count: int) -> float:
+    """Returns the bytes one object returned by build(index) keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(index) for index in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+async def measure_async(build: Callable[[int], Awaitable[Any]], count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [await build(index) for index in range(count)]
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objects
+    return (after - before) / count
+
+
+def new_game(players: int) -> GameLogic:
+    game_logic = GameLogic()
+    game_logic.start_game([str(index) for index in range(players)])
+    return game_logic
+
+
+def measure_logic(players: int, count: int) -> Dict[str, float]:
+    return {
+        "card": measure(lambda index: Card("Red", "7", index), count * 100),
+        "card_as_dict": measure(lambda index: {"color": "Red", "face": "7", "id": index}, count * 100),
+        "game_logic_idle": measure(lambda _: GameLogic(), count),
+        f"game_logic_started[players={players}]": measure(lambda _: new_game(players), count),
+        f"snapshot_bytes[players={players}]": float(len(encode_game(new_game(players)))),
+    }
+
+
+async def measure_ui(players: int, count: int) -> Dict[str, float]:
+    from benchmarks.fakes import FakeInteraction, FakeMessage, FakeUser
+    from commands.game_registry import GameRegistry
+
+    registry = GameRegistry()
+    users = [[FakeUser(lobby * 100 + seat) for seat in range(players)] for lobby in range(count * 2)]
+
+    def open_lobby(index: int):
+        game_ui = registry.get_or_create(index, index)
+        game_ui.players = list(users[index])
+        game_ui.initiator = game_ui.players[0]
+        game_ui.message = FakeMessage()
+        return game_ui
+
+    async def play_lobby(index: int):
+        game_ui = open_lobby(count + index)
+        await game_ui.start_game()
+        game_ui.board.cancel()
+        # Every player has their hand open, which caches its view and keeps the interaction.
+        for user in game_ui.players:
+            await game_ui.handle_show_cards_button(FakeInteraction(user, count + index, count + index,
+                                                                   custom_id="show-cards-btn"))
+        game_ui.get_game_message_content()
+        return game_ui
+
+    results = {
+        f"lobby_idle[players={players}]": measure(open_lobby, count),
+        f"lobby_playing[players={players}]": await measure_async(play_lobby, count),
+    }
+    for game_ui in list(registry.games.values()):
+        game_ui.reset_game()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--count", type=int, default=500, help="Copies built per measurement")
+    parser.add_argument("--tables", type=int, default=10000, help="Simultaneous tables to project the totals for")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    results = measure_logic(args.players, args.count)
+    try:
+        results.update(asyncio.run(measure_ui(args.players, args.count)))
+    except ImportError as e:
+        print(f"Skipping lobby measurements: {e}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps({"tables": args.tables, "bytes": results}, indent=2))
+        return
+
+    rows: List[str] = []
+    for name, size in results.items():
+        total = f"{size * args.tables / 2 ** 20:>10,.1f} MiB" if not name.startswith("card") else ""
+        rows.append(f"{name:40} {size:>12,.0f} B {total}")
+    print(f"{'':40} {'each':>14} {f'x {args.tables:,}':>14}")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
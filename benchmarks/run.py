@@ -0,0 +1,332 @@
+"""Offline benchmarks for the GameLogic and GameUi hot paths.
+
+    python -m benchmarks.run                 # run and compare against benchmarks/baseline.json
+    python -m benchmarks.run --save          # run and store the results as the new baseline
+    python -m benchmarks.run --filter play   # only benchmarks whose name contains "play"
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from application.game_logic import GameLogic
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+# A benchmark gets an operation count, does its setup, and returns a callable that runs exactly that many operations.
+Benchmark = Callable[[int], Callable[[], None]]
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = function
+        return function
+
+    return register
+
+
+def new_game(players: int, hand_size: int = 7, seed: int = 0) -> GameLogic:
+    random.seed(seed)
+    game_logic = GameLogic()
+    game_logic.start_game([str(index) for index in range(players)])
+    for player in game_logic.game_state.players:
+        game_logic.draw_cards(player, max(0, hand_size - len(player.hand)))
+    return game_logic
+
+
+def find_playable(game_logic: GameLogic) -> Optional[Tuple[str, int]]:
+    player_id = game_logic.get_current_player().id
+    for card in game_logic.get_player_cards(player_id):
+        if card.color != "Wild" and game_logic.can_play_card(card, player_id):
+            return player_id, card.id
+    return None
+
+
+def register_logic_benchmarks() -> None:
+    for players in (2, 4, 10):
+        @benchmark(f"start_game[players={players}]")
+        def start_game(n: int, players: int = players) -> Callable[[], None]:
+            player_ids = [str(index) for index in range(players)]
+            games = [GameLogic() for _ in range(n)]
+
+            def run() -> None:
+                for game_logic in games:
+                    game_logic.start_game(player_ids)
+
+            return run
+
+    for players, hand_size in ((2, 7), (4, 7), (4, 30), (10, 7)):
+        @benchmark(f"play_card[players={players},hand={hand_size}]")
+        def play_card(n: int, players: int = players, hand_size: int = hand_size) -> Callable[[], None]:
+            moves = []
+            while len(moves) < n:
+                game_logic = new_game(players, hand_size, seed=len(moves))
+                move = find_playable(game_logic)
+                if move is not None:
+                    moves.append((game_logic, move))
+
+            def run() -> None:
+                for game_logic, (player_id, card_id) in moves:
+                    game_logic.play_card(player_id, card_id)
+
+            return run
+
+    for discard_size in (10, 80):
+        @benchmark(f"draw_cards_reshuffle[discard={discard_size}]")
+        def draw_cards_reshuffle(n: int, discard_size: int = discard_size) -> Callable[[], None]:
+            games = []
+            for index in range(n):
+                game_logic = new_game(2, seed=index)
+                state = game_logic.game_state
+                state.discard = state.deck[:discard_size]
+                state.deck = []
+                games.append(game_logic)
+
+            def run() -> None:
+                for game_logic in games:
+                    game_logic.draw_cards(game_logic.get_current_player(), 1)
+
+            return run
+
+    for hand_size in (7, 25, 60):
+        @benchmark(f"can_play_card_full_hand[hand={hand_size}]")
+        def can_play_card_full_hand(n: int, hand_size: int = hand_size) -> Callable[[], None]:
+            game_logic = new_game(2, hand_size)
+            move = find_playable(game_logic)
+            if move is not None:
+                game_logic.play_card(*move)
+            player_id = game_logic.get_current_player().id
+            hand = game_logic.get_player_cards(player_id)
+
+            def run() -> None:
+                for _ in range(n):
+                    for card in hand:
+                        game_logic.can_play_card(card, player_id)
+
+            return run
+
+        @benchmark(f"get_playable_cards[hand={hand_size}]")
+        def get_playable_cards(n: int, hand_size: int = hand_size) -> Callable[[], None]:
+            game_logic = new_game(2, hand_size)
+            move = find_playable(game_logic)
+            if move is not None:
+                game_logic.play_card(*move)
+            player_id = game_logic.get_current_player().id
+
+            def run() -> None:
+                for _ in range(n):
+                    game_logic.get_playable_cards(player_id)
+
+            return run
+
+        @benchmark(f"get_playable_cards_cold[hand={hand_size}]")
+        def get_playable_cards_cold(n: int, hand_size: int = hand_size) -> Callable[[], None]:
+            # The first lookup after a play, which drops every cached hand, so the hand is scanned.
+            games = []
+            while len(games) < n:
+                game_logic = new_game(2, hand_size, seed=len(games))
+                move = find_playable(game_logic)
+                if move is not None:
+                    game_logic.play_card(*move)
+                    games.append((game_logic, game_logic.get_current_player().id))
+
+            def run() -> None:
+                for game_logic, player_id in games:
+                    game_logic.get_playable_cards(player_id)
+
+            return run
+
+    @benchmark("mcts_choose_move[playouts=50]")
+    def mcts_choose_move(n: int) -> Callable[[], None]:
+        from simulation.policies import MonteCarloPolicy
+
+        game_logic = new_game(4)
+        player_id = game_logic.get_current_player().id
+        policy = MonteCarloPolicy(max_iterations=50)
+        rng = random.Random(0)
+
+        def run() -> None:
+            for _ in range(n):
+                policy.choose_move(game_logic, player_id, rng)
+
+        return run
+
+
+def register_ui_benchmarks() -> None:
+    from benchmarks.fakes import FakeInteraction, FakeMessage, FakeUser
+    from commands.game_registry import GameRegistry
+
+    def new_game_ui(players: int, hand_size: int):
+        game_ui = GameRegistry().get_or_create(1, 1)
+        game_ui.players = [FakeUser(index) for index in range(players)]
+        game_ui.initiator = game_ui.players[0]
+        game_ui.message = FakeMessage()
+        game_ui.game_logic = new_game(players, hand_size)
+        move = find_playable(game_ui.game_logic)
+        if move is not None:
+            game_ui.game_logic.play_card(*move)
+        return game_ui
+
+    for players in (2, 4, 10):
+        @benchmark(f"get_game_message_content[players={players}]")
+        def get_game_message_content(n: int, players: int = players) -> Callable[[], None]:
+            game_ui = new_game_ui(players, 7)
+
+            def run() -> None:
+                for _ in range(n):
+                    game_ui.get_game_message_content()
+
+            return run
+
+    for hand_size in (7, 24):
+        @benchmark(f"handle_show_cards_button[hand={hand_size}]")
+        def handle_show_cards_button(n: int, hand_size: int = hand_size) -> Callable[[], None]:
+            game_ui = new_game_ui(4, hand_size)
+            user = game_ui.players[int(game_ui.game_logic.get_current_player().id)]
+            interactions = [FakeInteraction(user, custom_id="show-cards-btn") for _ in range(n)]
+
+            async def show_cards() -> None:
+                for interaction in interactions:
+                    await game_ui.handle_show_cards_button(interaction)
+
+            loop = asyncio.new_event_loop()
+
+            def run() -> None:
+                loop.run_until_complete(show_cards())
+
+            return run
+
+    @benchmark("board_edit_card_upload")
+    def board_edit_card_upload(n: int) -> Callable[[], None]:
+        # One operation: the top card goes out as an attachment while cold, then again once its upload finished.
+        from benchmarks.fakes import FakeUploader
+        from commands.card_assets import card_images, card_urls
+
+        card_images.load()
+        game_ui = new_game_ui(4, 7)
+
+        async def edit_board() -> None:
+            message = game_ui.message
+            await message.edit(**game_ui.get_board_payload())
+            await asyncio.gather(*card_urls.background_tasks)
+            await message.edit(**game_ui.get_board_payload())
+
+            image_url = game_ui.board_embed.image_url
+            expected = [image_url[len("attachment://"):]] if image_url.startswith("attachment://") else []
+            if message.attachments != expected:
+                raise AssertionError(f"Board shows {image_url} with attachments {message.attachments}")
+
+        async def edit_boards() -> None:
+            try:
+                for _ in range(n):
+                    card_urls.set_uploader(FakeUploader())
+                    await edit_board()
+            finally:
+                card_urls.set_uploader(None)
+
+        loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            loop.run_until_complete(edit_boards())
+
+        return run
+
+
+def measure(benchmark_function: Benchmark, target_time: float, repeats: int, max_ops: int) -> Dict[str, float]:
+    # Calibrate the operation count so one repeat takes roughly target_time; setup cost is capped by max_ops.
+    n = 1
+    while True:
+        run = benchmark_function(n)
+        started_at = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started_at
+        if elapsed >= target_time / 10 or n >= max_ops:
+            break
+        n *= 10
+    n = max(1, min(max_ops, int(n * target_time / max(elapsed, 1e-9))))
+
+    best = float("inf")
+    for _ in range(repeats):
+        run = benchmark_function(n)
+        started_at = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started_at)
+
+    run = benchmark_function(n)
+    tracemalloc.start()
+    run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"ops_per_sec": n / best, "bytes_per_op": current / n, "peak_bytes_per_op": peak / n}
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result["ops_per_sec"] < expected["ops_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['ops_per_sec']:.0f} ops/s, baseline {expected['ops_per_sec']:.0f}")
+        if result["peak_bytes_per_op"] > expected["peak_bytes_per_op"] * (1 + tolerance) + 64:
+            regressions.append(f"{name}: {result['peak_bytes_per_op']:.0f} B/op, "
+                               f"baseline {expected['peak_bytes_per_op']:.0f}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--time", type=float, default=0.2, help="Seconds per repeat")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-ops", type=int, default=5000, help="Upper bound on operations per repeat")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before failing")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    args = parser.parse_args()
+
+    register_logic_benchmarks()
+    try:
+        register_ui_benchmarks()
+    except ImportError as e:
+        print(f"Skipping GameUi benchmarks: {e}", file=sys.stderr)
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+
+    results = {}
+    for name, benchmark_function in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        # Keep diagnostic prints from the code under test out of the report.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = measure(benchmark_function, args.time, args.repeats, args.max_ops)
+        results[name] = result
+
+        expected = baseline.get(name)
+        change = f"{result['ops_per_sec'] / expected['ops_per_sec'] - 1:+.0%}" if expected else "new"
+        print(f"{name:50} {result['ops_per_sec']:>14,.0f} ops/s {result['peak_bytes_per_op']:>10,.0f} B/op  {change}")
+
+    if args.save:
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("\nRegressions:\n" + "\n".join(regressions))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import asyncio
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from application.game_logic import GameLogic
+from application.snapshot import encode_game
+from common.metrics import metrics
+from simulation.policies import MonteCarloPolicy, get_policy, search_move
+
+# Discord snowflakes are far larger than this, so smaller member ids can only belong to AI seats.
+AI_ID_LIMIT = 1 << 20
+
+MOVE_SECONDS = metrics.histogram("uno_ai_move_seconds", "Time an AI seat needed to pick its move", ["policy"])
+MOVE_PLAYOUTS = metrics.counter("uno_ai_playouts_total", "Monte-Carlo playouts run for AI moves")
+
+
+def is_ai_player(player_id) -> bool:
+    return int(player_id) < AI_ID_LIMIT
+
+
+class AiMember:
+    """Stands in for a discord.Member in GameUi.players for a seat played by the bot."""
+
+    def __init__(self, member_id: int):
+        if not 0 < member_id < AI_ID_LIMIT:
+            raise ValueError(f"AI member ids must be between 1 and {AI_ID_LIMIT - 1}")
+        self.id = member_id
+        self.bot = True
+
+    @property
+    def name(self) -> str:
+        return f"UNO Bot {self.id}"
+
+    @property
+    def display_name(self) -> str:
+        return self.name
+
+    @property
+    def mention(self) -> str:
+        return f"🤖 {self.name}"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, AiMember) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class AiPlayers:
+    """Picks moves for AI seats.
+
+    Heuristic policies answer in microseconds and run on the event loop. The "mcts" policy
+    searches in a process pool with a time budget per move, so AI turns in many lobbies at
+    once never hold up the event loop; the pool is only started when the first search runs.
+    Its workers come from a fork server rather than forks of the bot, whose threads (the
+    snapshot writer, discord's gateway) could hold locks a forked child never releases.
+    """
+
+    def __init__(self, policy: str = "aggressive", move_budget: float = 0.5, max_playouts: int = 2000,
+                 workers: Optional[int] = None, move_delay: float = 1.0):
+        self.policy = policy
+        self.move_budget = move_budget
+        self.max_playouts = max_playouts
+        self.workers = workers
+        # Pause before every AI move so players can follow the board.
+        self.move_delay = move_delay
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.rng = random.Random()
+
+        self.moves = 0
+        self.playouts = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+    def configure(self, policy: Optional[str] = None, move_budget: Optional[float] = None,
+                  max_playouts: Optional[int] = None, workers: Optional[int] = None) -> None:
+        if policy is not None:
+            resolved = get_policy(policy)
+            if isinstance(resolved, MonteCarloPolicy) and policy.partition(":")[2]:
+                # "mcts:N" names the playout budget itself.
+                if max_playouts is not None and max_playouts != resolved.max_iterations:
+                    raise ValueError(f"Policy {policy} conflicts with a budget of {max_playouts} playouts")
+                max_playouts = resolved.max_iterations
+            self.policy = policy
+        if move_budget is not None:
+            self.move_budget = move_budget
+        if max_playouts is not None:
+            self.max_playouts = max_playouts
+        if workers is not None:
+            self.workers = workers
+
+    async def choose_move(self, game_logic: GameLogic, player_id: str) -> Tuple[Optional[int], Optional[str]]:
+        """Returns (card id or None to draw, color for a wild card) for the player whose turn it is."""
+        started_at = time.perf_counter()
+        if self.policy.partition(":")[0] == MonteCarloPolicy.name:
+            if self.executor is None:
+                start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                    mp_context=multiprocessing.get_context(start_method))
+            card_id, color, playouts = await asyncio.get_running_loop().run_in_executor(
+                self.executor, search_move, encode_game(game_logic), player_id, self.max_playouts, self.move_budget,
+                self.rng.getrandbits(64))
+            self.playouts += playouts
+            MOVE_PLAYOUTS.inc(amount=playouts)
+        else:
+            card, color = get_policy(self.policy).choose_move(game_logic, player_id, self.rng)
+            card_id = card.id if card is not None else None
+
+        elapsed = time.perf_counter() - started_at
+        self.moves += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        MOVE_SECONDS.observe(elapsed, self.policy)
+        return card_id, color
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "moves": self.moves,
+            "playouts": self.playouts,
+            "average_move_time": self.total_time / self.moves if self.moves else 0.0,
+            "max_move_time": self.max_time,
+            "playouts_per_second": self.playouts / self.total_time if self.total_time else 0.0,
+        }
+
+
+ai_players = AiPlayers()
@@ -0,0 +1,77 @@
+from typing import Dict, List, Optional, Tuple
+
+import discord
+
+# (name, inline) of every board field, in display order.
+FIELDS = [("Deck", True), ("Discard", True), ("Players", False), ("Top card", True), ("Placed by", True)]
+DECK, DISCARD, PLAYERS, TOP_CARD, PLACED_BY = range(len(FIELDS))
+
+
+class BoardEmbed:
+    """The board's status embed, kept between renders so only the fields that changed are rewritten.
+
+    Player lines are cached per player and only rebuilt when that player's card count or
+    turn marker changes; pile sizes are read as counts instead of copying the piles.
+    """
+
+    def __init__(self):
+        self.embed = discord.Embed(title="UNO Game Status", color=discord.Color.red())
+        for name, inline in FIELDS:
+            self.embed.add_field(name=name, value="None", inline=inline)
+        self.values: List[Optional[str]] = [None] * len(FIELDS)
+        self.image_url: Optional[str] = None
+
+        self.mentions: Dict[str, str] = {}
+        # player id -> (card count, is current player, rendered line)
+        self.player_lines: Dict[str, Tuple[int, bool, str]] = {}
+
+    def set_field(self, index: int, value: str) -> None:
+        if self.values[index] == value:
+            return
+        name, inline = FIELDS[index]
+        self.embed.set_field_at(index, name=name, value=value, inline=inline)
+        self.values[index] = value
+
+    def get_player_line(self, player, card_count: int, is_current: bool) -> str:
+        player_id = str(player.id)
+        cached = self.player_lines.get(player_id)
+        if cached is not None and cached[0] == card_count and cached[1] == is_current:
+            return cached[2]
+
+        mention = self.mentions.get(player_id)
+        if mention is None:
+            mention = self.mentions[player_id] = player.mention
+
+        marker = ">" if is_current else "    "
+        line = f"{marker} {mention} ({card_count} cards)"
+        self.player_lines[player_id] = (card_count, is_current, line)
+        return line
+
+    def render(self, game_ui) -> discord.Embed:
+        game_logic = game_ui.game_logic
+        current_player_id = game_logic.get_current_player().id
+
+        lines = [
+            self.get_player_line(player, game_logic.get_hand_size(str(player.id)), str(player.id) == current_player_id)
+            for player in game_ui.players
+        ]
+        if game_logic.is_reversed():
+            lines.reverse()
+
+        top_card = game_logic.get_top_card()
+
+        self.set_field(DECK, str(game_logic.get_deck_count()))
+        self.set_field(DISCARD, str(game_logic.get_discard_count()))
+        self.set_field(PLAYERS, "\n".join(lines))
+        self.set_field(TOP_CARD, game_ui.get_card_label(top_card) if top_card else "None")
+        self.set_field(PLACED_BY, game_ui.last_player.mention if game_ui.last_player else "None")
+
+        image_url = game_ui.get_card_image_url(top_card) if top_card else None
+        if image_url != self.image_url:
+            if image_url:
+                self.embed.set_image(url=image_url)
+            else:
+                self.embed.remove_image()
+            self.image_url = image_url
+
+        return self.embed
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import discord
+
+from commands.rest_scheduler import Priority, rest_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries of a board edit that keeps failing.
+MAX_RETRY_INTERVAL = 30.0
+
+
+class BoardRenderer:
+    """Keeps one lobby's board message in sync with its game state.
+
+    Handlers only mark the board dirty. A single edit is in flight per board at any
+    time, it is rendered from the latest state right before it is sent, and edits are
+    spaced at least min_interval apart, so a burst of plays becomes one edit and an
+    older state can never overwrite a newer one.
+    """
+
+    def __init__(self, game_ui, min_interval: float = 1.0):
+        self.game_ui = game_ui
+        self.min_interval = min_interval
+        self.task: Optional[asyncio.Task] = None
+
+        self.dirty_version = 0
+        self.sent_version = 0
+        self.extra: Dict[str, Any] = {}
+        self.dirty_since: Optional[float] = None
+        self.last_edit_at = 0.0
+        self.failures = 0
+
+        self.updates_requested = 0
+        self.edits_sent = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    @property
+    def edits_saved(self) -> int:
+        return self.updates_requested - self.edits_sent
+
+    def mark_dirty(self, **extra: Any) -> None:
+        """Schedules a board edit; extra edit arguments such as view= are sent with the next edit only."""
+        self.dirty_version += 1
+        self.updates_requested += 1
+        self.extra.update(extra)
+        if self.dirty_since is None:
+            self.dirty_since = time.perf_counter()
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def cancel(self) -> None:
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+        self.task = None
+        self.extra = {}
+        self.dirty_since = None
+        self.sent_version = self.dirty_version
+
+    async def run(self) -> None:
+        while self.sent_version < self.dirty_version:
+            interval = min(self.min_interval * 2 ** min(self.failures, 8), MAX_RETRY_INTERVAL)
+            wait = self.last_edit_at + interval - time.perf_counter()
+            if wait > 0:
+                await asyncio.sleep(wait)
+
+            message = self.game_ui.message
+            if message is None:
+                self.sent_version = self.dirty_version
+                self.extra = {}
+                self.dirty_since = None
+                return
+
+            version = self.dirty_version
+            dirty_since = self.dirty_since
+            extra, self.extra = self.extra, {}
+            payload = {**self.game_ui.get_board_payload(), **extra}
+            self.dirty_since = None
+
+            self.last_edit_at = time.perf_counter()
+            try:
+                await rest_scheduler.submit(Priority.BOARD, "board.edit", lambda: message.edit(**payload))
+            except discord.NotFound:
+                # The board was deleted while the edit was pending.
+                self.game_ui.attached_image_url = None
+                self.sent_version = self.dirty_version
+                self.extra = {}
+                return
+            except Exception:
+                # The board keeps its old state until an edit goes through, so retry with the latest state, card
+                # image included, backing off while the edits keep failing.
+                logger.exception("Board edit failed", extra={"channel": self.game_ui.key[1], "failures": self.failures})
+                self.game_ui.attached_image_url = None
+                self.failures += 1
+                self.extra = {**extra, **self.extra}
+                if self.dirty_since is None:
+                    self.dirty_since = dirty_since
+                continue
+            self.failures = 0
+            self.sent_version = version
+            self.edits_sent += 1
+
+            if dirty_since is not None:
+                latency = time.perf_counter() - dirty_since
+                self.last_latency = latency
+                self.max_latency = max(self.max_latency, latency)
+                self.total_latency += latency
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "updates_requested": self.updates_requested,
+            "edits_sent": self.edits_sent,
+            "edits_saved": self.edits_saved,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "average_latency": self.total_latency / self.edits_sent if self.edits_sent else 0.0,
+        }
@@ -0,0 +1,219 @@
+import asyncio
+import io
+import time
+from pathlib import Path
+from typing import Any, Coroutine, Dict, Optional, Protocol, Set, Tuple
+
+import discord
+from discord import File
+
+from commands.rest_scheduler import Priority, rest_scheduler
+from common.metrics import metrics
+from common.types import Card
+
+CARD_IMAGE_DIRECTORY = Path(__file__).resolve().parent.parent / "assets" / "images" / "cards"
+IMAGE_COLORS = ["Blue", "Green", "Red", "Yellow"]
+IMAGE_FACES = ["0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "Skip", "Reverse", "Draw Two",
+               "Wild", "Wild Draw Four", "Wild Draw Eight"]
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class CardImageCache:
+    """Keeps every card image in memory so board updates never touch the disk."""
+
+    def __init__(self, directory: Path = CARD_IMAGE_DIRECTORY):
+        self.directory = directory
+        self.filenames: Dict[Tuple[str, str], str] = {
+            (color, face): CardImageCache.get_filename(color, face)
+            for color in IMAGE_COLORS
+            for face in IMAGE_FACES
+        }
+        self.images: Dict[Tuple[str, str], bytes] = {}
+
+    @staticmethod
+    def get_filename(color: str, face: str) -> str:
+        return f"card-{color.lower()}-{face.lower().replace(' ', '_')}.png"
+
+    def load(self) -> None:
+        images = {}
+        for key, filename in self.filenames.items():
+            path = self.directory / filename
+            if not path.is_file():
+                raise ValueError(f"Card image is missing: {path}")
+
+            data = path.read_bytes()
+            if not data.startswith(PNG_SIGNATURE):
+                raise ValueError(f"Card image is not a PNG file: {path}")
+            images[key] = data
+
+        self.images = images
+
+    def get_card_filename(self, card: Card) -> Optional[str]:
+        return self.filenames.get((card.color, card.face))
+
+    def get_file(self, card: Card) -> Optional[File]:
+        if not self.images:
+            self.load()
+
+        key = (card.color, card.face)
+        data = self.images.get(key)
+        if data is None:
+            return None
+        # BytesIO shares the immutable bytes buffer until written to, so no copy is made per upload.
+        return File(io.BytesIO(data), filename=self.filenames[key])
+
+
+class CardImageUploader(Protocol):
+    async def upload(self, file: File) -> str:
+        ...
+
+
+class DiscordChannelUploader:
+    """Keeps one message per card image in an asset channel and returns the CDN URL of its attachment.
+
+    The bot's earlier asset messages are found in the channel history and reused, so a restart or an
+    expired URL costs a fetch, which returns freshly signed URLs, instead of a new upload; older copies
+    of an image are deleted. Every call runs at cleanup priority, behind interactions and board edits.
+    """
+
+    def __init__(self, channel: discord.TextChannel, user_id: int, history_limit: int = 200):
+        self.channel = channel
+        self.user_id = user_id
+        self.history_limit = history_limit
+        # filename -> id of the message holding it, once the history was scanned.
+        self.message_ids: Optional[Dict[str, int]] = None
+        # Messages read from the history, whose URLs are fresh until they are used once.
+        self.scanned: Dict[str, discord.Message] = {}
+        self.scan_lock = asyncio.Lock()
+
+    async def scan(self) -> Dict[str, int]:
+        async with self.scan_lock:
+            if self.message_ids is None:
+                history = await rest_scheduler.submit(Priority.CLEANUP, "channel.history",
+                                                      lambda: self.channel.history(limit=self.history_limit).flatten())
+                superseded = []
+                # The history is newest first, so the first message with an image is the one to keep.
+                for message in history:
+                    if message.author.id != self.user_id or len(message.attachments) != 1:
+                        continue
+                    filename = message.attachments[0].filename
+                    if filename in self.scanned:
+                        superseded.append(message.id)
+                    else:
+                        self.scanned[filename] = message
+                self.message_ids = {filename: message.id for filename, message in self.scanned.items()}
+                await asyncio.gather(*(self.delete(message_id) for message_id in superseded))
+            return self.message_ids
+
+    async def delete(self, message_id: int) -> None:
+        try:
+            await rest_scheduler.submit(Priority.CLEANUP, "message.delete",
+                                        self.channel.get_partial_message(message_id).delete)
+        except discord.HTTPException:
+            pass
+
+    async def upload(self, file: File) -> str:
+        message_ids = await self.scan()
+        filename = file.filename
+        message_id = message_ids.get(filename)
+
+        message = self.scanned.pop(filename, None)
+        if message is None and message_id is not None:
+            try:
+                message = await rest_scheduler.submit(Priority.CLEANUP, "message.fetch",
+                                                      lambda: self.channel.fetch_message(message_id))
+            except discord.NotFound:
+                message = None
+        if message is not None and message.attachments:
+            return message.attachments[0].url
+
+        message = await rest_scheduler.submit(Priority.CLEANUP, "message.send", lambda: self.channel.send(file=file))
+        if not message.attachments:
+            raise ValueError(f"Uploading {filename} returned a message without attachments")
+        message_ids[filename] = message.id
+        if message_id is not None:
+            await self.delete(message_id)
+        return message.attachments[0].url
+
+
+class CardImageUrlCache:
+    """Remembers where each card image was uploaded so the board can link to it instead of attaching it.
+
+    A cold card is uploaded in the background and the caller falls back to an attachment until the URL
+    is known. Discord signs attachment URLs with an expiry, so URLs are refreshed after max_age seconds.
+    """
+
+    def __init__(self, images: CardImageCache, max_age: float = 12 * 60 * 60):
+        self.images = images
+        self.max_age = max_age
+        self.uploader: Optional[CardImageUploader] = None
+        self.urls: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        self.pending: Set[Tuple[str, str]] = set()
+        self.background_tasks: Set[asyncio.Task] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.uploads = 0
+
+    def set_uploader(self, uploader: Optional[CardImageUploader]) -> None:
+        self.uploader = uploader
+        self.urls.clear()
+
+    def get_url(self, card: Card) -> Optional[str]:
+        key = (card.color, card.face)
+        cached = self.urls.get(key)
+        if cached is not None and time.monotonic() - cached[1] < self.max_age:
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        if self.uploader is not None and key not in self.pending and key in self.images.filenames:
+            self.pending.add(key)
+            self.run_in_background(self.upload(key))
+        return None
+
+    def run_in_background(self, coroutine: Coroutine[Any, Any, None]) -> asyncio.Task:
+        # The event loop only keeps weak references to tasks, so they are held here until they finish.
+        task = asyncio.create_task(coroutine)
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        return task
+
+    async def upload(self, key: Tuple[str, str]) -> None:
+        try:
+            if self.uploader is None:
+                return
+            file = self.images.get_file(Card(key[0], key[1], 0))
+            if file is None:
+                return
+            url = await self.uploader.upload(file)
+            self.urls[key] = (url, time.monotonic())
+            self.uploads += 1
+        except (discord.HTTPException, ValueError):
+            # The card stays cold and is retried the next time it is shown.
+            pass
+        finally:
+            self.pending.discard(key)
+
+    async def warm_up(self, concurrency: int = 4) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(key: Tuple[str, str]) -> None:
+            async with semaphore:
+                if key not in self.pending:
+                    self.pending.add(key)
+                    await self.upload(key)
+
+        await asyncio.gather(*(upload(key) for key in self.images.filenames if key not in self.urls))
+
+    def start_warm_up(self) -> asyncio.Task:
+        """Uploads every card image in the background, so even the first board of each card links to it."""
+        return self.run_in_background(self.warm_up())
+
+
+card_images = CardImageCache()
+card_urls = CardImageUrlCache(card_images)
+
+metrics.gauge("uno_card_url_lookups", "Card image URL cache lookups since startup",
+              lambda: {("hit",): card_urls.hits, ("miss",): card_urls.misses}, ["result"])
+metrics.gauge("uno_card_uploads", "Card images uploaded to the asset channel since startup", lambda: card_urls.uploads)
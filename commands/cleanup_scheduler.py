@@ -0,0 +1,125 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from common.metrics import metrics
+
+Action = Callable[[], Awaitable[Any]]
+
+
+class CleanupHandle:
+    __slots__ = ("due", "action", "cancelled")
+
+    def __init__(self, due: float, action: Action):
+        self.due = due
+        self.action = action
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+class CleanupScheduler:
+    """Runs delayed cleanups (reply and lobby deletions) from one timer task instead of one sleeping task each.
+
+    Cleanups live in a heap ordered by due time. Everything that is due when the timer wakes up is handed
+    to a fixed pool of workers as one batch, so at most max_in_flight deletions hit the API at once.
+    """
+
+    def __init__(self, max_in_flight: int = 8):
+        self.max_in_flight = max_in_flight
+        self.heap: List[Tuple[float, int, CleanupHandle]] = []
+        self.counter = itertools.count()
+        self.ready: Optional[asyncio.Queue[CleanupHandle]] = None
+        self.wakeup: Optional[asyncio.Event] = None
+        self.tasks: List[asyncio.Task] = []
+
+        self.scheduled = 0
+        self.cancelled = 0
+        self.completed = 0
+        self.failed = 0
+        self.largest_batch = 0
+
+    def schedule(self, delay: float, action: Action) -> CleanupHandle:
+        self.start()
+
+        handle = CleanupHandle(time.monotonic() + delay, action)
+        is_earliest = not self.heap or handle.due < self.heap[0][0]
+        heapq.heappush(self.heap, (handle.due, next(self.counter), handle))
+        self.scheduled += 1
+
+        if is_earliest:
+            self.wakeup.set()
+        return handle
+
+    def start(self) -> None:
+        if self.tasks and not any(task.done() for task in self.tasks):
+            return
+
+        for task in self.tasks:
+            task.cancel()
+        self.ready = asyncio.Queue()
+        self.wakeup = asyncio.Event()
+        self.tasks = [asyncio.create_task(self.run_timer())]
+        self.tasks += [asyncio.create_task(self.run_worker()) for _ in range(self.max_in_flight)]
+
+    async def run_timer(self) -> None:
+        while True:
+            self.wakeup.clear()
+            if not self.heap:
+                await self.wakeup.wait()
+                continue
+
+            delay = self.heap[0][0] - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = time.monotonic()
+            batch = 0
+            while self.heap and self.heap[0][0] <= now:
+                _, _, handle = heapq.heappop(self.heap)
+                if handle.cancelled:
+                    self.cancelled += 1
+                    continue
+                self.ready.put_nowait(handle)
+                batch += 1
+            self.largest_batch = max(self.largest_batch, batch)
+
+    async def run_worker(self) -> None:
+        while True:
+            handle = await self.ready.get()
+            if handle.cancelled:
+                self.cancelled += 1
+                continue
+            try:
+                await handle.action()
+            except Exception:
+                # Usually the reply or message is already gone, which is what the cleanup wanted anyway.
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self.heap),
+            "ready": self.ready.qsize() if self.ready else 0,
+            "scheduled": self.scheduled,
+            "cancelled": self.cancelled,
+            "completed": self.completed,
+            "failed": self.failed,
+            "largest_batch": self.largest_batch,
+        }
+
+
+cleanup_scheduler = CleanupScheduler()
+
+metrics.gauge("uno_cleanups_pending", "Scheduled cleanups that are not due yet", lambda: len(cleanup_scheduler.heap))
+metrics.gauge("uno_cleanups", "Cleanups by outcome since startup",
+              lambda: {("completed",): cleanup_scheduler.completed, ("failed",): cleanup_scheduler.failed,
+                       ("cancelled",): cleanup_scheduler.cancelled}, ["outcome"])
@@ -0,0 +1,159 @@
+import struct
+from typing import Dict, Iterable, Optional, Tuple
+
+import discord
+from discord.ext.commands.context import Context
+
+from application.event_log import EventLogWriter
+from commands.game_ui import GameUi
+from commands.sharding import ShardPlan
+from commands.snapshot_store import LobbySnapshot, SnapshotWriter
+from common.metrics import metrics
+
+LobbyKey = Tuple[int, int]
+
+
+class GameRegistry:
+    def __init__(self, event_log: Optional[EventLogWriter] = None, shards: Optional[ShardPlan] = None):
+        self.games: Dict[LobbyKey, GameUi] = {}
+        self.event_log = event_log
+        self.shards = shards or ShardPlan()
+        self.snapshots: Optional[SnapshotWriter] = None
+
+    def set_snapshots(self, snapshots: SnapshotWriter) -> None:
+        self.snapshots = snapshots
+        snapshots.on_conflict = self.release
+
+    @staticmethod
+    def get_key(guild_id: Optional[int], channel_id: Optional[int]) -> LobbyKey:
+        # Direct messages have no guild, so they share the 0 guild bucket.
+        return guild_id or 0, channel_id or 0
+
+    def get(self, guild_id: Optional[int], channel_id: Optional[int]) -> Optional[GameUi]:
+        return self.games.get(GameRegistry.get_key(guild_id, channel_id))
+
+    def get_or_create(self, guild_id: Optional[int], channel_id: Optional[int]) -> GameUi:
+        key = GameRegistry.get_key(guild_id, channel_id)
+        game_ui = self.games.get(key)
+        if game_ui is None:
+            game_ui = GameUi(self, key)
+            self.games[key] = game_ui
+        return game_ui
+
+    def get_for_context(self, ctx: Context) -> GameUi:
+        guild_id = ctx.guild.id if ctx.guild else None
+        return self.get_or_create(guild_id, ctx.channel.id)
+
+    def get_for_interaction(self, interaction: discord.Interaction) -> Optional[GameUi]:
+        return self.get(interaction.guild_id, interaction.channel_id)
+
+    async def resolve(self, interaction: discord.Interaction) -> Optional[GameUi]:
+        game_ui = self.get_for_interaction(interaction)
+        if game_ui is None:
+            await GameUi.send_response(interaction, content="There is no UNO lobby in this channel.", ephemeral=True)
+        return game_ui
+
+    def remove(self, game_ui: GameUi) -> None:
+        if self.games.get(game_ui.key) is game_ui:
+            del self.games[game_ui.key]
+            if self.snapshots is not None:
+                # Writes the lobby one last time, which deletes its stored state.
+                self.snapshots.mark_dirty(game_ui)
+
+    def release(self, keys: Iterable[LobbyKey]) -> None:
+        """Drops lobbies another process has written, without touching their message or stored state."""
+        for key in keys:
+            game_ui = self.games.pop(key, None)
+            if game_ui is not None:
+                game_ui.detach()
+
+    def save_snapshot(self, game_ui: GameUi) -> None:
+        # A handler of a closed lobby can finish after a new lobby opened in the same channel; it must not replace
+        # the new lobby's pending write, or the writer would delete the new lobby's state as a closed lobby's.
+        if self.snapshots is not None and self.games.get(game_ui.key) is game_ui:
+            self.snapshots.mark_dirty(game_ui)
+
+    async def restore(self, client: discord.Client) -> int:
+        """Reopens every saved lobby this process owns and returns how many lobbies are open."""
+        if self.snapshots is None:
+            return 0
+
+        stale = set()
+        for key, data in await self.snapshots.load_all(self.shards.owns):
+            if key in self.games:
+                continue
+            game_ui = GameUi(self, key)
+            try:
+                await game_ui.restore(client, LobbySnapshot.decode(data))
+            except (ValueError, struct.error, discord.HTTPException):
+                # The board message, channel or a player is gone, or the snapshot is unreadable.
+                game_ui.board.cancel()
+                stale.add(key)
+                continue
+            if key in self.games:
+                # Someone opened a new lobby in the channel while this one was being restored.
+                game_ui.board.cancel()
+                continue
+            self.games[key] = game_ui
+            game_ui.schedule_ai_turns()
+
+        if stale:
+            await self.snapshots.delete(stale)
+        return len(self.games)
+
+    def get_board_totals(self) -> Dict[str, float]:
+        """Board renderer stats of all open lobbies: summed counts, and the worst and the average edit latency."""
+        boards = [game_ui.board for game_ui in self.games.values()]
+        edits_sent = sum(board.edits_sent for board in boards)
+        return {
+            "edits_sent": edits_sent,
+            "edits_saved": sum(board.edits_saved for board in boards),
+            "max_latency": max((board.max_latency for board in boards), default=0.0),
+            "average_latency": sum(board.total_latency for board in boards) / edits_sent if edits_sent else 0.0,
+        }
+
+    def collect_board_updates(self) -> Dict[Tuple[str, ...], float]:
+        totals = self.get_board_totals()
+        return {("sent",): totals["edits_sent"], ("saved",): totals["edits_saved"]}
+
+    def collect_board_latency(self) -> Dict[Tuple[str, ...], float]:
+        totals = self.get_board_totals()
+        return {("max",): totals["max_latency"], ("average",): totals["average_latency"]}
+
+    def get_snapshot_stats(self) -> Dict[str, float]:
+        return self.snapshots.get_stats() if self.snapshots is not None else {}
+
+    def collect_snapshot_results(self) -> Dict[Tuple[str, ...], float]:
+        stats = self.get_snapshot_stats()
+        return {(result,): stats.get(name, 0) for result, name in (
+            ("written", "snapshots_written"), ("skipped", "snapshots_skipped"),
+            ("deleted", "snapshots_deleted"), ("conflict", "conflicts"))}
+
+    def register_metrics(self) -> None:
+        metrics.gauge("uno_lobbies", "Open lobbies", lambda: len(self.games))
+        metrics.gauge("uno_games_running", "Lobbies whose game has started",
+                      lambda: sum(game_ui.game_logic.is_started() for game_ui in self.games.values()))
+        metrics.gauge("uno_players", "Players in open lobbies",
+                      lambda: sum(len(game_ui.players) for game_ui in self.games.values()))
+        metrics.gauge("uno_lobby_queue_depth", "Actions waiting in lobby queues",
+                      lambda: sum(game_ui.actor.depth for game_ui in self.games.values()))
+        metrics.gauge("uno_lobby_queue_max_wait_seconds", "Longest queue wait of any open lobby",
+                      lambda: max((game_ui.actor.max_wait for game_ui in self.games.values()), default=0.0))
+        metrics.gauge("uno_board_edits_pending", "Boards with changes that are not on Discord yet",
+                      lambda: sum(game_ui.board.sent_version < game_ui.board.dirty_version
+                                  for game_ui in self.games.values()))
+        metrics.gauge("uno_board_updates", "Board updates requested in open lobbies, by whether they were sent as "
+                      "their own edit or folded into another one", self.collect_board_updates, ["result"])
+        metrics.gauge("uno_board_edit_latency_seconds", "Time from a board change until its edit was sent, "
+                      "over open lobbies", self.collect_board_latency, ["stat"])
+        metrics.gauge("uno_snapshots_pending", "Lobbies waiting to be written to the snapshot store",
+                      lambda: len(self.snapshots.pending) if self.snapshots is not None else 0)
+        metrics.gauge("uno_snapshots", "Lobby snapshots handled by the snapshot writer since startup, by outcome",
+                      self.collect_snapshot_results, ["result"])
+        metrics.gauge("uno_snapshot_bytes_written", "Snapshot bytes written since startup",
+                      lambda: self.get_snapshot_stats().get("bytes_written", 0))
+        metrics.gauge("uno_snapshot_write_max_seconds", "Longest snapshot batch write since startup",
+                      lambda: self.get_snapshot_stats().get("max_write_time", 0.0))
+
+    def __len__(self) -> int:
+        return len(self.games)
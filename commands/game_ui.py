@@ -1,67 +1,199 @@
 import asyncio
-from typing import List
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
 
 import discord
-from discord import ui, ButtonStyle, File
+from discord import ui, ButtonStyle
 from discord.ext.commands.context import Context
 
 from application.game_logic import GameLogic
-from application.types import GameCheat, error
+from application.types import GameCheat, Result, error
+from commands.ai_players import AiMember, ai_players, is_ai_player
+from commands.board_embed import BoardEmbed
+from commands.board_renderer import BoardRenderer
+from commands.card_assets import card_images, card_urls
+from commands.cleanup_scheduler import CleanupHandle, cleanup_scheduler
+from commands.interaction_router import parse_color, parse_index, route
+from commands.lobby_actor import LobbyActor
+from commands.rest_scheduler import Priority, rest_scheduler
+from commands.snapshot_store import LobbySnapshot
+from common.metrics import metrics
+from common.types import Card
 
+# Stored replies per player and action; older ones are deleted as new ones come in.
+MAX_STORED_INTERACTIONS = 5
+INTERACTION_TOKEN_LIFETIME = 15 * 60
 
-class UnoButtonView(discord.ui.View):
-    def __init__(self, game_ui):
-        super().__init__(timeout=None)
-        self.game_ui = game_ui
+logger = logging.getLogger(__name__)
+
+HANDLER_SECONDS = metrics.histogram("uno_handler_seconds", "Time spent in GameUi handlers, excluding queueing",
+                                    ["handler"])
+HANDLER_ERRORS = metrics.counter("uno_handler_errors_total", "GameUi handlers that raised", ["handler"])
+
+# (color, face) -> button and board label, filled in as cards are first shown.
+CARD_LABELS: Dict[Tuple[str, str], str] = {}
 
-    @discord.ui.button(label="Show Cards", custom_id="show-cards-btn", style=discord.ButtonStyle.secondary)
-    async def show_cards_button(self, button, interaction):
-        await self.game_ui.handle_show_cards_button(interaction)
+# A message holds five rows of five buttons: four rows of cards, then the page buttons and Draw Card.
+CARDS_PER_PAGE = 20
+HAND_DRAW_CUSTOM_ID = "draw-card-btn-dynamic"
 
-    @discord.ui.button(label="Draw Card", custom_id="draw-card-btn", style=discord.ButtonStyle.secondary)
-    async def draw_card_button(self, button, interaction):
-        print("draw card")
-        await self.game_ui.handle_draw_card_button(interaction)
+MAX_PLAYERS = 10
 
-    @discord.ui.button(label="Say UNO", custom_id="say-uno-btn", style=discord.ButtonStyle.primary)
-    async def say_uno_button(self, button, interaction):
-        await self.game_ui.handle_say_uno(interaction)
 
+# The views below are layout only: clicks are handled by the interaction router, see the @route handlers on GameUi.
+class UnoButtonView(discord.ui.View):
+    def __init__(self):
+        super().__init__(timeout=None)
+        self.add_item(ui.Button(label="Show Cards", custom_id="show-cards-btn", style=ButtonStyle.secondary))
+        self.add_item(ui.Button(label="Draw Card", custom_id="draw-card-btn", style=ButtonStyle.secondary))
+        self.add_item(ui.Button(label="Say UNO", custom_id="say-uno-btn", style=ButtonStyle.primary))
 
 
 class GameView(discord.ui.View):
-    def __init__(self, game_ui):
+    def __init__(self):
         super().__init__(timeout=None)
-        self.game_ui = game_ui
+        self.add_item(ui.Button(label="Join", custom_id="join-btn", style=ButtonStyle.primary))
+        self.add_item(ui.Button(label="Start", custom_id="start-btn", style=ButtonStyle.success))
+        self.add_item(ui.Button(label="Add Bot", custom_id="add-bot-btn", style=ButtonStyle.secondary))
+        self.add_item(ui.Button(label="Cancel", custom_id="cancel-btn", style=ButtonStyle.danger))
 
-    @discord.ui.button(label="Join", custom_id="join-btn", style=discord.ButtonStyle.primary)
-    async def join_button(self, button, interaction):
-        print("say uno")  # This will now print when button is pressed
-        await self.game_ui.handle_join_button(interaction)
 
-    @discord.ui.button(label="Start", custom_id="start-btn", style=discord.ButtonStyle.success)
-    async def start_button(self, button, interaction):
-        await self.game_ui.handle_start_button(interaction)
+class HandView(discord.ui.View):
+    def __init__(self, cards: List[Card], playable_ids: Set[int], is_current_player: bool, page: int):
+        super().__init__(timeout=None)
+        page_count = HandView.get_page_count(len(cards))
+        start = page * CARDS_PER_PAGE
+
+        for index, card in enumerate(cards[start:start + CARDS_PER_PAGE]):
+            self.add_item(ui.Button(label=GameUi.get_card_label(card), style=ButtonStyle.secondary,
+                                    custom_id=f"card-{card.id}", row=index // 5,
+                                    disabled=not is_current_player or card.id not in playable_ids))
+
+        if page_count > 1:
+            self.add_item(ui.Button(label="◀", custom_id=f"page-{max(page - 1, 0)}", style=ButtonStyle.primary,
+                                    row=4, disabled=page == 0))
+            self.add_item(ui.Button(label="▶", custom_id=f"page-{min(page + 1, page_count - 1)}",
+                                    style=ButtonStyle.primary, row=4, disabled=page == page_count - 1))
+        self.add_item(ui.Button(label="Draw Card", custom_id=HAND_DRAW_CUSTOM_ID, style=ButtonStyle.danger, row=4,
+                                disabled=not is_current_player))
 
-    @discord.ui.button(label="Cancel", custom_id="cancel-btn", style=discord.ButtonStyle.danger)
-    async def cancel_button(self, button, interaction):
-        await self.game_ui.handle_cancel_button(interaction)
+    @staticmethod
+    def get_page_count(hand_size: int) -> int:
+        return max(1, -(-hand_size // CARDS_PER_PAGE))
 
 
 class GameUi:
-    def __init__(self):
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
         self.message = None
         self.initiator = None
         self.last_player = None
-        self.game_logic = GameLogic()
+        self.game_logic = GameLogic(registry.event_log)
         self.players = []
 
-        self.action_player_interactions = {"cardSelection": {}, "wildCardColorSelection": {}}
+        self.action_player_interactions: Dict[str, Dict[str, Deque[Tuple[discord.Interaction, float]]]] = {
+            "cardSelection": {}, "wildCardColorSelection": {}
+        }
+
+        self.actor = LobbyActor()
+        self.close_handle: Optional[CleanupHandle] = None
+        self.board = BoardRenderer(self)
+        self.board_embed = BoardEmbed()
+        self.winner_message: Optional[str] = None
+        self.attached_image_url: Optional[str] = None
+
+        # player id -> (hand version, top card, is current player) the views were built for, and page -> view.
+        self.hand_views: Dict[str, Tuple[Tuple, Dict[int, HandView]]] = {}
+        self.hand_pages: Dict[str, int] = {}
+
+        # Plays the turns of AI seats while it is one of their turns; see schedule_ai_turns().
+        self.ai_task: Optional[asyncio.Task] = None
+
+    async def dispatch(self, handler: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+        latency = HANDLER_SECONDS.labels(handler.__name__)
+
+        async def run() -> Any:
+            started_at = time.perf_counter()
+            try:
+                return await handler(*args, **kwargs)
+            except Exception:
+                HANDLER_ERRORS.inc(handler.__name__)
+                raise
+            finally:
+                latency.observe(time.perf_counter() - started_at)
+
+        try:
+            return await self.actor.submit(run)
+        finally:
+            self.registry.save_snapshot(self)
+            self.schedule_ai_turns()
+
+    async def restore(self, client: discord.Client, snapshot: LobbySnapshot) -> None:
+        """Reattaches this lobby to its board message and members after a restart."""
+        channel_id = self.key[1]
+        channel = client.get_channel(channel_id) or await client.fetch_channel(channel_id)
+        guild = getattr(channel, "guild", None)
+
+        async def fetch_member(member_id: int):
+            if is_ai_player(member_id):
+                return AiMember(member_id)
+            if guild is not None:
+                return guild.get_member(member_id) or await guild.fetch_member(member_id)
+            return client.get_user(member_id) or await client.fetch_user(member_id)
+
+        self.message = await channel.fetch_message(snapshot.message_id)
+        self.initiator = await fetch_member(snapshot.initiator_id)
+        self.players = [await fetch_member(player_id) for player_id in snapshot.player_ids]
+        if snapshot.last_player_id is not None:
+            self.last_player = await fetch_member(snapshot.last_player_id)
+        if snapshot.game_logic is not None:
+            self.game_logic = snapshot.game_logic
+            if self.registry.event_log is not None:
+                self.registry.event_log.resume(self.game_logic)
+
+        # The buttons keep working through their custom_ids, the board only has to show the restored state.
+        self.board.mark_dirty()
+
+    @staticmethod
+    async def send_response(interaction: discord.Interaction, **kwargs: Any) -> None:
+        await rest_scheduler.submit(Priority.INTERACTION, "interaction.response",
+                                    lambda: interaction.response.send_message(**kwargs))
+
+    @staticmethod
+    async def edit_response(interaction: discord.Interaction, **kwargs: Any) -> None:
+        # Answers a click by editing the message the clicked component belongs to.
+        await rest_scheduler.submit(Priority.INTERACTION, "interaction.response",
+                                    lambda: interaction.response.edit_message(**kwargs))
+
+    @staticmethod
+    async def delete_response(interaction: discord.Interaction) -> None:
+        await rest_scheduler.submit(Priority.CLEANUP, "interaction.delete", interaction.delete_original_response)
 
     @staticmethod
-    def get_card_label(card: dict) -> str:
-        color_emoji = GameUi.get_color_emoji(card["color"])
-        return f"{color_emoji}{card['face']}"
+    def delete_response_later(interaction: discord.Interaction, delay: float = 10) -> CleanupHandle:
+        return cleanup_scheduler.schedule(delay, lambda: GameUi.delete_response(interaction))
+
+    def close_lobby_later(self, delay: float = 30) -> None:
+        message = self.message
+
+        async def delete_lobby():
+            if self.message is not message:
+                return
+            self.board.cancel()
+            await rest_scheduler.submit(Priority.CLEANUP, "message.delete", message.delete)
+            self.reset_game()
+
+        self.close_handle = cleanup_scheduler.schedule(delay, lambda: self.actor.submit(delete_lobby))
+
+    @staticmethod
+    def get_card_label(card: Card) -> str:
+        label = CARD_LABELS.get((card.color, card.face))
+        if label is None:
+            label = CARD_LABELS[(card.color, card.face)] = f"{GameUi.get_color_emoji(card.color)}{card.face}"
+        return label
 
     @staticmethod
     def get_color_emoji(color: str) -> str:
@@ -77,23 +209,21 @@ class GameUi:
             return "🟡"
         raise ValueError("Unknown color")
 
-    @staticmethod
-    def get_card_image_path(card: dict) -> str:
-        base_path = "./assets/images/cards"
-        face = card["face"].lower().replace(" ", "_")
-        return f"{base_path}/card-{card['color'].lower()}-{face}.png"
-
     async def handle_start(self, ctx: Context) -> None:
+        # A command is not an interaction, so Discord sets no deadline: channel messages queue with the board edits.
         if self.initiator is not None:
-            await ctx.send(content="There is already a lobby in progress.", )
+            await rest_scheduler.submit(Priority.BOARD, "message.send",
+                                        lambda: ctx.send(content="There is already a lobby in progress in this channel."))
             return
 
         self.initiator = ctx.author
         self.players.append(self.initiator)
 
-        view = GameView(self)
-        self.message = await ctx.send(content=self.get_message_content(), view=view)
+        view = GameView()
+        self.message = await rest_scheduler.submit(Priority.BOARD, "message.send",
+                                                   lambda: ctx.send(content=self.get_message_content(), view=view))
 
+    @route("join-btn")
     async def handle_join_button(self, interaction: discord.Interaction) -> None:
         if self.message is None:
             raise ValueError("Message is null")
@@ -101,48 +231,45 @@ class GameUi:
         member = interaction.user
 
         if any(player.id == member.id for player in self.players):
-            await interaction.response.send_message(content="You have already joined this lobby.", ephemeral=True)
+            await self.send_response(interaction, content="You have already joined this lobby.", ephemeral=True)
 
-            async def delete_reply():
-                try:
-                    await interaction.delete_original_response()
-                except:
-                    pass
+            self.delete_response_later(interaction)
+            return
 
-            await asyncio.sleep(10)
-            await delete_reply()
+        if self.game_logic.is_started() or len(self.players) >= MAX_PLAYERS:
+            await self.send_response(interaction, content="No more players can join this lobby.", ephemeral=True)
+
+            self.delete_response_later(interaction)
             return
 
         self.players.append(member)
 
-        await self.message.edit(content=self.get_message_content())
+        self.board.mark_dirty()
 
         if self.initiator is None:
             raise ValueError("Initiator is null")
 
-        await interaction.response.send_message(content=f"You have joined {self.initiator.mention}'s lobby.",
-                                                ephemeral=True)
+        await self.send_response(interaction, content=f"You have joined {self.initiator.mention}'s lobby.",
+                                 ephemeral=True)
 
-        await asyncio.sleep(10)
-        await interaction.delete_original_response()
+        self.delete_response_later(interaction)
 
+    @route("start-btn")
     async def handle_start_button(self, interaction: discord.Interaction) -> None:
         member = interaction.user
 
         if self.initiator != member:
-            await interaction.response.send_message(content="You are not the initiator.", ephemeral=True)
+            await self.send_response(interaction, content="You are not the initiator.", ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         min_player_amount = 1
         if len(self.players) < min_player_amount:
-            await interaction.response.send_message(content=f"Not enough players. Needed amount: {min_player_amount}.",
-                                                    ephemeral=True)
+            await self.send_response(interaction, content=f"Not enough players. Needed amount: {min_player_amount}.",
+                                     ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         if self.message is None:
@@ -150,11 +277,39 @@ class GameUi:
 
         await self.start_game()
 
-        await interaction.response.send_message(content="Game has started!", ephemeral=True)
+        await self.send_response(interaction, content="Game has started!", ephemeral=True)
+
+        self.delete_response_later(interaction)
+
+    @route("add-bot-btn")
+    async def handle_add_bot_button(self, interaction: discord.Interaction) -> None:
+        if self.message is None:
+            raise ValueError("Message is null")
+
+        if self.initiator != interaction.user:
+            await self.send_response(interaction, content="You are not the initiator.", ephemeral=True)
+
+            self.delete_response_later(interaction)
+            return
+
+        if self.game_logic.is_started() or len(self.players) >= MAX_PLAYERS:
+            await self.send_response(interaction, content="No more players can join this lobby.", ephemeral=True)
+
+            self.delete_response_later(interaction)
+            return
+
+        # AI ids only have to be unique within the lobby.
+        taken = {player.id for player in self.players}
+        bot = AiMember(next(member_id for member_id in range(1, MAX_PLAYERS + 1) if member_id not in taken))
+        self.players.append(bot)
+
+        self.board.mark_dirty()
 
-        await asyncio.sleep(10)
-        await interaction.delete_original_response()
+        await self.send_response(interaction, content=f"{bot.mention} has joined the lobby.", ephemeral=True)
 
+        self.delete_response_later(interaction)
+
+    @route("cancel-btn")
     async def handle_cancel_button(self, interaction: discord.Interaction) -> None:
         if self.message is None:
             raise ValueError("Message is null")
@@ -162,236 +317,174 @@ class GameUi:
         member = interaction.user
 
         if self.initiator != member:
-            await interaction.response.send_message(content="You are not the initiator.", ephemeral=True)
+            await self.send_response(interaction, content="You are not the initiator.", ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
-        await self.message.delete()
+        self.board.cancel()
+        await rest_scheduler.submit(Priority.CLEANUP, "message.delete", self.message.delete)
         self.reset_game()
 
-        await interaction.response.send_message(content="You have deleted the lobby.", ephemeral=True)
+        await self.send_response(interaction, content="You have deleted the lobby.", ephemeral=True)
 
-        await asyncio.sleep(10)
-        await interaction.delete_original_response()
+        self.delete_response_later(interaction)
 
+    @route("show-cards-btn")
     async def handle_show_cards_button(self, interaction: discord.Interaction) -> None:
         member = interaction.user
-        await self.delete_action_replies(["cardSelection", "wildCardColorSelection"], str(member.id))
-
-        cards = self.game_logic.get_player_cards(str(member.id))
-
-        current_player = self.game_logic.get_current_player()
-        is_current_player = current_player["id"] == str(member.id)
-
-        view = ui.View()
+        self.delete_action_replies(["cardSelection", "wildCardColorSelection"], str(member.id))
 
-        card_buttons = []
-        for card in cards:
-            label = GameUi.get_card_label(card)
-            can_play = self.game_logic.can_play_card(card, current_player["id"])
-
-            button = ui.Button(label=label, style=ButtonStyle.secondary, custom_id=f"card-{card['id']}",
-                               disabled=not is_current_player or not can_play)
-            card_buttons.append(button)
-
-        # draw_card_button = ui.Button(label="Draw Card", style=ButtonStyle.danger, custom_id="draw-card-btn",
-        #                              disabled=not is_current_player)
-        draw_card_button = ui.Button(
-            label="Draw Card",
-            style=ButtonStyle.danger,
-            custom_id="draw-card-btn-dynamic",  # Different custom_id
-            disabled=not is_current_player
-        )
-        draw_card_button.callback = lambda i: self.handle_draw_card_button(i)  # Explicitly set callback
-        card_buttons.append(draw_card_button)
-
-        # Add buttons to the view (needs pagination for more than 25 buttons)
-        for button in card_buttons[:25]:  # Discord limits to 25 buttons per message
-            view.add_item(button)
-
-        await interaction.response.send_message(content="Your cards:", view=view, ephemeral=True)
+        content, view = self.get_hand_view(str(member.id), 0)
+        await self.send_response(interaction, content=content, view=view, ephemeral=True)
 
         self.add_action_player_interaction("cardSelection", str(member.id), interaction)
 
+    @route("page-{page}", page=parse_index)
+    async def handle_hand_page(self, interaction: discord.Interaction, page: int) -> None:
+        content, view = self.get_hand_view(str(interaction.user.id), page)
+        await self.edit_response(interaction, content=content, view=view)
+
+    @route("card-{card_id}", card_id=parse_index)
     async def handle_card_button(self, interaction: discord.Interaction, card_id: int) -> None:
         if self.message is None:
             raise ValueError("Message is null")
 
         member = interaction.user
-        player_cards = self.game_logic.get_player_cards(str(member.id))
-        card = next((c for c in player_cards if c["id"] == card_id), None)
+        card = self.game_logic.get_player_card(str(member.id), card_id)
 
         if not card:
-            await interaction.response.send_message(content="Card not found.", ephemeral=True)
+            await self.send_response(interaction, content="Card not found.", ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
-        if card["color"] == "Wild":
+        if card.color == "Wild":
             await self.handle_wild_card_color(card_id, interaction)
             return
 
         result = self.game_logic.play_card(str(member.id), card_id)
 
         if hasattr(result, "error") and result.error:
-            await interaction.response.send_message(content=result.error, ephemeral=True)
+            await self.send_response(interaction, content=result.error, ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         self.last_player = member
 
-        await interaction.response.send_message(content="You played a card.", ephemeral=True)
-
-        await interaction.delete_original_response()
-
-        top_card = self.game_logic.get_top_card()
-
-        embed = self.get_game_message_content()
-        files = [File(GameUi.get_card_image_path(top_card))] if top_card else []
-
-        await self.message.edit(embeds=[embed], files=files)
+        self.finish_turn(member)
 
-        await self.delete_action_replies(["cardSelection", "wildCardColorSelection"], str(member.id))
+        # Card buttons only exist on the player's hand message, so the answer redraws that message in place.
+        content, view = self.get_hand_view(str(member.id), self.hand_pages.get(str(member.id), 0),
+                                           notice="You played a card.")
+        await self.edit_response(interaction, content=content, view=view)
 
-        is_winner = self.game_logic.is_winner(str(member.id))
-        if not is_winner:
-            return
-
-        if not top_card:
-            raise ValueError("Top card is null")
-
-        card_label = GameUi.get_card_label(top_card)
-        await self.message.edit(content=f"🏆 {member.mention} has won the game!\n\n... by placing {card_label} as their last card.",
-                                files=[])
-
-        await asyncio.sleep(30)
-        await self.message.delete()
-        self.reset_game()
+        self.delete_action_replies(["wildCardColorSelection"], str(member.id))
 
+    @route("color-{color}-{card_id}", color=parse_color, card_id=parse_index)
     async def handle_color_selection(self, interaction: discord.Interaction, card_id: int, color: str) -> None:
         if self.message is None:
             raise ValueError("Message is null")
 
         member = interaction.user
-        player_cards = self.game_logic.get_player_cards(str(member.id))
-        card = next((c for c in player_cards if c["id"] == card_id), None)
+        card = self.game_logic.get_player_card(str(member.id), card_id)
 
         if not card:
-            await interaction.response.send_message(content="Card not found.", ephemeral=True)
+            await self.send_response(interaction, content="Card not found.", ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         result2 = self.game_logic.play_card(str(member.id), card_id)
         if hasattr(result2, "error") and result2.error:
-            await interaction.response.send_message(content=result2.error, ephemeral=True)
+            await self.send_response(interaction, content=result2.error, ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         result1 = self.game_logic.change_wild_card_color(card_id, color)
         if hasattr(result1, "error") and result1.error:
-            await interaction.response.send_message(content=result1.error, ephemeral=True)
+            await self.send_response(interaction, content=result1.error, ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         self.last_player = member
 
-        await interaction.response.send_message(content="You played a card.", ephemeral=True)
-
-        await interaction.delete_original_response()
-
-        await self.delete_action_replies(["cardSelection", "wildCardColorSelection"], str(member.id))
-
-        top_card = self.game_logic.get_top_card()
+        await self.send_response(interaction, content="You played a card.", ephemeral=True)
 
-        embed = self.get_game_message_content()
-        files = [File(GameUi.get_card_image_path(top_card))] if top_card else []
+        self.delete_response_later(interaction, delay=0)
 
-        await self.message.edit(embeds=[embed], files=files)
+        self.finish_turn(member)
 
-        is_winner = self.game_logic.is_winner(str(member.id))
-        if not is_winner:
-            return
+        self.delete_action_replies(["wildCardColorSelection"], str(member.id))
 
-        if not top_card:
-            raise ValueError("Top card is null")
-
-        card_label = GameUi.get_card_label(top_card)
-        await self.message.edit(components=[],
-                                content=f"🏆 {member.mention} has won the game!\n\n... by placing {card_label} as their last card.",
-                                files=[])
-
-        await asyncio.sleep(30)
-        await self.message.delete()
-        self.reset_game()
+        await self.refresh_hand(str(member.id))
 
+    @route("draw-card-btn")
+    @route("draw-card-btn-dynamic")
     async def handle_draw_card_button(self, interaction: discord.Interaction) -> None:
-        print("ass")
+        logger.debug("Draw card pressed", extra={"player": interaction.user.id, "channel": self.key[1]})
         if self.message is None:
             raise ValueError("Message is null")
 
         member = interaction.user
         current_player = self.game_logic.get_current_player()
 
-        if current_player["id"] != str(member.id):
-            await interaction.response.send_message(content="It is not your turn.", ephemeral=True)
+        if current_player.id != str(member.id):
+            await self.send_response(interaction, content="It is not your turn.", ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         result = self.game_logic.draw_card(str(member.id))
         if hasattr(result, "error") and result.error:
-            await interaction.response.send_message(content=result.error, ephemeral=True)
+            await self.send_response(interaction, content=result.error, ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
-        await interaction.response.send_message(content="You drew a card.", ephemeral=True)
+        self.board.mark_dirty()
+
+        self.delete_action_replies(["wildCardColorSelection"], str(member.id))
+
+        if interaction.data.get("custom_id") == HAND_DRAW_CUSTOM_ID:
+            content, view = self.get_hand_view(str(member.id), self.hand_pages.get(str(member.id), 0),
+                                               notice="You drew a card.")
+            await self.edit_response(interaction, content=content, view=view)
+            return
 
-        await interaction.delete_original_response()
+        await self.send_response(interaction, content="You drew a card.", ephemeral=True)
 
-        await self.delete_action_replies(["cardSelection", "wildCardColorSelection"], str(member.id))
+        self.delete_response_later(interaction, delay=0)
 
-        await self.message.edit(embeds=[self.get_game_message_content()])
+        await self.refresh_hand(str(member.id))
 
+    @route("say-uno-btn")
     async def handle_say_uno(self, interaction: discord.Interaction) -> None:
         if self.message is None:
             raise ValueError("Message is null")
 
         member = interaction.user
 
-        if str(member.id) != self.game_logic.get_current_player()["id"]:
-            await interaction.response.send_message(content="It is not your turn.", ephemeral=True)
+        if str(member.id) != self.game_logic.get_current_player().id:
+            await self.send_response(interaction, content="It is not your turn.", ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
         result = self.game_logic.say_uno(str(member.id))
 
         if hasattr(result, "error") and result.error:
-            await interaction.response.send_message(content=result.error, ephemeral=True)
+            await self.send_response(interaction, content=result.error, ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
-        await interaction.response.send_message(content=f"{member.mention} said UNO!")
+        await self.send_response(interaction, content=f"{member.mention} said UNO!")
 
-        await asyncio.sleep(10)
-        await interaction.delete_original_response()
+        self.delete_response_later(interaction)
 
     async def handle_cheat_code(self, interaction: discord.Interaction, code: str) -> None:
         if self.message is None:
@@ -406,15 +499,14 @@ class GameUi:
             result = self.game_logic.activate_cheat_code(str(member.id), GameCheat.GIVE_WILD_EIGHT)
 
         if hasattr(result, "error") and result.error:
-            await interaction.response.send_message(content=result.error, ephemeral=True)
+            await self.send_response(interaction, content=result.error, ephemeral=True)
 
-            await asyncio.sleep(10)
-            await interaction.delete_original_response()
+            self.delete_response_later(interaction)
             return
 
-        await self.message.edit(embeds=[self.get_game_message_content()])
+        self.board.mark_dirty()
 
-        await interaction.response.send_message(content="Cheat code activated.", ephemeral=True)
+        await self.send_response(interaction, content="Cheat code activated.", ephemeral=True)
 
     async def handle_wild_card_color(self, card_id: int, interaction: discord.Interaction) -> None:
         colors = ["Red", "Green", "Blue", "Yellow"]
@@ -425,33 +517,177 @@ class GameUi:
             button = ui.Button(label=color_emoji, style=ButtonStyle.secondary, custom_id=f"color-{color}-{card_id}")
             view.add_item(button)
 
-        await interaction.response.send_message(content="Select a color for the wild card:", view=view, ephemeral=True)
+        await self.send_response(interaction, content="Select a color for the wild card:", view=view, ephemeral=True)
 
         member = interaction.user
-        await self.delete_action_replies(["wildCardColorSelection"], str(member.id))
+        self.delete_action_replies(["wildCardColorSelection"], str(member.id))
         self.add_action_player_interaction("wildCardColorSelection", str(member.id), interaction)
 
+    def is_ai_turn(self) -> bool:
+        return (self.game_logic.is_started() and self.winner_message is None
+                and is_ai_player(self.game_logic.get_current_player().id))
+
+    def schedule_ai_turns(self) -> None:
+        if (self.ai_task is None or self.ai_task.done()) and self.is_ai_turn():
+            self.ai_task = asyncio.create_task(self.run_ai_turns())
+
+    async def run_ai_turns(self) -> None:
+        # Moves are chosen outside the lobby actor, so a search in the process pool never holds up
+        # the lobby's other actions; handle_ai_move checks that the move still fits the game.
+        try:
+            while self.is_ai_turn():
+                await asyncio.sleep(ai_players.move_delay)
+                if not self.is_ai_turn():
+                    return
+                player_id = self.game_logic.get_current_player().id
+                card_id, color = await ai_players.choose_move(self.game_logic, player_id)
+                await self.dispatch(self.handle_ai_move, player_id, card_id, color)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("AI turn failed", extra={"channel": self.key[1]})
+
+    async def handle_ai_move(self, player_id: str, card_id: Optional[int], color: Optional[str]) -> None:
+        if not self.is_ai_turn() or self.game_logic.get_current_player().id != player_id:
+            return
+
+        member = next(player for player in self.players if str(player.id) == player_id)
+        result = None
+        if card_id is not None and card_id in self.game_logic.get_playable_card_ids(player_id):
+            if self.game_logic.get_hand_size(player_id) == 2:
+                self.check_ai_result(player_id, "say_uno", self.game_logic.say_uno(player_id))
+            result = self.check_ai_result(player_id, "play_card", self.game_logic.play_card(player_id, card_id))
+
+        if not result:
+            # A stale or illegal move draws instead, so the AI's turn always ends.
+            self.check_ai_result(player_id, "draw_card", self.game_logic.draw_card(player_id))
+            self.board.mark_dirty()
+        else:
+            top_card = self.game_logic.get_top_card()
+            if top_card.id == card_id and top_card.color == "Wild":
+                try:
+                    color = parse_color(color or "")
+                except ValueError:
+                    # A wild card without a color would leave only wild cards playable.
+                    self.check_ai_result(player_id, "choose_color", error(f"Unknown color: {color}"))
+                    color = "Red"
+                self.check_ai_result(player_id, "change_wild_card_color",
+                                     self.game_logic.change_wild_card_color(card_id, color))
+
+            self.last_player = member
+            self.finish_turn(member)
+
+        next_player_id = self.game_logic.get_current_player().id
+        if not is_ai_player(next_player_id):
+            await self.refresh_hand(next_player_id)
+
+    def check_ai_result(self, player_id: str, action: str, result: Result) -> Result:
+        if not result:
+            logger.warning("AI move rejected", extra={"channel": self.key[1], "player": player_id, "action": action,
+                                                      "error": result.error})
+        return result
+
     def add_action_player_interaction(self, action: str, player_id: str, interaction: discord.Interaction) -> None:
-        if player_id not in self.action_player_interactions[action]:
-            self.action_player_interactions[action][player_id] = []
-        self.action_player_interactions[action][player_id].append(interaction)
+        interactions = self.action_player_interactions[action].setdefault(
+            player_id, deque(maxlen=MAX_STORED_INTERACTIONS))
+
+        # Interaction tokens expire, so replies older than that can no longer be deleted and are dropped.
+        now = time.monotonic()
+        while interactions and now - interactions[0][1] > INTERACTION_TOKEN_LIFETIME:
+            interactions.popleft()
+
+        if len(interactions) == interactions.maxlen:
+            self.delete_response_later(interactions.popleft()[0], delay=0)
+        interactions.append((interaction, now))
 
-    async def delete_action_replies(self, actions: List[str], player_id: str) -> None:
+    def delete_action_replies(self, actions: List[str], player_id: str) -> None:
+        # The deletions run on the cleanup scheduler, which bounds how many are in flight at once,
+        # so the caller can answer its own interaction without waiting for them.
         for action in actions:
-            if player_id in self.action_player_interactions.get(action, {}):
-                interactions = self.action_player_interactions[action][player_id].copy()
-                self.action_player_interactions[action][player_id] = []
-                for reply in interactions:
-                    try:
-                        await reply.delete_original_response()
-                    except:
-                        pass
+            interactions = self.action_player_interactions.get(action, {}).pop(player_id, None)
+            for reply, _ in interactions or ():
+                self.delete_response_later(reply, delay=0)
+
+    def get_hand_view(self, player_id: str, page: int, notice: Optional[str] = None) -> Tuple[str, HandView]:
+        """Returns one page of the player's hand, reusing its view while nothing that it shows has changed."""
+        cards = self.game_logic.get_player_cards(player_id)
+        page_count = HandView.get_page_count(len(cards))
+        page = min(max(page, 0), page_count - 1)
+        self.hand_pages[player_id] = page
+
+        top_card = self.game_logic.get_top_card()
+        state = (self.game_logic.get_hand_version(player_id),
+                 (top_card.id, top_card.color) if top_card else None,
+                 self.game_logic.get_current_player().id == player_id)
+
+        cached = self.hand_views.get(player_id)
+        if cached is None or cached[0] != state:
+            cached = self.hand_views[player_id] = (state, {})
+        view = cached[1].get(page)
+        if view is None:
+            playable_ids = self.game_logic.get_playable_card_ids(player_id)
+            view = cached[1][page] = HandView(cards, playable_ids, state[2], page)
+
+        content = "Your cards:" if page_count == 1 else f"Your cards (page {page + 1}/{page_count}):"
+        return (f"{notice}\n{content}" if notice else content), view
+
+    async def refresh_hand(self, player_id: str) -> None:
+        """Redraws the player's open hand message after a change that was not made from that message."""
+        interactions = self.action_player_interactions["cardSelection"].get(player_id)
+        if not interactions:
+            return
+
+        reply, shown_at = interactions[-1]
+        if time.monotonic() - shown_at > INTERACTION_TOKEN_LIFETIME:
+            return
+
+        content, view = self.get_hand_view(player_id, self.hand_pages.get(player_id, 0))
+        try:
+            await rest_scheduler.submit(Priority.BOARD, "interaction.edit",
+                                        lambda: reply.edit_original_response(content=content, view=view))
+        except discord.HTTPException:
+            # The player dismissed the message; the next Show Cards click sends a new one.
+            self.action_player_interactions["cardSelection"].pop(player_id, None)
+
+    def finish_turn(self, member) -> None:
+        if not self.game_logic.is_winner(str(member.id)):
+            self.board.mark_dirty()
+            return
+
+        top_card = self.game_logic.get_top_card()
+        if not top_card:
+            raise ValueError("Top card is null")
+
+        card_label = GameUi.get_card_label(top_card)
+        self.winner_message = f"🏆 {member.mention} has won the game!\n\n... by placing {card_label} as their last card."
+        self.board.mark_dirty(view=None)
+
+        self.close_lobby_later()
 
     def reset_game(self) -> None:
+        self.detach()
         self.initiator = None
         self.message = None
         self.players.clear()
         self.game_logic.reset()
+        for interactions in self.action_player_interactions.values():
+            interactions.clear()
+        self.winner_message = None
+        self.attached_image_url = None
+        self.board_embed = BoardEmbed()
+        self.hand_views.clear()
+        self.hand_pages.clear()
+        self.registry.remove(self)
+
+    def detach(self) -> None:
+        """Stops everything the lobby has scheduled: AI turns, the delayed close and board edits."""
+        if self.ai_task is not None and self.ai_task is not asyncio.current_task():
+            self.ai_task.cancel()
+        self.ai_task = None
+        if self.close_handle is not None:
+            self.close_handle.cancel()
+            self.close_handle = None
+        self.board.cancel()
 
     async def start_game(self) -> None:
         if self.message is None:
@@ -460,52 +696,50 @@ class GameUi:
         player_ids = [str(player.id) for player in self.players]
         self.game_logic.start_game(player_ids)
 
-        id_order = [player["id"] for player in self.game_logic.get_players()]
-        self.players.sort(key=lambda player: id_order.index(str(player.id)))
+        seats = self.game_logic.player_seats
+        self.players.sort(key=lambda player: seats[str(player.id)])
 
         # Use the UnoButtonView class instead of creating generic buttons
-        view = UnoButtonView(self)
+        view = UnoButtonView()
 
-        await self.message.edit(
-            view=view,
-            content=None,
-            embeds=[self.get_game_message_content()]
-        )
+        self.board.mark_dirty(view=view, content=None)
 
-    def get_game_message_content(self) -> discord.Embed:
-        players = []
-        for player in self.players:
-            card_count = len(self.game_logic.get_player_cards(str(player.id)))
-            if str(player.id) == self.game_logic.get_current_player()["id"]:
-                players.append(f"> {player.mention} ({card_count} cards)")
-            else:
-                players.append(f"     {player.mention} ({card_count} cards)")
-
-        if self.game_logic.is_reversed():
-            players.reverse()
+    def get_board_payload(self) -> Dict[str, Any]:
+        if not self.game_logic.is_started():
+            return {"content": self.get_message_content()}
 
-        order_message = "\n".join(players)
+        payload: Dict[str, Any] = {"embeds": [self.get_game_message_content()]}
+        if self.winner_message is not None:
+            payload["content"] = self.winner_message
 
-        top_card = self.game_logic.get_top_card()
-        top_card_label = GameUi.get_card_label(top_card) if top_card else "None"
+        # The embed links the top card by CDN URL or as attachment://, so the files only change when that link does:
+        # a new card, or the same card whose upload finished or whose URL expired.
+        image_url = self.board_embed.image_url
+        if image_url != self.attached_image_url:
+            payload.update(self.get_card_image_payload(self.game_logic.get_top_card(), image_url))
+            self.attached_image_url = image_url
 
-        deck_card_amount = len(self.game_logic.get_deck_cards())
-        discard_card_amount = len(self.game_logic.get_discard_cards())
+        return payload
 
-        embed = discord.Embed(title="UNO Game Status", color=discord.Color.red())
+    def get_game_message_content(self) -> discord.Embed:
+        return self.board_embed.render(self)
 
-        embed.add_field(name="Deck", value=str(deck_card_amount), inline=True)
-        embed.add_field(name="Discard", value=str(discard_card_amount), inline=True)
-        embed.add_field(name="Players", value=order_message, inline=False)
-        embed.add_field(name="Top card", value=top_card_label, inline=True)
-        embed.add_field(name="Placed by", value=self.last_player.mention if self.last_player else "None", inline=True)
+    @staticmethod
+    def get_card_image_url(card: Card) -> Optional[str]:
+        url = card_urls.get_url(card)
+        if url is not None:
+            return url
 
-        if top_card:
-            path = GameUi.get_card_image_path(top_card)
-            length = len("./assets/images/cards/")
-            embed.set_image(url=f"attachment://{path[length:]}")
+        filename = card_images.get_card_filename(card)
+        return f"attachment://{filename}" if filename else None
 
-        return embed
+    @staticmethod
+    def get_card_image_payload(card: Optional[Card], image_url: Optional[str]) -> Dict[str, list]:
+        # The previous attachment is always dropped, or Discord keeps showing it as a loose image under the board.
+        if card is None or image_url is None or not image_url.startswith("attachment://"):
+            return {"attachments": []}
+        card_file = card_images.get_file(card)
+        return {"attachments": [], "files": [card_file] if card_file else []}
 
     def get_message_content(self) -> str:
         if self.initiator is None:
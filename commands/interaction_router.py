@@ -0,0 +1,137 @@
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import discord
+
+from common.metrics import metrics
+
+ROUTE_SECONDS = metrics.histogram("uno_route_dispatch_seconds", "Time from routing a component click until its "
+                                  "handler finished, queueing included, by custom_id template", ["route"])
+ROUTE_ERRORS = metrics.counter("uno_route_errors_total", "Routed component clicks whose handler raised", ["route"])
+
+Converter = Callable[[str], Any]
+
+
+def route(template: str, **converters: Converter) -> Callable:
+    """Declares that a GameUi handler answers components whose custom_id matches template.
+
+    Templates are either an exact custom_id ("join-btn") or a "<prefix>-" followed by
+    "{name}" placeholders separated by dashes ("color-{color}-{card_id}"). Each placeholder
+    is parsed with its converter and passed to the handler as a keyword argument.
+    """
+
+    def register(handler: Callable) -> Callable:
+        handler.__routes__ = getattr(handler, "__routes__", []) + [(template, converters)]
+        return handler
+
+    return register
+
+
+def parse_index(value: str) -> int:
+    # int() would also take "-5", "+5", " 5" and "5_0", none of which the bot ever puts in a custom_id.
+    if not (value.isascii() and value.isdigit()):
+        raise ValueError(f"Not an index: {value}")
+    return int(value)
+
+
+def parse_color(value: str) -> str:
+    if value not in ("Red", "Green", "Blue", "Yellow"):
+        raise ValueError(f"Unknown color: {value}")
+    return value
+
+
+class Route:
+    __slots__ = ("template", "handler_name", "names", "converters", "seconds", "errors", "max_time")
+
+    def __init__(self, template: str, handler_name: str, converters: Dict[str, Converter]):
+        self.template = template
+        self.handler_name = handler_name
+        self.names: List[str] = [part[1:-1] for part in template.split("-") if part.startswith("{")]
+        self.converters = [converters[name] for name in self.names]
+
+        self.seconds = ROUTE_SECONDS.labels(template)
+        self.errors = ROUTE_ERRORS.labels(template)
+        self.max_time = 0.0
+
+    def parse(self, arguments: str) -> Dict[str, Any]:
+        values = arguments.split("-", len(self.names) - 1)
+        if len(values) != len(self.names):
+            raise ValueError(f"Expected {len(self.names)} arguments")
+        return {name: convert(value) for name, convert, value in zip(self.names, self.converters, values)}
+
+
+class InteractionRouter:
+    """Dispatches every component interaction to exactly one GameUi handler.
+
+    Exact custom_ids resolve with one dict lookup; templated ones with one more lookup
+    on their "<prefix>-" part, after which the arguments are parsed once.
+    """
+
+    def __init__(self, registry, handler_class: type):
+        self.registry = registry
+        self.exact: Dict[str, Route] = {}
+        self.prefixed: Dict[str, Route] = {}
+
+        for handler_name in dir(handler_class):
+            handler = getattr(handler_class, handler_name)
+            for template, converters in getattr(handler, "__routes__", []):
+                self.add_route(Route(template, handler_name, converters))
+
+    def add_route(self, new_route: Route) -> None:
+        if not new_route.names:
+            table, key = self.exact, new_route.template
+        else:
+            table, key = self.prefixed, new_route.template[:new_route.template.index("{")]
+            if not key.endswith("-") or "-" in key[:-1]:
+                raise ValueError(f"Templated custom_id must start with '<prefix>-': {new_route.template}")
+
+        if key in table:
+            raise ValueError(f"Duplicate route for {key}")
+        table[key] = new_route
+
+    def match(self, custom_id: str) -> Optional[Tuple[Route, Dict[str, Any]]]:
+        matched_route = self.exact.get(custom_id)
+        if matched_route is not None:
+            return matched_route, {}
+
+        prefix, separator, arguments = custom_id.partition("-")
+        matched_route = self.prefixed.get(prefix + separator)
+        if matched_route is None:
+            return None
+        try:
+            return matched_route, matched_route.parse(arguments)
+        except ValueError:
+            return None
+
+    async def dispatch(self, interaction: discord.Interaction) -> bool:
+        match = self.match(interaction.data.get("custom_id", ""))
+        if match is None:
+            return False
+
+        matched_route, arguments = match
+        started_at = time.perf_counter()
+        try:
+            game_ui = await self.registry.resolve(interaction)
+            if game_ui is not None:
+                handler = getattr(game_ui, matched_route.handler_name)
+                await game_ui.dispatch(handler, interaction, **arguments)
+        except Exception:
+            matched_route.errors.inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            matched_route.seconds.observe(elapsed)
+            matched_route.max_time = max(matched_route.max_time, elapsed)
+        return True
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for route_entry in (*self.exact.values(), *self.prefixed.values()):
+            seconds = route_entry.seconds
+            stats[route_entry.template] = {
+                "count": seconds.count,
+                "errors": route_entry.errors.value,
+                "average_time": seconds.sum / seconds.count if seconds.count else 0.0,
+                "max_time": route_entry.max_time,
+            }
+        return stats
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+Action = Callable[[], Awaitable[Any]]
+
+
+class LobbyActor:
+    """Runs the actions of one lobby one at a time, in the order they were submitted.
+
+    Every lobby owns its own actor, so actions of different lobbies still run
+    concurrently on the event loop. The worker task only exists while there is
+    queued work, which keeps idle lobbies free of sleeping tasks.
+    """
+
+    def __init__(self):
+        self.queue: asyncio.Queue[Tuple[Action, asyncio.Future, float]] = asyncio.Queue()
+        self.worker: Optional[asyncio.Task] = None
+
+        self.processed = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+        self.max_wait = 0.0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    async def submit(self, action: Action) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((action, future, time.perf_counter()))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+        if self.worker is None or self.worker.done():
+            self.worker = asyncio.create_task(self.run())
+
+        return await future
+
+    async def run(self) -> None:
+        while not self.queue.empty():
+            action, future, queued_at = self.queue.get_nowait()
+
+            # The submitter gave up waiting, so the action is dropped as well.
+            if future.cancelled():
+                continue
+
+            wait = time.perf_counter() - queued_at
+            self.processed += 1
+            self.total_wait += wait
+            self.last_wait = wait
+            self.max_wait = max(self.max_wait, wait)
+
+            try:
+                result = await action()
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "processed": self.processed,
+            "last_wait": self.last_wait,
+            "max_wait": self.max_wait,
+            "average_wait": self.total_wait / self.processed if self.processed else 0.0,
+        }
@@ -0,0 +1,182 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from common.metrics import metrics
+
+
+class Priority(IntEnum):
+    INTERACTION = 0
+    BOARD = 1
+    CLEANUP = 2
+
+
+Call = Callable[[], Awaitable[Any]]
+Entry = Tuple[int, str, Call, asyncio.Future, float]
+
+
+REQUEST_SECONDS = metrics.histogram("uno_discord_request_seconds", "Discord API call latency by route", ["route"])
+REQUEST_ERRORS = metrics.counter("uno_discord_request_errors_total", "Discord API calls that raised, by route", ["route"])
+QUEUE_WAIT_SECONDS = metrics.histogram("uno_discord_queue_wait_seconds", "Time Discord API calls waited for a slot",
+                                       ["priority"])
+
+
+DEFAULT_ROUTE_LIMITS = {
+    "interaction.response": 32,
+    "message.send": 8,
+    "board.edit": 16,
+    "interaction.edit": 16,
+    "interaction.delete": 8,
+    "message.delete": 4,
+}
+
+
+class RestScheduler:
+    """Orders the bot's outgoing Discord calls across every lobby.
+
+    Calls wait in one queue per priority class and the most important waiting call
+    whose route still has a free slot runs first, so cleanups only use capacity that
+    interaction responses and board edits leave over. When more than max_queued calls
+    are waiting, board and cleanup submitters are held back until the queue drains;
+    interaction responses are never held back because Discord expects them within 3 s.
+
+    Within a priority every route has a queue of its own, and a heap holds the routes that
+    have calls waiting and a free slot, ordered by their oldest call. Starting a call only
+    looks at those routes, so a saturated route with a long backlog costs nothing per dispatch.
+    """
+
+    def __init__(self, max_concurrency: int = 32, route_limits: Optional[Dict[str, int]] = None,
+                 default_route_limit: int = 8, max_queued: int = 1000):
+        self.max_concurrency = max_concurrency
+        self.route_limits = {**DEFAULT_ROUTE_LIMITS, **(route_limits or {})}
+        self.default_route_limit = default_route_limit
+        self.max_queued = max_queued
+
+        self.queues: Dict[Priority, Dict[str, Deque[Entry]]] = {priority: {} for priority in Priority}
+        # (sequence number of the oldest waiting call, route) for the routes that may start a call. Entries are
+        # checked when popped, so a route that ran its call or filled up since is skipped then.
+        self.ready: Dict[Priority, List[Tuple[int, str]]] = {priority: [] for priority in Priority}
+        self.queued_by_priority: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.queued = 0
+        self.route_in_flight: Dict[str, int] = {}
+        self.in_flight = 0
+        self.counter = itertools.count()
+        self.not_full: Optional[asyncio.Condition] = None
+        self.tasks: Set[asyncio.Task] = set()
+
+        self.completed: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self.total_wait: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+        self.max_wait: Dict[Priority, float] = {priority: 0.0 for priority in Priority}
+
+    async def submit(self, priority: Priority, route: str, call: Call) -> Any:
+        if priority != Priority.INTERACTION and self.queued >= self.max_queued:
+            if self.not_full is None:
+                self.not_full = asyncio.Condition()
+            async with self.not_full:
+                await self.not_full.wait_for(lambda: self.queued < self.max_queued)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (next(self.counter), route, call, future, time.perf_counter())
+        queue = self.queues[priority].get(route)
+        if queue is None:
+            queue = self.queues[priority][route] = deque()
+        queue.append(entry)
+        self.queued += 1
+        self.queued_by_priority[priority] += 1
+        if len(queue) == 1:
+            self.mark_ready(priority, route)
+        self.dispatch()
+        return await future
+
+    def has_capacity(self, route: str) -> bool:
+        return self.route_in_flight.get(route, 0) < self.route_limits.get(route, self.default_route_limit)
+
+    def mark_ready(self, priority: Priority, route: str) -> None:
+        queue = self.queues[priority].get(route)
+        if queue and self.has_capacity(route):
+            heapq.heappush(self.ready[priority], (queue[0][0], route))
+
+    def pop_entry(self, priority: Priority, route: str) -> Entry:
+        queue = self.queues[priority][route]
+        entry = queue.popleft()
+        self.queued -= 1
+        self.queued_by_priority[priority] -= 1
+        if not queue:
+            del self.queues[priority][route]
+        return entry
+
+    def dispatch(self) -> None:
+        for priority, ready in self.ready.items():
+            while ready and self.in_flight < self.max_concurrency:
+                sequence, route = heapq.heappop(ready)
+                queue = self.queues[priority].get(route)
+                if not queue or queue[0][0] != sequence or not self.has_capacity(route):
+                    # Stale: the call already ran, or the route is full until one of its calls completes.
+                    continue
+
+                entry = self.pop_entry(priority, route)
+                self.mark_ready(priority, route)
+                if entry[3].cancelled():
+                    continue
+
+                self.in_flight += 1
+                self.route_in_flight[route] = self.route_in_flight.get(route, 0) + 1
+                task = asyncio.create_task(self.execute(priority, entry))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def execute(self, priority: Priority, entry: Entry) -> None:
+        _, route, call, future, queued_at = entry
+        started_at = time.perf_counter()
+        wait = started_at - queued_at
+        self.total_wait[priority] += wait
+        self.max_wait[priority] = max(self.max_wait[priority], wait)
+        QUEUE_WAIT_SECONDS.observe(wait, priority.name.lower())
+
+        try:
+            result = await call()
+        except Exception as e:
+            REQUEST_ERRORS.inc(route)
+            if not future.cancelled():
+                future.set_exception(e)
+        else:
+            if not future.cancelled():
+                future.set_result(result)
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - started_at, route)
+            self.in_flight -= 1
+            self.route_in_flight[route] -= 1
+            self.completed[priority] += 1
+            if self.route_in_flight[route] == self.route_limits.get(route, self.default_route_limit) - 1:
+                # The route was full, so it left the ready heaps; it may start its waiting calls again.
+                for waiting_priority in Priority:
+                    self.mark_ready(waiting_priority, route)
+            self.dispatch()
+            if self.not_full is not None:
+                async with self.not_full:
+                    self.not_full.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "queued": {priority.name.lower(): count for priority, count in self.queued_by_priority.items()},
+            "completed": {priority.name.lower(): count for priority, count in self.completed.items()},
+            "average_wait": {
+                priority.name.lower(): self.total_wait[priority] / self.completed[priority]
+                if self.completed[priority] else 0.0
+                for priority in Priority
+            },
+            "max_wait": {priority.name.lower(): wait for priority, wait in self.max_wait.items()},
+        }
+
+
+rest_scheduler = RestScheduler()
+
+metrics.gauge("uno_discord_requests_in_flight", "Discord API calls currently running", lambda: rest_scheduler.in_flight)
+metrics.gauge("uno_discord_requests_queued", "Discord API calls waiting for a slot, by priority",
+              lambda: {(priority.name.lower(),): count for priority, count in rest_scheduler.queued_by_priority.items()},
+              ["priority"])
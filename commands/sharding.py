@@ -0,0 +1,51 @@
+from typing import List, Optional, Sequence, Tuple
+
+LobbyKey = Tuple[int, int]
+
+
+def get_shard_id(guild_id: int, shard_count: int) -> int:
+    # Discord's own formula: every event of a guild arrives on this shard, direct messages on shard 0.
+    return (guild_id >> 22) % shard_count
+
+
+def parse_shard_ids(value: str) -> List[int]:
+    """Parses "0,2,5-7" into [0, 2, 5, 6, 7]."""
+    shard_ids = []
+    for part in value.split(","):
+        start, _, end = part.strip().partition("-")
+        shard_ids.extend(range(int(start), int(end or start) + 1))
+    return shard_ids
+
+
+def split_shards(shard_count: int, workers: int) -> List[List[int]]:
+    """Deals shard ids to workers round-robin, so every worker gets a similar share of the guilds."""
+    return [list(range(worker, shard_count, workers)) for worker in range(workers)]
+
+
+class ShardPlan:
+    """The shards one bot process connects to, and with them the lobbies it owns.
+
+    Discord sends every interaction of a guild to the connection of the guild's shard,
+    persistent lobby and game buttons included, so the process running that shard is the
+    only one that sees the lobby's clicks. It is also the only one that loads the lobby
+    from the state store after a restart.
+    """
+
+    def __init__(self, shard_count: int = 1, shard_ids: Optional[Sequence[int]] = None):
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+        self.shard_count = shard_count
+        self.shard_ids = tuple(shard_ids) if shard_ids is not None else tuple(range(shard_count))
+        if any(not 0 <= shard_id < shard_count for shard_id in self.shard_ids):
+            raise ValueError(f"Shard ids must be between 0 and {shard_count - 1}")
+        self.owned = frozenset(self.shard_ids)
+
+    @property
+    def is_sharded(self) -> bool:
+        return self.shard_count > 1
+
+    def owns(self, key: LobbyKey) -> bool:
+        return get_shard_id(key[0], self.shard_count) in self.owned
+
+    def __repr__(self) -> str:
+        return f"ShardPlan(shard_count={self.shard_count}, shard_ids={list(self.shard_ids)})"
@@ -0,0 +1,375 @@
+import asyncio
+import dbm
+import logging
+import sqlite3
+import struct
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from application.game_logic import GameLogic
+from application.snapshot import decode_game, encode_game
+
+LobbyKey = Tuple[int, int]
+
+# Layout (little endian):
+#   header  : magic "UNOL", version u8
+#   lobby   : message id u64, initiator id u64, last player id u64 (0 if nobody played yet), player count u16
+#   players : one member id u64 per player, in seat order once the game has started
+#   game    : started u8, followed by an application.snapshot game snapshot if it is set
+LOBBY_MAGIC = b"UNOL"
+LOBBY_VERSION = 1
+
+HEADER = struct.Struct("<4sB")
+LOBBY = struct.Struct("<QQQH")
+MEMBER = struct.Struct("<Q")
+VERSION = struct.Struct("<Q")
+
+logger = logging.getLogger(__name__)
+
+
+class LobbySnapshot:
+    __slots__ = ("message_id", "initiator_id", "last_player_id", "player_ids", "game_logic")
+
+    def __init__(self, message_id: int, initiator_id: int, last_player_id: Optional[int], player_ids: List[int],
+                 game_logic: Optional[GameLogic]):
+        self.message_id = message_id
+        self.initiator_id = initiator_id
+        self.last_player_id = last_player_id
+        self.player_ids = player_ids
+        # None while the lobby is still waiting for players.
+        self.game_logic = game_logic
+
+    @staticmethod
+    def from_game_ui(game_ui) -> "LobbySnapshot":
+        started = game_ui.game_logic.is_started()
+        return LobbySnapshot(
+            game_ui.message.id,
+            game_ui.initiator.id,
+            game_ui.last_player.id if game_ui.last_player else None,
+            [player.id for player in game_ui.players],
+            game_ui.game_logic if started else None,
+        )
+
+    def encode(self) -> bytes:
+        parts = [HEADER.pack(LOBBY_MAGIC, LOBBY_VERSION),
+                 LOBBY.pack(self.message_id, self.initiator_id, self.last_player_id or 0, len(self.player_ids))]
+        parts.extend(MEMBER.pack(player_id) for player_id in self.player_ids)
+        parts.append(bytes([self.game_logic is not None]))
+        if self.game_logic is not None:
+            parts.append(encode_game(self.game_logic))
+        return b"".join(parts)
+
+    @staticmethod
+    def decode(data: bytes) -> "LobbySnapshot":
+        magic, version = HEADER.unpack_from(data, 0)
+        if magic != LOBBY_MAGIC:
+            raise ValueError("Not a lobby snapshot")
+        if version != LOBBY_VERSION:
+            raise ValueError(f"Unsupported lobby snapshot version: {version}")
+
+        message_id, initiator_id, last_player_id, player_count = LOBBY.unpack_from(data, HEADER.size)
+        offset = HEADER.size + LOBBY.size
+        player_ids = [player_id for (player_id,) in MEMBER.iter_unpack(data[offset:offset + player_count * MEMBER.size])]
+        offset += player_count * MEMBER.size
+
+        game_logic = None
+        if data[offset]:
+            game_logic, _ = decode_game(data[offset + 1:])
+        return LobbySnapshot(message_id, initiator_id, last_player_id or None, player_ids, game_logic)
+
+
+class SnapshotStore:
+    """Keeps the latest snapshot of every open lobby, with a version per lobby.
+
+    Writes are optimistic: each upsert names the version it was based on (0 for a lobby
+    the store does not have yet) and is only applied while the stored version still
+    matches, as that version plus one. A mismatch means another process wrote the lobby
+    since, and the key is returned as a conflict. Every method blocks, so callers run
+    them in a worker thread.
+    """
+
+    def write_batch(self, upserts: List[Tuple[LobbyKey, int, bytes]], deletes: List[LobbyKey]) -> List[LobbyKey]:
+        raise NotImplementedError
+
+    def load_all(self, owns: Optional[Callable[[LobbyKey], bool]] = None) -> List[Tuple[LobbyKey, int, bytes]]:
+        """Returns (key, version, snapshot) for every stored lobby, or only those owns() accepts."""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemorySnapshotStore(SnapshotStore):
+    """Keeps the snapshots in this process; for tests and load runs that should not touch the disk."""
+
+    def __init__(self):
+        self.rows: Dict[LobbyKey, Tuple[int, bytes]] = {}
+        self.lock = threading.Lock()
+
+    def write_batch(self, upserts: List[Tuple[LobbyKey, int, bytes]], deletes: List[LobbyKey]) -> List[LobbyKey]:
+        conflicts = []
+        with self.lock:
+            for key, version, data in upserts:
+                if self.rows.get(key, (0, b""))[0] != version:
+                    conflicts.append(key)
+                else:
+                    self.rows[key] = (version + 1, data)
+            for key in deletes:
+                self.rows.pop(key, None)
+        return conflicts
+
+    def load_all(self, owns: Optional[Callable[[LobbyKey], bool]] = None) -> List[Tuple[LobbyKey, int, bytes]]:
+        with self.lock:
+            return [(key, version, data) for key, (version, data) in self.rows.items() if owns is None or owns(key)]
+
+
+class SqliteSnapshotStore(SnapshotStore):
+    """SQLite table with the latest snapshot of every open lobby.
+
+    The database runs in WAL mode so a batch of writes is one fsync'd commit and readers
+    never block the writer. Several bot processes can share one file; each writes its own
+    lobbies, and the version check catches two processes writing the same one.
+    """
+
+    def __init__(self, path: str):
+        self.connection = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self.lock = threading.Lock()
+        with self.lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS lobbies ("
+                "guild_id INTEGER NOT NULL, channel_id INTEGER NOT NULL, data BLOB NOT NULL, "
+                "updated_at REAL NOT NULL, PRIMARY KEY (guild_id, channel_id))"
+            )
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(lobbies)")}
+            if "version" not in columns:
+                # Tables written before lobbies were versioned.
+                self.connection.execute("ALTER TABLE lobbies ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            self.connection.commit()
+
+    def write_batch(self, upserts: List[Tuple[LobbyKey, int, bytes]], deletes: List[LobbyKey]) -> List[LobbyKey]:
+        now = time.time()
+        conflicts = []
+        with self.lock, self.connection:
+            for (guild_id, channel_id), version, data in upserts:
+                if version == 0:
+                    cursor = self.connection.execute(
+                        "INSERT INTO lobbies (guild_id, channel_id, data, updated_at, version) VALUES (?, ?, ?, ?, 1) "
+                        "ON CONFLICT (guild_id, channel_id) DO NOTHING",
+                        (guild_id, channel_id, data, now),
+                    )
+                else:
+                    cursor = self.connection.execute(
+                        "UPDATE lobbies SET data = ?, updated_at = ?, version = version + 1 "
+                        "WHERE guild_id = ? AND channel_id = ? AND version = ?",
+                        (data, now, guild_id, channel_id, version),
+                    )
+                if cursor.rowcount == 0:
+                    conflicts.append((guild_id, channel_id))
+            self.connection.executemany("DELETE FROM lobbies WHERE guild_id = ? AND channel_id = ?", deletes)
+        return conflicts
+
+    def load_all(self, owns: Optional[Callable[[LobbyKey], bool]] = None) -> List[Tuple[LobbyKey, int, bytes]]:
+        with self.lock:
+            rows = self.connection.execute("SELECT guild_id, channel_id, version, data FROM lobbies").fetchall()
+        return [((guild_id, channel_id), version, data) for guild_id, channel_id, version, data in rows
+                if owns is None or owns((guild_id, channel_id))]
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+
+class DbmSnapshotStore(SnapshotStore):
+    """Stores the snapshots in a dbm key-value file, standing in for an external key-value store.
+
+    Every value is the version (u64) followed by the snapshot. dbm files must not be
+    shared between processes, so this store suits a single bot process.
+    """
+
+    def __init__(self, path: str):
+        self.db = dbm.open(path, "c")
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def encode_key(key: LobbyKey) -> bytes:
+        return f"{key[0]}:{key[1]}".encode()
+
+    @staticmethod
+    def decode_key(raw: bytes) -> LobbyKey:
+        guild_id, _, channel_id = raw.decode().partition(":")
+        return int(guild_id), int(channel_id)
+
+    def write_batch(self, upserts: List[Tuple[LobbyKey, int, bytes]], deletes: List[LobbyKey]) -> List[LobbyKey]:
+        conflicts = []
+        with self.lock:
+            for key, version, data in upserts:
+                raw_key = self.encode_key(key)
+                stored = self.db.get(raw_key)
+                stored_version = VERSION.unpack_from(stored)[0] if stored is not None else 0
+                if stored_version != version:
+                    conflicts.append(key)
+                else:
+                    self.db[raw_key] = VERSION.pack(version + 1) + data
+            for key in deletes:
+                raw_key = self.encode_key(key)
+                if raw_key in self.db:
+                    del self.db[raw_key]
+            if hasattr(self.db, "sync"):
+                self.db.sync()
+        return conflicts
+
+    def load_all(self, owns: Optional[Callable[[LobbyKey], bool]] = None) -> List[Tuple[LobbyKey, int, bytes]]:
+        rows = []
+        with self.lock:
+            for raw_key in self.db.keys():
+                key = self.decode_key(raw_key)
+                if owns is None or owns(key):
+                    value = self.db[raw_key]
+                    rows.append((key, VERSION.unpack_from(value)[0], value[VERSION.size:]))
+        return rows
+
+    def close(self) -> None:
+        with self.lock:
+            self.db.close()
+
+
+def open_snapshot_store(url: str) -> SnapshotStore:
+    """Opens "memory:", "dbm:<path>" or "sqlite:<path>"; a plain path is a SQLite file."""
+    kind, separator, path = url.partition(":")
+    if not separator:
+        return SqliteSnapshotStore(url)
+    if kind == "memory":
+        return MemorySnapshotStore()
+    if kind == "sqlite":
+        return SqliteSnapshotStore(path)
+    if kind == "dbm":
+        return DbmSnapshotStore(path)
+    raise ValueError(f"Unknown snapshot store: {url}")
+
+
+class SnapshotWriter:
+    """Persists the lobbies that changed, at most once per interval and off the event loop.
+
+    mark_dirty only records the lobby, so a turn never waits for the disk. Every interval
+    the dirty lobbies are encoded on the event loop, which takes microseconds per lobby
+    and sees a consistent game state, and the batch is written by a worker thread.
+    Lobbies whose game, players and board are the same as at their last write are skipped.
+    """
+
+    def __init__(self, store: SnapshotStore, interval: float = 0.5,
+                 on_conflict: Optional[Callable[[List[LobbyKey]], None]] = None):
+        self.store = store
+        self.interval = interval
+        self.pending: Dict[LobbyKey, object] = {}
+        self.task: Optional[asyncio.Task] = None
+        # key -> stored version this process last read or wrote, and what the lobby looked like then.
+        self.versions: Dict[LobbyKey, int] = {}
+        self.fingerprints: Dict[LobbyKey, Tuple] = {}
+        self.on_conflict = on_conflict
+
+        self.batches_written = 0
+        self.snapshots_written = 0
+        self.snapshots_skipped = 0
+        self.snapshots_deleted = 0
+        self.conflicts = 0
+        self.bytes_written = 0
+        self.last_write_time = 0.0
+        self.max_write_time = 0.0
+
+    def mark_dirty(self, game_ui) -> None:
+        self.pending[game_ui.key] = game_ui
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while self.pending:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+
+    @staticmethod
+    def get_fingerprint(game_ui) -> Tuple:
+        return (id(game_ui), game_ui.game_logic.version, tuple(player.id for player in game_ui.players),
+                game_ui.message.id, game_ui.last_player.id if game_ui.last_player else None)
+
+    async def flush(self) -> None:
+        pending, self.pending = self.pending, {}
+        if not pending:
+            return
+
+        upserts: List[Tuple[LobbyKey, int, bytes]] = []
+        deletes: List[LobbyKey] = []
+        for key, game_ui in pending.items():
+            # Closed lobbies and finished games have nothing left to resume.
+            if game_ui.registry.games.get(key) is not game_ui or game_ui.message is None \
+                    or game_ui.winner_message is not None:
+                # Only rows this process wrote or restored are its to delete.
+                if key in self.versions:
+                    deletes.append(key)
+                continue
+
+            fingerprint = self.get_fingerprint(game_ui)
+            if self.fingerprints.get(key) == fingerprint:
+                self.snapshots_skipped += 1
+                continue
+            self.fingerprints[key] = fingerprint
+            upserts.append((key, self.versions.get(key, 0), LobbySnapshot.from_game_ui(game_ui).encode()))
+
+        if not upserts and not deletes:
+            return
+
+        started_at = time.perf_counter()
+        conflicts = await asyncio.to_thread(self.store.write_batch, upserts, deletes)
+        elapsed = time.perf_counter() - started_at
+
+        for key in deletes:
+            self.versions.pop(key, None)
+            self.fingerprints.pop(key, None)
+        for key, version, _ in upserts:
+            self.versions[key] = version + 1
+        for key in conflicts:
+            self.release(key)
+        if conflicts:
+            self.conflicts += len(conflicts)
+            logger.warning("Lobbies were written by another process", extra={"lobbies": len(conflicts)})
+            if self.on_conflict is not None:
+                self.on_conflict(conflicts)
+
+        self.batches_written += 1
+        self.snapshots_written += len(upserts) - len(conflicts)
+        self.snapshots_deleted += len(deletes)
+        self.bytes_written += sum(len(data) for _, _, data in upserts)
+        self.last_write_time = elapsed
+        self.max_write_time = max(self.max_write_time, elapsed)
+
+    def release(self, key: LobbyKey) -> None:
+        """Forgets a lobby without deleting it from the store, e.g. because another process owns it now."""
+        self.pending.pop(key, None)
+        self.versions.pop(key, None)
+        self.fingerprints.pop(key, None)
+
+    async def load_all(self, owns: Optional[Callable[[LobbyKey], bool]] = None) -> List[Tuple[LobbyKey, bytes]]:
+        rows = await asyncio.to_thread(self.store.load_all, owns)
+        for key, version, _ in rows:
+            self.versions[key] = version
+        return [(key, data) for key, _, data in rows]
+
+    async def delete(self, keys: Set[LobbyKey]) -> None:
+        await asyncio.to_thread(self.store.write_batch, [], list(keys))
+        for key in keys:
+            self.release(key)
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            "pending": len(self.pending),
+            "batches_written": self.batches_written,
+            "snapshots_written": self.snapshots_written,
+            "snapshots_skipped": self.snapshots_skipped,
+            "snapshots_deleted": self.snapshots_deleted,
+            "conflicts": self.conflicts,
+            "bytes_written": self.bytes_written,
+            "last_write_time": self.last_write_time,
+            "max_write_time": self.max_write_time,
+        }
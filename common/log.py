@@ -0,0 +1,98 @@
+import atexit
+import copy
+import itertools
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from typing import Optional
+
+# Attributes every LogRecord has; anything else on a record came in through extra= and is logged as a field.
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+listener: Optional[logging.handlers.QueueListener] = None
+
+
+def quote(value) -> str:
+    text = str(value)
+    if not text or any(character in text for character in ' "=\n'):
+        return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+    return text
+
+
+class LogfmtFormatter(logging.Formatter):
+    """Formats records as one logfmt line: time, level, logger, message, then the fields passed with extra=."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created))
+        parts = [f"time={timestamp}.{int(record.msecs):03d}Z", f"level={record.levelname.lower()}",
+                 f"logger={record.name}", f"msg={quote(record.getMessage())}"]
+        parts.extend(f"{key}={quote(value)}" for key, value in record.__dict__.items()
+                     if key not in RECORD_ATTRIBUTES)
+        line = " ".join(parts)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            line = f"{line}\n{record.exc_text}"
+        return line
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """Queues records with their message resolved but their fields and traceback kept apart for the formatter."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks hold frames, so they are rendered here instead of crossing to the writer thread.
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class DebugSampler(logging.Filter):
+    """Keeps one in every `every` debug records and all records above debug."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = max(1, every)
+        self.counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > logging.DEBUG or next(self.counter) % self.every == 0
+
+
+def configure_logging(level: str = "INFO", debug_sample_every: int = 100) -> None:
+    """Sends every log record through a queue to a background thread that writes it to stderr.
+
+    Logging on the event loop is then a queue put. Debug records are off unless level is
+    DEBUG, and even then only one in debug_sample_every is written, because the debug
+    messages sit on hot paths such as checking every card of a hand.
+    """
+    global listener
+    if listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(LogfmtFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = RecordQueueHandler(records)
+    queue_handler.addFilter(DebugSampler(debug_sample_every))
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level.upper())
+
+    listener = logging.handlers.QueueListener(records, stream_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    global listener
+    if listener is not None:
+        listener.stop()
+        listener = None
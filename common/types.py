@@ -1,27 +1,97 @@
-from typing import TypedDict, List, Literal, Union
+from typing import Dict, List, Literal, Tuple
 
 # Define the card color and face literals
 CardColor = Literal["Blue", "Green", "Red", "Yellow", "Wild"]
 CardFace = Literal[
-    "0", "1", "2", "3", "4", "5", "6", "7", "8", "9", 
-    "Skip", "Reverse", "Draw Two", 
+    "0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
+    "Skip", "Reverse", "Draw Two",
     "Wild", "Wild Draw Four", "Wild Draw Eight"
 ]
 
-class Card(TypedDict):
-    color: CardColor
-    face: CardFace
-    id: int
-
-class Player(TypedDict):
-    hand: List['Card']
-    has_played_card: bool  # Converted camelCase to snake_case
-    has_said_uno: bool     # Converted camelCase to snake_case
-    id: str
-
-class GameState(TypedDict):
-    current_player_index: int  # Converted camelCase to snake_case
-    deck: List[Card]
-    discard: List[Card]
-    is_reversed: bool          # Converted camelCase to snake_case
-    players: List[Player]
+# A card code packs a color and a face into one byte: (color index << 4) | face index.
+# application.card_codes builds its playability table on the same numbering.
+COLORS: Tuple[CardColor, ...] = ("Blue", "Green", "Red", "Yellow", "Wild")
+FACES: Tuple[CardFace, ...] = ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9",
+                               "Skip", "Reverse", "Draw Two", "Wild", "Wild Draw Four", "Wild Draw Eight")
+CARD_CODES: Dict[Tuple[str, str], int] = {
+    (color, face): (color_index << 4) | face_index
+    for color_index, color in enumerate(COLORS)
+    for face_index, face in enumerate(FACES)
+}
+
+
+# Slotted classes rather than dicts: a table holds 108+ cards, and a slotted card takes less than
+# half the memory of a three-key dict (about 105 against 225 bytes, see benchmarks/memory.py).
+# Card.color is a property so that Card.code follows recolors; every other field is a plain slot.
+class Card:
+    __slots__ = ("_color", "code", "face", "id")
+
+    def __init__(self, color: CardColor, face: CardFace, id: int):
+        self.face = face
+        self.id = id
+        self.color = color
+
+    @property
+    def color(self) -> CardColor:
+        return self._color
+
+    @color.setter
+    def color(self, color: CardColor) -> None:
+        # Wild cards take the chosen color while they lie on the discard pile, so the code follows the color.
+        self._color = color
+        self.code = CARD_CODES[(color, self.face)]
+
+    def copy(self) -> "Card":
+        return Card(self.color, self.face, self.id)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.id == other.id and self.color == other.color and self.face == other.face
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Card({self.color!r}, {self.face!r}, {self.id})"
+
+
+class Player:
+    __slots__ = ("hand", "has_played_card", "has_said_uno", "id")
+
+    def __init__(self, id: str, hand: List[Card] = None, has_played_card: bool = False, has_said_uno: bool = False):
+        self.hand = hand if hand is not None else []
+        self.has_played_card = has_played_card
+        self.has_said_uno = has_said_uno
+        self.id = id
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Player):
+            return NotImplemented
+        return (self.id == other.id and self.hand == other.hand and self.has_played_card == other.has_played_card
+                and self.has_said_uno == other.has_said_uno)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Player({self.id!r}, {len(self.hand)} cards)"
+
+
+class GameState:
+    __slots__ = ("current_player_index", "deck", "discard", "is_reversed", "players")
+
+    def __init__(self, current_player_index: int = 0, deck: List[Card] = None, discard: List[Card] = None,
+                 is_reversed: bool = False, players: List[Player] = None):
+        self.current_player_index = current_player_index
+        self.deck = deck if deck is not None else []
+        self.discard = discard if discard is not None else []
+        self.is_reversed = is_reversed
+        self.players = players if players is not None else []
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return (self.current_player_index == other.current_player_index and self.deck == other.deck
+                and self.discard == other.discard and self.is_reversed == other.is_reversed
+                and self.players == other.players)
+
+    __hash__ = None
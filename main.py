@@ -1,43 +1,93 @@
-import re
+import logging
+import os
+import subprocess
+import sys
+from typing import Optional
 
 import discord
 from discord.ext import commands
 
-from commands.game_ui import GameUi, GameView, UnoButtonView
+from application.event_log import EventLogWriter
+from commands.ai_players import ai_players
+from commands.card_assets import DiscordChannelUploader, card_images, card_urls
+from commands.game_registry import GameRegistry
+from commands.game_ui import GameUi
+from commands.interaction_router import InteractionRouter
+from commands.sharding import ShardPlan, parse_shard_ids, split_shards
+from commands.snapshot_store import SnapshotWriter, open_snapshot_store
+from common.log import configure_logging
+from common.metrics import MetricsServer, metrics
 
 from dotenv import dotenv_values
 
+logger = logging.getLogger("uno")
+
+
+def get_setting(name: str) -> Optional[str]:
+    # The environment wins over .env, which is how the worker processes get their own shards.
+    return os.environ.get(name) or dotenv_values(".env").get(name)
+
+
+# SHARD_COUNT=N splits the gateway connection into N shards; SHARD_IDS=0,2-3 runs only those in this process.
+shard_ids = get_setting("SHARD_IDS")
+shards = ShardPlan(int(get_setting("SHARD_COUNT") or 1), parse_shard_ids(shard_ids) if shard_ids else None)
+worker_index = int(get_setting("WORKER_INDEX") or 0)
+
 intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="!", intents=intents)
+if shards.is_sharded:
+    bot = commands.AutoShardedBot(command_prefix="!", intents=intents, shard_count=shards.shard_count,
+                                  shard_ids=list(shards.shard_ids))
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents)
 
-game_ui = GameUi()
+game_registry = GameRegistry(shards=shards)
+interaction_router = InteractionRouter(game_registry, GameUi)
+game_registry.register_metrics()
+metrics_server = None
 
 
 @bot.event
 async def on_ready():
-    global game_view
-    game_view = GameView(game_ui)
-    bot.add_view(game_view)
-    uno_view = UnoButtonView(game_ui)
-    bot.add_view(uno_view)
-    print(f"Bot is ready as {bot.user}")
-    print(f"Registered commands: {[cmd.name for cmd in bot.application_commands]}")
+    global metrics_server
+
+    # Optional channel the bot uploads each card image to once, so boards can link to it by URL.
+    asset_channel_id = get_setting("ASSET_CHANNEL_ID")
+    asset_channel = bot.get_channel(int(asset_channel_id)) if asset_channel_id else None
+    if asset_channel is not None and card_urls.uploader is None:
+        card_urls.set_uploader(DiscordChannelUploader(asset_channel, bot.user.id))
+        card_urls.start_warm_up()
+
+    # on_ready also fires after reconnects, the saved lobbies are only restored on the first one.
+    # SNAPSHOT_STORE is memory:, dbm:<path> or sqlite:<path>; only SQLite can be shared by several workers.
+    if game_registry.snapshots is None:
+        snapshot_store = get_setting("SNAPSHOT_STORE") or f"sqlite:{get_setting('SNAPSHOT_PATH') or 'uno_snapshots.sqlite3'}"
+        game_registry.set_snapshots(SnapshotWriter(open_snapshot_store(snapshot_store)))
+        restored = await game_registry.restore(bot)
+        logger.info("Restored lobbies", extra={"lobbies": restored, "shards": list(shards.shard_ids)})
+
+    # Optional local Prometheus endpoint, e.g. METRICS_PORT=9464 serves http://127.0.0.1:9464/metrics
+    # Worker processes serve their metrics on METRICS_PORT + their index.
+    metrics_port = get_setting("METRICS_PORT")
+    if metrics_port and metrics_server is None:
+        metrics_server = MetricsServer(metrics, port=int(metrics_port) + worker_index)
+        await metrics_server.start()
+
+    logger.info("Bot is ready", extra={"user": str(bot.user), "commands": [cmd.name for cmd in bot.application_commands]})
 
 
 @bot.command(name="uno")
 async def start(ctx):
-    print("UNO command received from", ctx.author)
-    await game_ui.handle_start(ctx)
+    logger.info("UNO command received", extra={"author": str(ctx.author), "channel": ctx.channel.id})
+    game_ui = game_registry.get_for_context(ctx)
+    await game_ui.dispatch(game_ui.handle_start, ctx)
 
 
 @bot.event
 async def on_application_command_error(ctx, error):
-    print(f"Command error: {error}")
-    import traceback
-    traceback.print_exception(type(error), error, error.__traceback__)
+    logger.error("Command error", exc_info=error)
 
 
-# Handle custom interactions for card buttons
+# Every button click, including the persistent lobby and game buttons, is handled by exactly one routed handler
 @bot.event
 async def on_interaction(interaction: discord.Interaction):
     # Only handle component interactions and skip command interactions
@@ -48,27 +98,57 @@ async def on_interaction(interaction: discord.Interaction):
     if hasattr(interaction, 'command') and interaction.command is not None:
         return
 
-    custom_id = interaction.data.get("custom_id", "")
+    await interaction_router.dispatch(interaction)
 
-    # Handle card button
-    card_match = re.match(r'^card-(\d+)$', custom_id)
-    if card_match:
-        card_id = int(card_match.group(1))
-        await game_ui.handle_card_button(interaction, card_id)
-        return
 
-    # Handle color button
-    color_match = re.match(r'^color-(Red|Green|Blue|Yellow)-(\d+)$', custom_id)
-    if color_match:
-        color = color_match.group(1)
-        card_id = int(color_match.group(2))
-        await game_ui.handle_color_selection(interaction, card_id, color)
-        return
+def run_workers(workers: int) -> int:
+    """Runs the bot as one process per worker, each connected to its own share of the shards.
+
+    Lobbies belong to the shard of their guild, and Discord sends each guild's interactions
+    to that shard's connection, so the workers share nothing but the snapshot store.
+    """
+    shard_count = max(int(get_setting("SHARD_COUNT") or workers), workers)
+    processes = []
+    for index, worker_shards in enumerate(split_shards(shard_count, workers)):
+        env = {**os.environ, "SHARD_COUNT": str(shard_count), "SHARD_IDS": ",".join(map(str, worker_shards)),
+               "WORKER_INDEX": str(index)}
+        processes.append(subprocess.Popen([sys.executable, *sys.argv], env=env))
+
+    try:
+        return max(process.wait() for process in processes)
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        return max(process.wait() for process in processes)
 
 
 if __name__ == "__main__":
-    config = dotenv_values(".env")
+    config = {**dotenv_values(".env"), **os.environ}
+    # LOG_LEVEL=DEBUG turns on the per-card debug messages, LOG_DEBUG_SAMPLE=N keeps one in N of them.
+    configure_logging(config.get("LOG_LEVEL") or "INFO", int(config.get("LOG_DEBUG_SAMPLE") or 100))
+    # WORKERS=N starts N bot processes, see run_workers.
+    workers = int(config.get("WORKERS") or 1)
+    if workers > 1 and "WORKER_INDEX" not in os.environ:
+        sys.exit(run_workers(workers))
+
     token = config.get("TOKEN")
     if token is None or not token:
         raise ValueError("loo fail nimega .env ja pane sinna TOKEN=isiklik Discord Developer Portal token")
-    bot.run(token)
+    card_images.load()
+    # AI_POLICY is random, first, aggressive or mcts; mcts searches for up to AI_MOVE_BUDGET seconds and
+    # AI_PLAYOUTS playouts per move (mcts:N sets them to N) in AI_WORKERS processes (default: one per core).
+    ai_players.configure(policy=config.get("AI_POLICY") or None,
+                         move_budget=float(config["AI_MOVE_BUDGET"]) if config.get("AI_MOVE_BUDGET") else None,
+                         max_playouts=int(config["AI_PLAYOUTS"]) if config.get("AI_PLAYOUTS") else None,
+                         workers=int(config["AI_WORKERS"]) if config.get("AI_WORKERS") else None)
+    event_log_path = config.get("EVENT_LOG_PATH") or "uno_events.log"
+    if "WORKER_INDEX" in os.environ:
+        # Every worker appends to a log of its own.
+        root, extension = os.path.splitext(event_log_path)
+        event_log_path = f"{root}.{worker_index}{extension}"
+    game_registry.event_log = EventLogWriter(event_log_path)
+    try:
+        bot.run(token)
+    finally:
+        ai_players.close()
+        game_registry.event_log.close()
@@ -0,0 +1,246 @@
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+
+from application import card_codes
+from application.game_logic import GameLogic
+from application.types import GameCheat
+from common.types import Card
+from simulation.engine import SimulationStats
+
+# Card types ignore the color a wild card was given: 4 colors x 13 faces, then the three wild faces.
+COLORED_FACES = 13
+WILD = 4 * COLORED_FACES
+WILD_DRAW_FOUR = WILD + 1
+WILD_DRAW_EIGHT = WILD + 2
+TYPE_COUNT = WILD + 3
+
+SKIP = card_codes.FACE_INDEX["Skip"]
+REVERSE = card_codes.FACE_INDEX["Reverse"]
+DRAW_TWO = card_codes.FACE_INDEX["Draw Two"]
+
+TYPE_COLOR = np.array([t // COLORED_FACES for t in range(WILD)] + [card_codes.WILD_COLOR] * 3, dtype=np.int8)
+TYPE_FACE = np.array([t % COLORED_FACES for t in range(WILD)] +
+                     [card_codes.FACE_INDEX[face] for face in ("Wild", "Wild Draw Four", "Wild Draw Eight")],
+                     dtype=np.int8)
+IS_WILD = TYPE_COLOR == card_codes.WILD_COLOR
+
+CHEAT_TYPES = {GameCheat.GIVE_WILD_FOUR: WILD_DRAW_FOUR, GameCheat.GIVE_WILD_EIGHT: WILD_DRAW_EIGHT}
+
+
+def get_card_type(card: Card) -> int:
+    face = card_codes.FACE_INDEX[card.face]
+    if card.color == "Wild":
+        return WILD + face - card_codes.FACE_INDEX["Wild"]
+    return card_codes.COLOR_INDEX[card.color] * COLORED_FACES + face
+
+
+# Built from GameLogic.create_cards so both engines always deal from the same deck.
+STANDARD_DECK = np.array([get_card_type(card) for card in GameLogic.create_cards()], dtype=np.int8)
+
+
+class BatchedSimulator:
+    """Plays many games in lock-step, one turn of every unfinished game per step.
+
+    Follows the same rules as GameLogic, including its quirks: Wild Draw Four does
+    not skip the victim, Wild Draw Eight does, and a skipped player holding a single
+    card pays the two card UNO penalty. Every seat plays like RandomPolicy and calls
+    UNO whenever it plays from a two card hand.
+
+    Every step has a fixed NumPy overhead, paid until the longest game of the batch
+    ends, so large batches pay off: 4 player games run at about 7k games/s in batches
+    of 1,000 and 14k games/s in batches of 10,000 on one core, against 1.3k for the
+    scalar engine.
+    """
+
+    def __init__(self, games: int, players: int = 4, max_turns: int = 2000, cheat: Optional[str] = None,
+                 cheat_seat: int = 0, seed: int = 0):
+        hand_cards = 7 * players
+        if hand_cards > len(STANDARD_DECK):
+            raise ValueError("Too many players for one deck")
+
+        self.games = games
+        self.players = players
+        self.max_turns = max_turns
+        self.rng = np.random.default_rng(seed)
+
+        capacity = len(STANDARD_DECK) + 1
+        order = self.rng.random((games, len(STANDARD_DECK))).argsort(axis=1)
+        shuffled = STANDARD_DECK[order]
+
+        # The top of a deck row is at deck_len - 1, like popping from the end of GameLogic's list.
+        self.deck = np.zeros((games, capacity), dtype=np.int8)
+        self.deck[:, :len(STANDARD_DECK) - hand_cards] = shuffled[:, hand_cards:]
+        self.deck_len = np.full(games, len(STANDARD_DECK) - hand_cards, dtype=np.int16)
+
+        rows = np.repeat(np.arange(games), hand_cards)
+        seats = np.tile(np.repeat(np.arange(players), 7), games)
+        self.hands = np.zeros((games, players, TYPE_COUNT), dtype=np.int16)
+        np.add.at(self.hands, (rows, seats, shuffled[:, :hand_cards].ravel()), 1)
+        self.hand_size = np.full((games, players), 7, dtype=np.int16)
+
+        if cheat is not None:
+            self.hands[:, cheat_seat, CHEAT_TYPES[GameCheat(cheat)]] += 1
+            self.hand_size[:, cheat_seat] += 1
+
+        # The discard pile is kept as counts without the top card, which is all a reshuffle needs.
+        self.discard_counts = np.zeros((games, TYPE_COUNT), dtype=np.int16)
+        self.top_type = np.full(games, -1, dtype=np.int8)
+        self.top_color = np.full(games, -1, dtype=np.int8)
+        self.top_face = np.full(games, -1, dtype=np.int8)
+
+        self.current = np.zeros(games, dtype=np.int16)
+        self.direction = np.ones(games, dtype=np.int16)
+        self.done = np.zeros(games, dtype=bool)
+        self.winner = np.full(games, -1, dtype=np.int16)
+        self.turns = np.zeros(games, dtype=np.int32)
+        self.reshuffles = np.zeros(games, dtype=np.int32)
+
+    def run(self) -> SimulationStats:
+        while self.step():
+            pass
+        return self.get_stats()
+
+    def step(self) -> bool:
+        g = np.flatnonzero(~self.done)
+        if g.size == 0:
+            return False
+
+        self.turns[g] += 1
+        current = self.current[g]
+        hand = self.hands[g, current]
+
+        no_top = (self.top_type[g] < 0)[:, None]
+        matches = ((TYPE_COLOR[None, :] == self.top_color[g][:, None]) |
+                   (TYPE_FACE[None, :] == self.top_face[g][:, None]))
+        legal = (hand > 0) & (no_top | IS_WILD[None, :] | matches)
+
+        # Picks the r-th legal card, counting copies, so every legal card, not every card type, is equally likely.
+        legal_counts = np.where(legal, hand, 0).cumsum(axis=1)
+        total = legal_counts[:, -1]
+        picked = (self.rng.random(g.size) * total).astype(legal_counts.dtype)
+        choice = (legal_counts <= picked[:, None]).sum(axis=1).astype(np.int8)
+        can_move = total > 0
+
+        draw_games, draw_seats = g[~can_move], current[~can_move]
+        self.draw(draw_games, draw_seats, 1)
+        self.next_turn(draw_games, np.zeros(draw_games.size, dtype=bool))
+
+        self.play(g[can_move], current[can_move], choice[can_move])
+
+        self.done[g[self.turns[g] >= self.max_turns]] = True
+        return True
+
+    def play(self, g: np.ndarray, seats: np.ndarray, cards: np.ndarray) -> None:
+        said_uno = self.hand_size[g, seats] == 2
+        self.hands[g, seats, cards] -= 1
+        self.hand_size[g, seats] -= 1
+
+        had_top = self.top_type[g] >= 0
+        self.discard_counts[g[had_top], self.top_type[g[had_top]]] += 1
+        self.top_type[g] = cards
+        self.top_face[g] = TYPE_FACE[cards]
+        colors = TYPE_COLOR[cards].copy()
+        wild = IS_WILD[cards]
+        if wild.any():
+            colors[wild] = self.choose_colors(g[wild], seats[wild])
+        self.top_color[g] = colors
+
+        faces = TYPE_FACE[cards]
+        next_seats = (seats + self.direction[g]) % self.players
+        for card_type, count in ((WILD_DRAW_FOUR, 4), (WILD_DRAW_EIGHT, 8)):
+            hit = cards == card_type
+            self.draw(g[hit], next_seats[hit], count)
+        hit = faces == DRAW_TWO
+        self.draw(g[hit], next_seats[hit], 2)
+
+        reverse = faces == REVERSE
+        self.direction[g[reverse]] *= -1
+
+        skip = (cards == WILD_DRAW_EIGHT) | (faces == SKIP) | (faces == DRAW_TWO)
+        self.next_turn(g, said_uno)
+        self.next_turn(g[skip], np.zeros(int(skip.sum()), dtype=bool))
+
+        won = self.hand_size[g, seats] == 0
+        self.done[g[won]] = True
+        self.winner[g[won]] = seats[won]
+
+    def choose_colors(self, g: np.ndarray, seats: np.ndarray) -> np.ndarray:
+        # Most common color left in the hand, ties and color-less hands broken at random.
+        counts = self.hands[g, seats, :WILD].reshape(g.size, 4, COLORED_FACES).sum(axis=2)
+        return (counts + self.rng.random(counts.shape) * 0.5).argmax(axis=1).astype(np.int8)
+
+    def next_turn(self, g: np.ndarray, said_uno: np.ndarray) -> None:
+        current = self.current[g]
+        penalty = (self.hand_size[g, current] == 1) & ~said_uno
+        if penalty.any():
+            self.draw(g[penalty], current[penalty], 2)
+        self.current[g] = (current + self.direction[g]) % self.players
+
+    def draw(self, g: np.ndarray, seats: np.ndarray, count: int) -> None:
+        if g.size == 0:
+            return
+        deck_len = self.deck_len[g]
+        self.take(g, seats, np.minimum(deck_len, count))
+
+        short = deck_len < count
+        if short.any():
+            # GameLogic reshuffles when the deck runs out halfway, and again for every card the fresh deck lacks.
+            g, seats, missing = g[short], seats[short], count - deck_len[short]
+            self.reshuffle(g)
+            deck_len = self.deck_len[g]
+            self.take(g, seats, np.minimum(deck_len, missing))
+            self.reshuffles[g] += np.maximum(missing - np.maximum(deck_len, 1), 0)
+
+    def take(self, g: np.ndarray, seats: np.ndarray, counts: np.ndarray) -> None:
+        # Moves the top counts[i] cards of game g[i]'s deck to seat seats[i]; every game appears once in g.
+        drawing = counts > 0
+        g, seats, counts = g[drawing], seats[drawing], counts[drawing]
+        if g.size == 0:
+            return
+        deck_len = self.deck_len[g]
+        width = int(counts.max())
+        if width == 1:
+            self.hands[g, seats, self.deck[g, deck_len - 1]] += 1
+        else:
+            taken = np.arange(width) < counts[:, None]
+            positions = np.where(taken, deck_len[:, None] - 1 - np.arange(width), 0)
+            cards = self.deck[g[:, None], positions][taken]
+            # A seat can draw several cards of one type, so the counts are added unbuffered.
+            np.add.at(self.hands, (np.repeat(g, counts), np.repeat(seats, counts), cards), 1)
+        self.deck_len[g] -= counts
+        self.hand_size[g, seats] += counts
+
+    def reshuffle(self, games: np.ndarray) -> None:
+        # Every pile is laid out in card type order and shuffled by sorting random keys, which the
+        # positions past a pile's end never win, so all the games reshuffle in one pass.
+        counts = self.discard_counts[games]
+        sizes = counts.sum(axis=1)
+        width = int(sizes.max(initial=0))
+        if width:
+            positions = np.arange(width)
+            ends = counts.cumsum(axis=1)
+            types = (ends[:, None, :] <= positions[:, None]).sum(axis=2).astype(np.int8)
+            keys = np.where(positions < sizes[:, None], self.rng.random((games.size, width)), 2.0)
+            self.deck[games, :width] = np.take_along_axis(types, keys.argsort(axis=1), axis=1)
+        self.deck_len[games] = sizes
+        self.discard_counts[games] = 0
+        self.reshuffles[games] += 1
+
+    def get_stats(self) -> SimulationStats:
+        stats = SimulationStats(self.players)
+        finished = self.winner >= 0
+
+        stats.games = self.games
+        stats.finished = int(finished.sum())
+        stats.wins_by_seat = np.bincount(self.winner[finished], minlength=self.players).tolist()
+        stats.wins_by_policy = Counter({"random": stats.finished})
+        stats.total_turns = int(self.turns.sum())
+        stats.min_turns = int(self.turns.min()) if self.games else None
+        stats.max_turns = int(self.turns.max()) if self.games else 0
+        buckets, counts = np.unique(self.turns // 10 * 10, return_counts=True)
+        stats.length_histogram = Counter(dict(zip(buckets.tolist(), counts.tolist())))
+        stats.reshuffles = int(self.reshuffles.sum())
+        stats.games_with_reshuffle = int((self.reshuffles > 0).sum())
+        return stats
@@ -0,0 +1,148 @@
+import os
+import random
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from application.game_logic import GameLogic
+from application.types import GameCheat
+from simulation.policies import Policy, apply_move, get_policy
+
+
+class SimulationConfig:
+    def __init__(self, players: int = 4, policies: Optional[List[str]] = None, max_turns: int = 2000,
+                 cheat: Optional[str] = None, cheat_seat: int = 0):
+        if players < 1:
+            raise ValueError("At least one player is needed")
+
+        self.players = players
+        # Policy names are assigned to players in join order, repeating the list when it is shorter.
+        self.policies = policies or ["random"]
+        self.max_turns = max_turns
+        self.cheat = GameCheat(cheat) if cheat else None
+        self.cheat_seat = cheat_seat
+
+
+class SimulationStats:
+    def __init__(self, players: int):
+        self.games = 0
+        self.finished = 0
+        self.wins_by_seat = [0] * players
+        self.wins_by_policy: Counter = Counter()
+        self.total_turns = 0
+        self.min_turns: Optional[int] = None
+        self.max_turns = 0
+        self.length_histogram: Counter = Counter()
+        self.reshuffles = 0
+        self.games_with_reshuffle = 0
+
+    def record(self, winner_seat: Optional[int], winner_policy: Optional[str], turns: int, reshuffles: int) -> None:
+        self.games += 1
+        self.total_turns += turns
+        self.min_turns = turns if self.min_turns is None else min(self.min_turns, turns)
+        self.max_turns = max(self.max_turns, turns)
+        self.length_histogram[turns // 10 * 10] += 1
+        self.reshuffles += reshuffles
+        if reshuffles:
+            self.games_with_reshuffle += 1
+
+        if winner_seat is not None:
+            self.finished += 1
+            self.wins_by_seat[winner_seat] += 1
+            self.wins_by_policy[winner_policy] += 1
+
+    def merge(self, other: "SimulationStats") -> None:
+        self.games += other.games
+        self.finished += other.finished
+        self.wins_by_seat = [a + b for a, b in zip(self.wins_by_seat, other.wins_by_seat)]
+        self.wins_by_policy.update(other.wins_by_policy)
+        self.total_turns += other.total_turns
+        if other.min_turns is not None:
+            self.min_turns = other.min_turns if self.min_turns is None else min(self.min_turns, other.min_turns)
+        self.max_turns = max(self.max_turns, other.max_turns)
+        self.length_histogram.update(other.length_histogram)
+        self.reshuffles += other.reshuffles
+        self.games_with_reshuffle += other.games_with_reshuffle
+
+    def get_summary(self) -> Dict:
+        games = self.games or 1
+        finished = self.finished or 1
+        return {
+            "games": self.games,
+            "unfinished": self.games - self.finished,
+            "win_rate_by_seat": [wins / finished for wins in self.wins_by_seat],
+            "win_rate_by_policy": {name: wins / finished for name, wins in self.wins_by_policy.items()},
+            "average_turns": self.total_turns / games,
+            "min_turns": self.min_turns,
+            "max_turns": self.max_turns,
+            "reshuffles_per_game": self.reshuffles / games,
+            "games_with_reshuffle": self.games_with_reshuffle / games,
+        }
+
+
+def play_turn(game_logic: GameLogic, policy: Policy, rng: random.Random) -> str:
+    """Plays one move for the current player and returns the id of the player who moved."""
+    player_id = game_logic.get_current_player().id
+    card, color = policy.choose_move(game_logic, player_id, rng)
+    apply_move(game_logic, player_id, card, color)
+    return player_id
+
+
+def play_game(config: SimulationConfig, rng: random.Random) -> Tuple[Optional[int], Optional[str], int, int]:
+    """Plays one game to the end and returns (winner seat, winner policy, turns, reshuffles)."""
+    player_ids = [str(index) for index in range(config.players)]
+    policies = {player_id: get_policy(config.policies[index % len(config.policies)])
+                for index, player_id in enumerate(player_ids)}
+
+    game_logic = GameLogic()
+    game_logic.start_game(player_ids, seed=rng.getrandbits(64))
+
+    if config.cheat is not None:
+        cheater = game_logic.get_players()[config.cheat_seat]
+        game_logic.activate_cheat_code(cheater.id, config.cheat)
+
+    for turn in range(1, config.max_turns + 1):
+        player_id = game_logic.get_current_player().id
+        play_turn(game_logic, policies[player_id], rng)
+
+        if game_logic.is_winner(player_id):
+            seat = game_logic.player_seats[player_id]
+            return seat, policies[player_id].name, turn, game_logic.reshuffle_count
+
+    return None, None, config.max_turns, game_logic.reshuffle_count
+
+
+def run_batch(config: SimulationConfig, seed: int, games: int) -> SimulationStats:
+    # Every game is seeded from the batch's RNG, so a batch is reproducible from its seed alone.
+    rng = random.Random(seed)
+
+    stats = SimulationStats(config.players)
+    for _ in range(games):
+        stats.record(*play_game(config, rng))
+    return stats
+
+
+def run_simulation(config: SimulationConfig, games: int, seed: int = 0, workers: Optional[int] = None,
+                   batch_size: int = 1000) -> Iterator[SimulationStats]:
+    """Plays games across a process pool and yields the running totals after every finished batch.
+
+    Batch n is always seeded with seed + n, so a run is reproducible no matter how many workers it uses.
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = [(seed + index, min(batch_size, games - start)) for index, start in enumerate(range(0, games, batch_size))]
+    total = SimulationStats(config.players)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        next_batch = 0
+        while next_batch < len(batches) or pending:
+            # Keep a couple of batches per worker in flight instead of queueing millions of futures up front.
+            while next_batch < len(batches) and len(pending) < workers * 2:
+                batch_seed, batch_games = batches[next_batch]
+                pending.add(executor.submit(run_batch, config, batch_seed, batch_games))
+                next_batch += 1
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                total.merge(future.result())
+            yield total
@@ -0,0 +1,241 @@
+import random
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from application.game_logic import GameLogic
+from application.snapshot import decode_game
+from common.types import Card, GameState, Player
+
+CARD_COLORS = ["Red", "Green", "Blue", "Yellow"]
+
+# (card to play, color for a wild card); (None, None) draws a card instead.
+Move = Tuple[Optional[Card], Optional[str]]
+
+
+def apply_move(game_logic: GameLogic, player_id: str, card: Optional[Card], color: Optional[str]) -> None:
+    if card is None:
+        game_logic.draw_card(player_id)
+        return
+
+    if game_logic.get_hand_size(player_id) == 2:
+        game_logic.say_uno(player_id)
+
+    result = game_logic.play_card(player_id, card.id)
+    if not result:
+        raise ValueError(result.error)
+
+    if color is not None:
+        game_logic.change_wild_card_color(card.id, color)
+
+
+class Policy:
+    """Decides the move of one seat. Policies must be picklable so they can be sent to worker processes."""
+
+    name = "base"
+
+    def choose_card(self, game_logic: GameLogic, player_id: str, playable: List[Card],
+                    rng: random.Random) -> Optional[Card]:
+        raise NotImplementedError
+
+    def choose_move(self, game_logic: GameLogic, player_id: str, rng: random.Random) -> Move:
+        card = self.choose_card(game_logic, player_id, game_logic.get_playable_cards(player_id), rng)
+        if card is None:
+            return None, None
+        if card.color != "Wild":
+            return card, None
+        return card, self.choose_color(game_logic.get_player_cards(player_id), rng)
+
+    def choose_color(self, hand: List[Card], rng: random.Random) -> str:
+        counts = Counter(card.color for card in hand if card.color != "Wild")
+        if not counts:
+            return rng.choice(CARD_COLORS)
+        return counts.most_common(1)[0][0]
+
+
+class RandomPolicy(Policy):
+    name = "random"
+
+    def choose_card(self, game_logic: GameLogic, player_id: str, playable: List[Card],
+                    rng: random.Random) -> Optional[Card]:
+        if not playable:
+            return None
+        return rng.choice(playable)
+
+
+class FirstPlayablePolicy(Policy):
+    name = "first"
+
+    def choose_card(self, game_logic: GameLogic, player_id: str, playable: List[Card],
+                    rng: random.Random) -> Optional[Card]:
+        if not playable:
+            return None
+        return playable[0]
+
+
+class AggressivePolicy(Policy):
+    """Plays attacking cards first and keeps wild cards for last."""
+
+    name = "aggressive"
+    face_priority = {"Wild Draw Eight": 0, "Draw Two": 1, "Skip": 2, "Reverse": 3, "Wild Draw Four": 5, "Wild": 6}
+
+    def choose_card(self, game_logic: GameLogic, player_id: str, playable: List[Card],
+                    rng: random.Random) -> Optional[Card]:
+        if not playable:
+            return None
+        return min(playable, key=lambda card: self.face_priority.get(card.face, 4))
+
+
+def determinize(game_logic: GameLogic, player_id: str, rng: random.Random) -> GameLogic:
+    """Copies the game as player_id sees it: their hand and the discard pile are kept, while the other hands
+    and the deck are dealt again at random from the cards that player cannot see."""
+    state = game_logic.game_state
+    hidden = [card.copy() for card in state.deck]
+    for player in state.players:
+        if player.id != player_id:
+            hidden.extend(card.copy() for card in player.hand)
+    rng.shuffle(hidden)
+
+    players = []
+    dealt = 0
+    for player in state.players:
+        if player.id == player_id:
+            hand = [card.copy() for card in player.hand]
+        else:
+            hand = hidden[dealt:dealt + len(player.hand)]
+            dealt += len(hand)
+        players.append(Player(player.id, hand, player.has_played_card, player.has_said_uno))
+
+    sample = GameLogic()
+    sample.game_state = GameState(state.current_player_index, hidden[dealt:],
+                                  [card.copy() for card in state.discard], state.is_reversed, players)
+    sample.index_players()
+    sample.seed_rng(rng.getrandbits(64))
+    return sample
+
+
+class MonteCarloPolicy(Policy):
+    """Flat Monte-Carlo search over the legal moves.
+
+    Every round deals the hidden cards again (see determinize) and plays each candidate move
+    on that same deal with the same playout seed, so moves are compared on identical luck
+    and a few rounds already separate them. After the candidate move every seat continues
+    with rollout_policy; a playout cut off after max_rollout_turns scores by how close the
+    player is to emptying their hand. The search stops after max_iterations playouts or
+    time_budget seconds, whichever comes first, and plays the move with the best average.
+    """
+
+    name = "mcts"
+
+    def __init__(self, max_iterations: int = 200, time_budget: Optional[float] = None,
+                 rollout_policy: str = "aggressive", max_rollout_turns: int = 150):
+        self.max_iterations = max_iterations
+        self.time_budget = time_budget
+        self.rollout_policy = rollout_policy
+        self.max_rollout_turns = max_rollout_turns
+
+    def choose_card(self, game_logic: GameLogic, player_id: str, playable: List[Card],
+                    rng: random.Random) -> Optional[Card]:
+        return self.choose_move(game_logic, player_id, rng)[0]
+
+    @staticmethod
+    def get_moves(game_logic: GameLogic, player_id: str) -> List[Tuple[Optional[int], Optional[str]]]:
+        # Copies of a card are the same move, so only one card id per color and face is searched. Drawing is
+        # only searched when nothing can be played; with a playable card it is almost never the better move.
+        moves: List[Tuple[Optional[int], Optional[str]]] = []
+        seen = set()
+        for card in game_logic.get_playable_cards(player_id):
+            if (card.color, card.face) in seen:
+                continue
+            seen.add((card.color, card.face))
+            if card.color == "Wild":
+                moves.extend((card.id, color) for color in CARD_COLORS)
+            else:
+                moves.append((card.id, None))
+        return moves or [(None, None)]
+
+    def choose_move(self, game_logic: GameLogic, player_id: str, rng: random.Random) -> Move:
+        return self.search(game_logic, player_id, rng)[0]
+
+    def search(self, game_logic: GameLogic, player_id: str, rng: random.Random) -> Tuple[Move, int]:
+        """Returns the chosen move and how many playouts it took.
+
+        The count is returned rather than kept on the policy, since one instance serves every lobby.
+        """
+        moves = self.get_moves(game_logic, player_id)
+        if len(moves) == 1:
+            return self.resolve(game_logic, player_id, moves[0]), 0
+
+        rewards = [0.0] * len(moves)
+        rounds = 0
+        iterations = 0
+        deadline = time.perf_counter() + self.time_budget if self.time_budget is not None else None
+        # At least one full round, so every move has a score.
+        while rounds == 0 or iterations + len(moves) <= self.max_iterations:
+            if deadline is not None and rounds > 0 and time.perf_counter() >= deadline:
+                break
+
+            seed = rng.getrandbits(64)
+            for index, move in enumerate(moves):
+                rewards[index] += self.playout(game_logic, player_id, move, random.Random(seed))
+            rounds += 1
+            iterations += len(moves)
+
+        best = moves[max(range(len(moves)), key=lambda i: rewards[i])]
+        return self.resolve(game_logic, player_id, best), iterations
+
+    @staticmethod
+    def resolve(game_logic: GameLogic, player_id: str, move: Tuple[Optional[int], Optional[str]]) -> Move:
+        card_id, color = move
+        if card_id is None:
+            return None, None
+        return game_logic.get_player_card(player_id, card_id), color
+
+    def playout(self, game_logic: GameLogic, player_id: str, move: Tuple[Optional[int], Optional[str]],
+                rng: random.Random) -> float:
+        sample = determinize(game_logic, player_id, rng)
+        card_id, color = move
+        apply_move(sample, player_id, sample.get_player_card(player_id, card_id) if card_id is not None else None,
+                   color)
+        if sample.is_winner(player_id):
+            return 1.0
+
+        policy = get_policy(self.rollout_policy)
+        for _ in range(self.max_rollout_turns):
+            mover = sample.get_current_player().id
+            apply_move(sample, mover, *policy.choose_move(sample, mover, rng))
+            if sample.is_winner(mover):
+                return 1.0 if mover == player_id else 0.0
+
+        own = sample.get_hand_size(player_id)
+        others = min(len(player.hand) for player in sample.game_state.players if player.id != player_id)
+        return others / (own + others)
+
+
+def search_move(snapshot: bytes, player_id: str, max_iterations: int, time_budget: Optional[float],
+                seed: int) -> Tuple[Optional[int], Optional[str], int]:
+    """Runs MonteCarloPolicy on an application.snapshot game snapshot, for use in a worker process.
+
+    Returns (card id or None to draw, wild color, playouts run).
+    """
+    game_logic, _ = decode_game(snapshot)
+    policy = MonteCarloPolicy(max_iterations=max_iterations, time_budget=time_budget)
+    (card, color), iterations = policy.search(game_logic, player_id, random.Random(seed))
+    return (card.id if card is not None else None), color, iterations
+
+
+POLICIES: Dict[str, Policy] = {
+    policy.name: policy for policy in (RandomPolicy(), FirstPlayablePolicy(), AggressivePolicy(), MonteCarloPolicy())
+}
+
+
+def get_policy(name: str) -> Policy:
+    """Looks up a policy by name; "mcts:N" is the Monte-Carlo policy with N playouts per move."""
+    name, _, argument = name.partition(":")
+    if name not in POLICIES:
+        raise ValueError(f"Unknown policy: {name}")
+    if not argument:
+        return POLICIES[name]
+    if name != MonteCarloPolicy.name or not argument.isdigit() or int(argument) < 1:
+        raise ValueError(f"Invalid policy: {name}:{argument}")
+    return MonteCarloPolicy(max_iterations=int(argument))
@@ -0,0 +1,49 @@
+import argparse
+import json
+import time
+from collections import Counter
+
+from application.event_log import replay_games
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay every game in an event log and print aggregated statistics.")
+    parser.add_argument("log", help="Event log written by the bot (EVENT_LOG_PATH)")
+    parser.add_argument("--progress", type=int, default=100000, help="Print progress every N games")
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    games = 0
+    finished = 0
+    reshuffles = 0
+    wins_by_seat: Counter = Counter()
+    players: Counter = Counter()
+
+    with open(args.log, "rb") as file:
+        for _, game_logic in replay_games(file):
+            games += 1
+            reshuffles += game_logic.reshuffle_count
+            seats = game_logic.game_state.players
+            players[len(seats)] += 1
+            for seat, player in enumerate(seats):
+                if not player.hand:
+                    finished += 1
+                    wins_by_seat[seat] += 1
+                    break
+
+            if games % args.progress == 0:
+                print(f"{games} games, {games / (time.perf_counter() - started_at):.0f} games/s", flush=True)
+
+    elapsed = time.perf_counter() - started_at
+    print(json.dumps({
+        "games": games,
+        "finished": finished,
+        "games_per_second": games / elapsed if elapsed else 0.0,
+        "players": dict(sorted(players.items())),
+        "wins_by_seat": dict(sorted(wins_by_seat.items())),
+        "reshuffles_per_game": reshuffles / games if games else 0.0,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import json
+import time
+from typing import Iterator
+
+from simulation.engine import SimulationConfig, SimulationStats, run_simulation
+from simulation.policies import POLICIES, get_policy
+
+
+def run_batched(config: SimulationConfig, games: int, seed: int, batch_size: int) -> Iterator[SimulationStats]:
+    # Imported here so the scalar engine keeps working without NumPy installed.
+    from simulation.batched import BatchedSimulator
+
+    total = SimulationStats(config.players)
+    for index, start in enumerate(range(0, games, batch_size)):
+        simulator = BatchedSimulator(min(batch_size, games - start), config.players, max_turns=config.max_turns,
+                                     cheat=config.cheat, cheat_seat=config.cheat_seat, seed=seed + index)
+        total.merge(simulator.run())
+        yield total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play UNO games without Discord and print aggregated statistics.")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--policy", action="append",
+                        help=f"Policy per player, repeat for several players (default: random). One of "
+                             f"{', '.join(sorted(POLICIES))}; mcts:N plays N playouts per move")
+    parser.add_argument("--cheat", choices=["gw4", "gw8"], help="Cheat code given to --cheat-seat at the start")
+    parser.add_argument("--cheat-seat", type=int, default=0)
+    parser.add_argument("--max-turns", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--engine", choices=["scalar", "batched"], default="scalar",
+                        help="batched plays the random policy in NumPy lock-step on a single core")
+    args = parser.parse_args()
+
+    for policy in args.policy or ():
+        try:
+            get_policy(policy)
+        except ValueError as exception:
+            parser.error(str(exception))
+
+    if args.engine == "batched" and args.policy not in (None, ["random"]):
+        parser.error("The batched engine only plays the random policy")
+
+    config = SimulationConfig(players=args.players, policies=args.policy, max_turns=args.max_turns,
+                              cheat=args.cheat, cheat_seat=args.cheat_seat)
+
+    started_at = time.perf_counter()
+    stats = None
+    if args.engine == "batched":
+        results = run_batched(config, args.games, args.seed, args.batch_size)
+    else:
+        results = run_simulation(config, args.games, seed=args.seed, workers=args.workers,
+                                 batch_size=args.batch_size)
+
+    for stats in results:
+        elapsed = time.perf_counter() - started_at
+        print(f"{stats.games}/{args.games} games, {stats.games / elapsed:.0f} games/s", flush=True)
+
+    if stats is not None:
+        print(json.dumps(stats.get_summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from application.game_logic import GameLogic
+from commands.ai_players import AiPlayers
+from simulation.policies import MonteCarloPolicy, get_policy
+
+
+def test_mcts_suffix_sets_the_playout_budget():
+    ai_players = AiPlayers(max_playouts=2000)
+    ai_players.configure(policy="mcts:300")
+    assert ai_players.max_playouts == 300
+
+    ai_players.configure(policy="mcts:300", max_playouts=300)
+    assert ai_players.max_playouts == 300
+    with pytest.raises(ValueError):
+        ai_players.configure(policy="mcts:300", max_playouts=500)
+
+    ai_players.configure(policy="mcts", max_playouts=500)
+    assert ai_players.max_playouts == 500
+
+
+@pytest.mark.parametrize("name", ["mcts:0", "mcts:-5", "mcts:x", "random:5", "unknown"])
+def test_invalid_policies_are_rejected(name):
+    with pytest.raises(ValueError):
+        get_policy(name)
+    with pytest.raises(ValueError):
+        AiPlayers().configure(policy=name)
+
+
+def test_mcts_moves_are_searched_in_the_pool():
+    ai_players = AiPlayers(move_budget=None, workers=1)
+    ai_players.configure(policy="mcts:20")
+    game_logic = GameLogic()
+    game_logic.start_game(["1", "2"], seed=0)
+    player_id = game_logic.get_current_player().id
+
+    try:
+        card_id, color = asyncio.run(ai_players.choose_move(game_logic, player_id))
+    finally:
+        ai_players.close()
+
+    moves = MonteCarloPolicy.get_moves(game_logic, player_id)
+    assert (card_id, color) in moves
+    # Playouts run in whole rounds of one per move, and at least one round.
+    assert len(moves) <= ai_players.playouts <= max(20, len(moves))
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simulation.batched import STANDARD_DECK, TYPE_COUNT, WILD_DRAW_EIGHT, BatchedSimulator  # noqa: E402
+
+
+def card_totals(simulator: BatchedSimulator) -> np.ndarray:
+    deck = np.zeros((simulator.games, TYPE_COUNT), dtype=np.int64)
+    for game in range(simulator.games):
+        deck[game] = np.bincount(simulator.deck[game, :simulator.deck_len[game]], minlength=TYPE_COUNT)
+    top = np.zeros_like(deck)
+    played = simulator.top_type >= 0
+    top[np.flatnonzero(played), simulator.top_type[played]] = 1
+    return deck + simulator.hands.sum(axis=1) + simulator.discard_counts + top
+
+
+def test_every_card_stays_in_the_game():
+    simulator = BatchedSimulator(300, players=5, cheat="gw8", seed=1)
+    expected = np.bincount(STANDARD_DECK, minlength=TYPE_COUNT)
+    expected[WILD_DRAW_EIGHT] += 1
+
+    while simulator.step():
+        assert (card_totals(simulator) == expected).all()
+        assert (simulator.hands.sum(axis=2) == simulator.hand_size).all()
+    assert simulator.reshuffles.sum() > 0
+
+
+def test_draw_reshuffles_when_the_deck_runs_out():
+    simulator = BatchedSimulator(3, players=2, seed=2)
+    games, seats = np.arange(3), np.zeros(3, dtype=np.int16)
+    simulator.deck_len[:] = [10, 1, 0]
+    simulator.discard_counts[:] = 0
+    simulator.discard_counts[1, :6] = 1
+    simulator.discard_counts[2, :2] = 1
+    before = simulator.hand_size[:, 0].copy()
+
+    simulator.draw(games, seats, 4)
+
+    assert (simulator.hand_size[:, 0] - before).tolist() == [4, 4, 2]
+    assert simulator.deck_len.tolist() == [6, 3, 0]
+    # Like GameLogic, the empty deck is reshuffled again for each card the last reshuffle could not provide.
+    assert simulator.reshuffles.tolist() == [0, 1, 3]
+    assert simulator.discard_counts[1:].sum() == 0
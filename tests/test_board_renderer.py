@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+
+from benchmarks.fakes import FakeInteraction, FakeMessage, FakeUser  # noqa: E402
+from commands.board_renderer import BoardRenderer  # noqa: E402
+from commands.game_registry import GameRegistry  # noqa: E402
+
+
+class FlakyMessage(FakeMessage):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    async def edit(self, **kwargs):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("connection reset")
+        await super().edit(**kwargs)
+
+
+class Board:
+    def __init__(self, message: FakeMessage):
+        self.key = (1, 1)
+        self.message = message
+        self.version = 0
+        self.attached_image_url = "attachment://card.png"
+
+    def get_board_payload(self):
+        return {"content": f"state {self.version}"}
+
+
+def test_failed_edit_is_retried_with_the_latest_state():
+    async def run():
+        board = Board(FlakyMessage(failures=2))
+        renderer = BoardRenderer(board, min_interval=0.01)
+
+        renderer.mark_dirty(view="buttons")
+        board.version = 1
+        await renderer.task
+
+        assert board.message.state == {"content": "state 1", "view": "buttons"}
+        assert board.attached_image_url is None
+        assert renderer.edits_sent == 1
+        assert renderer.failures == 0
+        assert renderer.sent_version == renderer.dirty_version
+
+    asyncio.run(run())
+
+
+def test_join_is_rejected_once_the_game_started():
+    async def run():
+        game_ui = GameRegistry().get_or_create(1, 1)
+        game_ui.initiator = FakeUser(1)
+        game_ui.players = [game_ui.initiator, FakeUser(2)]
+        game_ui.message = FakeMessage()
+        game_ui.game_logic.start_game(["1", "2"], seed=0)
+
+        interaction = FakeInteraction(FakeUser(3), custom_id="join-btn")
+        await game_ui.handle_join_button(interaction)
+
+        assert [player.id for player in game_ui.players] == [1, 2]
+        assert interaction.original_response.state["content"] == "No more players can join this lobby."
+        game_ui.board.cancel()
+
+    asyncio.run(run())
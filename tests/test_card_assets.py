@@ -0,0 +1,179 @@
+import asyncio
+import itertools
+
+import pytest
+
+discord = pytest.importorskip("discord")
+
+from commands.card_assets import CardImageUrlCache, DiscordChannelUploader, card_images  # noqa: E402
+from common.types import Card  # noqa: E402
+
+BOT_ID = 7
+message_ids = itertools.count(1)
+
+
+class Attachment:
+    def __init__(self, filename: str, fetches: int = 0):
+        self.filename = filename
+        self.url = f"https://cdn.example.invalid/{filename}?signed={fetches}"
+
+
+class Author:
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+
+class Message:
+    def __init__(self, channel: "AssetChannel", filenames, author_id: int = BOT_ID):
+        self.id = next(message_ids)
+        self.channel = channel
+        self.author = Author(author_id)
+        self.filenames = list(filenames)
+        self.attachments = [Attachment(filename) for filename in self.filenames]
+
+    async def delete(self):
+        self.channel.messages.remove(self)
+        self.channel.deleted.append(self.id)
+
+
+class History:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def flatten(self):
+        return self.messages
+
+
+class AssetChannel:
+    def __init__(self):
+        self.messages = []
+        self.sent = 0
+        self.fetched = 0
+        self.deleted = []
+
+    def post(self, *filenames, author_id: int = BOT_ID) -> Message:
+        message = Message(self, filenames, author_id)
+        self.messages.append(message)
+        return message
+
+    def history(self, limit: int):
+        return History(list(reversed(self.messages))[:limit])
+
+    async def send(self, file):
+        self.sent += 1
+        return self.post(file.filename)
+
+    async def fetch_message(self, message_id: int):
+        self.fetched += 1
+        for message in self.messages:
+            if message.id == message_id:
+                fetched = Message(self, message.filenames)
+                fetched.id = message.id
+                fetched.attachments = [Attachment(filename, self.fetched) for filename in message.filenames]
+                return fetched
+        raise discord.NotFound(FakeResponse(), "Unknown Message")
+
+    def get_partial_message(self, message_id: int):
+        return PartialMessage(self, message_id)
+
+
+class PartialMessage:
+    def __init__(self, channel: AssetChannel, message_id: int):
+        self.channel = channel
+        self.id = message_id
+
+    async def delete(self):
+        for message in self.channel.messages:
+            if message.id == self.id:
+                await message.delete()
+                return
+        raise discord.NotFound(FakeResponse(), "Unknown Message")
+
+
+class FakeResponse:
+    status = 404
+    reason = "Not Found"
+
+
+class File:
+    def __init__(self, filename: str):
+        self.filename = filename
+
+
+def test_existing_asset_messages_are_reused():
+    async def run():
+        channel = AssetChannel()
+        older = channel.post("card-red-1.png")
+        channel.post("card-red-1.png", author_id=99)
+        newer = channel.post("card-red-1.png")
+        channel.post("card-red-2.png", "card-red-3.png")
+        uploader = DiscordChannelUploader(channel, BOT_ID)
+
+        url = await uploader.upload(File("card-red-1.png"))
+
+        assert url == newer.attachments[0].url
+        assert (channel.sent, channel.fetched) == (0, 0)
+        assert channel.deleted == [older.id]
+
+        # Once its URL expired the message is fetched again rather than posted anew.
+        assert await uploader.upload(File("card-red-1.png")) == "https://cdn.example.invalid/card-red-1.png?signed=1"
+        assert (channel.sent, channel.fetched) == (0, 1)
+
+    asyncio.run(run())
+
+
+def test_missing_images_are_uploaded_once():
+    async def run():
+        channel = AssetChannel()
+        uploader = DiscordChannelUploader(channel, BOT_ID)
+
+        first = await uploader.upload(File("card-red-1.png"))
+        await uploader.upload(File("card-red-1.png"))
+
+        assert first == "https://cdn.example.invalid/card-red-1.png?signed=0"
+        assert (channel.sent, channel.fetched) == (1, 1)
+
+        # Someone deleted the asset message: the image is posted again.
+        channel.messages.clear()
+        await uploader.upload(File("card-red-1.png"))
+        assert channel.sent == 2
+        assert [message.filenames for message in channel.messages] == [["card-red-1.png"]]
+
+    asyncio.run(run())
+
+
+def test_upload_without_attachment_leaves_the_card_cold():
+    class EmptyChannel(AssetChannel):
+        async def send(self, file):
+            self.sent += 1
+            return self.post()
+
+    async def run():
+        card_images.load()
+        urls = CardImageUrlCache(card_images)
+        urls.set_uploader(DiscordChannelUploader(EmptyChannel(), BOT_ID))
+
+        assert urls.get_url(Card("Red", "1", 0)) is None
+        await asyncio.gather(*urls.background_tasks)
+
+        assert urls.urls == {} and urls.pending == set() and urls.uploads == 0
+
+    asyncio.run(run())
+
+
+def test_warm_up_task_is_kept_until_it_finishes():
+    from benchmarks.fakes import FakeUploader
+
+    async def run():
+        card_images.load()
+        urls = CardImageUrlCache(card_images)
+        urls.set_uploader(FakeUploader())
+
+        task = urls.start_warm_up()
+        assert task in urls.background_tasks
+        await task
+
+        assert len(urls.urls) == len(card_images.filenames)
+        assert task not in urls.background_tasks
+
+    asyncio.run(run())
@@ -0,0 +1,90 @@
+import copy
+import random
+
+from application.event_log import EventLogWriter, replay_games
+from application.game_logic import GameLogic
+from application.snapshot import decode_game, encode_game
+from application.types import GameCheat
+
+COLORS = ["Red", "Green", "Blue", "Yellow"]
+
+
+def play_turn(game_logic: GameLogic, rng: random.Random) -> str:
+    player_id = game_logic.get_current_player().id
+    playable = game_logic.get_playable_cards(player_id)
+    if not playable:
+        game_logic.draw_card(player_id)
+        return player_id
+
+    card = rng.choice(playable)
+    if game_logic.get_hand_size(player_id) == 2 and rng.random() < 0.8:
+        game_logic.say_uno(player_id)
+    assert game_logic.play_card(player_id, card.id)
+    if card.color == "Wild":
+        assert game_logic.change_wild_card_color(card.id, rng.choice(COLORS))
+    return player_id
+
+
+def test_replay_rebuilds_interleaved_games(tmp_path):
+    path = tmp_path / "events.log"
+    writer = EventLogWriter(str(path))
+    rng = random.Random(7)
+
+    games = [GameLogic(writer) for _ in range(30)]
+    for index, game_logic in enumerate(games):
+        game_logic.start_game([str(seat) for seat in range(2 + index % 4)], seed=index)
+        if index % 3 == 0:
+            game_logic.activate_cheat_code(game_logic.get_players()[0].id, GameCheat.GIVE_WILD_FOUR)
+        if index % 5 == 0:
+            game_logic.activate_cheat_code(game_logic.get_players()[-1].id, GameCheat.GIVE_WILD_EIGHT)
+
+    expected = {}
+    running = list(games)
+    while running:
+        game_logic = rng.choice(running)
+        player_id = play_turn(game_logic, rng)
+        if game_logic.is_winner(player_id) or len(game_logic.game_state.discard) > 2000:
+            expected[game_logic.game_id] = copy.deepcopy(game_logic.game_state)
+            game_logic.reset()
+            running.remove(game_logic)
+    writer.close()
+
+    with open(path, "rb") as file:
+        replayed = dict(replay_games(file))
+
+    assert replayed.keys() == expected.keys()
+    for game_id, game_logic in replayed.items():
+        assert game_logic.game_state == expected[game_id]
+
+
+def test_replay_continues_a_restored_game(tmp_path):
+    path = tmp_path / "events.log"
+    writer = EventLogWriter(str(path))
+    rng = random.Random(3)
+
+    game_logic = GameLogic(writer)
+    game_logic.start_game(["a", "b", "c"], seed=42)
+    for _ in range(15):
+        play_turn(game_logic, rng)
+    interrupted_id = game_logic.game_id
+    interrupted_state = copy.deepcopy(game_logic.game_state)
+
+    # The bot restarts: the game comes back from its snapshot and is logged under a new id.
+    restored, _ = decode_game(encode_game(game_logic))
+    writer.resume(restored)
+    assert restored.game_id != interrupted_id
+    while not any(restored.is_winner(player.id) for player in restored.game_state.players):
+        play_turn(restored, rng)
+        if len(restored.game_state.discard) > 2000:
+            break
+    restored_id = restored.game_id
+    restored_state = copy.deepcopy(restored.game_state)
+    restored.reset()
+    writer.close()
+
+    with open(path, "rb") as file:
+        replayed = dict(replay_games(file))
+
+    assert replayed[restored_id].game_state == restored_state
+    # The interrupted game never logged an END, so it is yielded as it was when the log ran out.
+    assert replayed[interrupted_id].game_state == interrupted_state
@@ -0,0 +1,112 @@
+from application.game_logic import GameLogic
+
+
+def new_game(players: int = 3, seed: int = 0) -> GameLogic:
+    game_logic = GameLogic()
+    game_logic.start_game([str(index) for index in range(players)], seed=seed)
+    return game_logic
+
+
+def assert_positions_match(game_logic: GameLogic) -> None:
+    for player in game_logic.game_state.players:
+        assert game_logic.card_positions[player.id] == {card.id: position for position, card in enumerate(player.hand)}
+
+
+def test_remove_from_hand_keeps_order_and_renumbers():
+    game_logic = new_game()
+    player = game_logic.game_state.players[0]
+    hand_ids = [card.id for card in player.hand]
+
+    for position in (3, 0, -1):
+        card_id = hand_ids.pop(position)
+        removed = game_logic.remove_from_hand(player, card_id)
+
+        assert removed.id == card_id
+        assert [card.id for card in player.hand] == hand_ids
+        assert game_logic.get_player_card(player.id, card_id) is None
+        assert_positions_match(game_logic)
+
+
+def test_remove_from_hand_after_draws():
+    game_logic = new_game()
+    player = game_logic.game_state.players[1]
+    game_logic.draw_cards(player, 5)
+    hand_ids = [card.id for card in player.hand]
+
+    game_logic.remove_from_hand(player, hand_ids[2])
+
+    assert [card.id for card in player.hand] == hand_ids[:2] + hand_ids[3:]
+    assert_positions_match(game_logic)
+    for card in player.hand:
+        assert game_logic.get_player_card(player.id, card.id) is card
+
+
+def expected_playable(game_logic: GameLogic, player_id: str) -> list:
+    return [card.id for card in game_logic.get_player_cards(player_id) if game_logic.can_play_card(card, player_id)]
+
+
+def assert_playable_fresh(game_logic: GameLogic) -> None:
+    for player in game_logic.game_state.players:
+        playable = game_logic.get_playable_cards(player.id)
+        assert [card.id for card in playable] == expected_playable(game_logic, player.id)
+        assert game_logic.get_playable_card_ids(player.id) == {card.id for card in playable}
+
+
+def find_move(game_logic: GameLogic, wild: bool):
+    player_id = game_logic.get_current_player().id
+    for card in game_logic.get_playable_cards(player_id):
+        if (card.color == "Wild") == wild:
+            return player_id, card
+    return player_id, None
+
+
+def test_playable_cache_is_dropped_on_play():
+    for seed in range(20):
+        game_logic = new_game(seed=seed)
+        assert_playable_fresh(game_logic)
+        player_id, card = find_move(game_logic, wild=False)
+        if card is None:
+            continue
+        assert game_logic.play_card(player_id, card.id)
+        assert_playable_fresh(game_logic)
+
+
+def test_playable_cache_is_dropped_on_recolor():
+    for seed in range(50):
+        game_logic = new_game(seed=seed)
+        player_id, card = find_move(game_logic, wild=True)
+        if card is None:
+            continue
+        assert game_logic.play_card(player_id, card.id)
+        assert_playable_fresh(game_logic)
+        assert game_logic.change_wild_card_color(card.id, "Green")
+        assert_playable_fresh(game_logic)
+        return
+    raise AssertionError("No seed dealt a wild card")
+
+
+def test_playable_cache_is_dropped_on_draw():
+    game_logic = new_game()
+    first_player_id, card = find_move(game_logic, wild=False)
+    assert game_logic.play_card(first_player_id, card.id)
+    player_id = game_logic.get_current_player().id
+    version = game_logic.get_hand_version(player_id)
+    assert_playable_fresh(game_logic)
+
+    assert game_logic.draw_card(player_id)
+
+    assert game_logic.get_hand_version(player_id) != version
+    assert game_logic.get_hand_size(player_id) == 8
+    assert_playable_fresh(game_logic)
+
+
+def test_playable_cache_is_dropped_on_cheat_card():
+    from application.types import GameCheat
+
+    game_logic = new_game()
+    player_id = game_logic.get_current_player().id
+    assert_playable_fresh(game_logic)
+
+    assert game_logic.activate_cheat_code(player_id, GameCheat.GIVE_WILD_FOUR)
+
+    assert_playable_fresh(game_logic)
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("discord")
+
+from commands.game_registry import GameRegistry  # noqa: E402
+from commands.game_ui import CARDS_PER_PAGE, HAND_DRAW_CUSTOM_ID, HandView  # noqa: E402
+from common.types import Card  # noqa: E402
+
+
+def build_view(hand_size: int, page: int, playable_ids=None) -> HandView:
+    cards = [Card("Red", str(index % 10), index) for index in range(hand_size)]
+
+    async def build() -> HandView:
+        # Views need a running event loop.
+        return HandView(cards, playable_ids if playable_ids is not None else set(range(hand_size)), True, page)
+
+    return asyncio.run(build())
+
+
+def custom_ids(view: HandView) -> list:
+    return [item.custom_id for item in view.children]
+
+
+def test_page_count_boundaries():
+    assert CARDS_PER_PAGE == 20
+    assert [HandView.get_page_count(size) for size in (0, 1, 20, 21, 40, 41)] == [1, 1, 1, 2, 2, 3]
+
+
+def test_twenty_cards_fit_one_page():
+    view = build_view(20, 0)
+    assert custom_ids(view) == [f"card-{index}" for index in range(20)] + [HAND_DRAW_CUSTOM_ID]
+
+
+def test_twenty_one_cards_need_two_pages():
+    first = build_view(21, 0)
+    assert custom_ids(first) == [f"card-{index}" for index in range(20)] + ["page-0", "page-1", HAND_DRAW_CUSTOM_ID]
+    previous, following = first.children[20], first.children[21]
+    assert previous.disabled and not following.disabled
+
+    second = build_view(21, 1)
+    assert custom_ids(second) == ["card-20", "page-0", "page-1", HAND_DRAW_CUSTOM_ID]
+    previous, following = second.children[1], second.children[2]
+    assert not previous.disabled and following.disabled
+
+
+def test_every_page_fits_discords_component_limits():
+    for hand_size in (20, 21, 40, 41, 108):
+        for page in range(HandView.get_page_count(hand_size)):
+            view = build_view(hand_size, page)
+            assert len(view.children) <= 25
+            rows = [item.row for item in view.children]
+            assert all(rows.count(row) <= 5 for row in set(rows))
+
+
+def test_only_playable_cards_are_enabled():
+    view = build_view(21, 1, playable_ids={20})
+    assert not view.children[0].disabled
+    assert build_view(21, 0, playable_ids={20}).children[0].disabled
+
+
+def test_get_hand_view_clamps_the_page():
+    async def run():
+        game_ui = GameRegistry().get_or_create(1, 1)
+        game_ui.game_logic.start_game(["1", "2"], seed=0)
+        player = game_ui.game_logic.get_player("1")
+        game_ui.game_logic.draw_cards(player, 21 - len(player.hand))
+
+        content, view = game_ui.get_hand_view("1", 5)
+        assert content == "Your cards (page 2/2):"
+        assert game_ui.hand_pages["1"] == 1
+        assert len([item for item in view.children if item.custom_id.startswith("card-")]) == 1
+
+        game_ui.game_logic.remove_from_hand(player, player.hand[0].id)
+        content, view = game_ui.get_hand_view("1", game_ui.hand_pages["1"])
+        assert content == "Your cards:"
+        assert game_ui.hand_pages["1"] == 0
+        assert len([item for item in view.children if item.custom_id.startswith("card-")]) == 20
+
+    asyncio.run(run())
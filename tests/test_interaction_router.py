@@ -0,0 +1,83 @@
+import pytest
+
+pytest.importorskip("discord")
+
+from commands.interaction_router import InteractionRouter, Route, parse_color, parse_index, route  # noqa: E402
+
+
+class Handlers:
+    @route("join-btn")
+    async def join(self, interaction):
+        pass
+
+    @route("card-{card_id}", card_id=parse_index)
+    async def card(self, interaction, card_id):
+        pass
+
+    @route("color-{color}-{card_id}", color=parse_color, card_id=parse_index)
+    async def color(self, interaction, color, card_id):
+        pass
+
+    @route("draw-card-btn")
+    @route("draw-card-btn-dynamic")
+    async def draw(self, interaction):
+        pass
+
+
+@pytest.fixture
+def router() -> InteractionRouter:
+    return InteractionRouter(None, Handlers)
+
+
+@pytest.mark.parametrize("custom_id, handler_name, arguments", [
+    ("join-btn", "join", {}),
+    ("draw-card-btn", "draw", {}),
+    ("draw-card-btn-dynamic", "draw", {}),
+    ("card-0", "card", {"card_id": 0}),
+    ("card-10000000", "card", {"card_id": 10000000}),
+    ("color-Red-5", "color", {"color": "Red", "card_id": 5}),
+])
+def test_match(router, custom_id, handler_name, arguments):
+    matched_route, matched_arguments = router.match(custom_id)
+    assert matched_route.handler_name == handler_name
+    assert matched_arguments == arguments
+
+
+@pytest.mark.parametrize("custom_id", [
+    "", "-", "join", "join-btn-x", "unknown-5",
+    "card-", "card--5", "card-+5", "card- 5", "card-5_0", "card-5-6", "card-x", "card-٥",
+    "color-Red", "color-Red-", "color-Red--5", "color-Pink-5", "color--Red-5", "color-Red-5-6",
+])
+def test_no_match(router, custom_id):
+    assert router.match(custom_id) is None
+
+
+def test_parse_splits_only_as_often_as_there_are_names():
+    assert Route("color-{color}-{card_id}", "color", {"color": str, "card_id": str}).parse("Red-5-6") == \
+        {"color": "Red", "card_id": "5-6"}
+    with pytest.raises(ValueError):
+        Route("color-{color}-{card_id}", "color", {"color": str, "card_id": str}).parse("Red")
+
+
+def test_duplicate_routes_are_rejected():
+    class Duplicates:
+        @route("card-{card_id}", card_id=parse_index)
+        async def first(self, interaction, card_id):
+            pass
+
+        @route("card-{other}", other=parse_index)
+        async def second(self, interaction, other):
+            pass
+
+    with pytest.raises(ValueError):
+        InteractionRouter(None, Duplicates)
+
+
+def test_templates_need_a_prefix():
+    class NoPrefix:
+        @route("{card_id}", card_id=parse_index)
+        async def card(self, interaction, card_id):
+            pass
+
+    with pytest.raises(ValueError):
+        InteractionRouter(None, NoPrefix)
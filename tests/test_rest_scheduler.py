@@ -0,0 +1,101 @@
+import asyncio
+
+from commands.rest_scheduler import Priority, RestScheduler
+
+
+class Calls:
+    """Records the order calls start in; every call waits until the test releases it."""
+
+    def __init__(self):
+        self.started = []
+        self.release = None
+
+    def make(self, name: str):
+        async def call():
+            self.started.append(name)
+            await self.release.wait()
+            return name
+
+        return call
+
+
+def run_scheduled(scheduler: RestScheduler, submissions, calls: Calls):
+    async def run():
+        calls.release = asyncio.Event()
+        tasks = [asyncio.create_task(scheduler.submit(priority, route, calls.make(name)))
+                 for priority, route, name in submissions]
+        # Lets every submit queue its call and the calls that got a slot start.
+        for _ in range(3):
+            await asyncio.sleep(0)
+        started_first = list(calls.started)
+        calls.release.set()
+        results = await asyncio.gather(*tasks)
+        return started_first, results
+
+    return asyncio.run(run())
+
+
+def test_saturated_route_does_not_hold_up_other_routes():
+    scheduler = RestScheduler(max_concurrency=10, route_limits={"slow": 2, "fast": 5})
+    calls = Calls()
+    submissions = [(Priority.BOARD, "slow", f"slow-{index}") for index in range(6)] + \
+                  [(Priority.BOARD, "fast", f"fast-{index}") for index in range(3)]
+
+    started_first, results = run_scheduled(scheduler, submissions, calls)
+
+    assert started_first == ["slow-0", "slow-1", "fast-0", "fast-1", "fast-2"]
+    assert results == [name for _, _, name in submissions]
+    assert calls.started[5:] == ["slow-2", "slow-3", "slow-4", "slow-5"]
+    assert scheduler.queued == 0 and scheduler.in_flight == 0
+    assert scheduler.get_stats()["completed"]["board"] == 9
+
+
+def test_waiting_calls_start_by_priority_then_age():
+    scheduler = RestScheduler(max_concurrency=1)
+    calls = Calls()
+    submissions = [
+        (Priority.CLEANUP, "message.delete", "blocker"),
+        (Priority.CLEANUP, "message.delete", "cleanup-0"),
+        (Priority.BOARD, "board.edit", "board-0"),
+        (Priority.CLEANUP, "message.send", "cleanup-1"),
+        (Priority.INTERACTION, "interaction.response", "interaction"),
+        (Priority.BOARD, "message.send", "board-1"),
+    ]
+
+    started_first, _ = run_scheduled(scheduler, submissions, calls)
+
+    assert started_first == ["blocker"]
+    assert calls.started == ["blocker", "interaction", "board-0", "board-1", "cleanup-0", "cleanup-1"]
+
+
+def test_cancelled_calls_are_skipped():
+    async def run():
+        scheduler = RestScheduler(max_concurrency=1)
+        calls = Calls()
+        calls.release = asyncio.Event()
+        blocker = asyncio.create_task(scheduler.submit(Priority.BOARD, "board.edit", calls.make("blocker")))
+        cancelled = asyncio.create_task(scheduler.submit(Priority.BOARD, "board.edit", calls.make("cancelled")))
+        kept = asyncio.create_task(scheduler.submit(Priority.BOARD, "board.edit", calls.make("kept")))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        calls.release.set()
+        await asyncio.gather(blocker, kept)
+
+        assert calls.started == ["blocker", "kept"]
+        assert scheduler.queued == 0 and scheduler.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_failed_calls_free_their_slot():
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def run():
+        scheduler = RestScheduler(route_limits={"board.edit": 1})
+        results = await asyncio.gather(*(scheduler.submit(Priority.BOARD, "board.edit", fail) for _ in range(3)),
+                                       return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert scheduler.route_in_flight["board.edit"] == 0 and scheduler.queued == 0
+
+    asyncio.run(run())
@@ -0,0 +1,202 @@
+import asyncio
+import random
+
+import pytest
+
+from application.game_logic import GameLogic
+from application.snapshot import decode_game, encode_game
+from commands.snapshot_store import (DbmSnapshotStore, LobbySnapshot, MemorySnapshotStore, SnapshotWriter,
+                                     SqliteSnapshotStore, open_snapshot_store)
+
+COLORS = ["Red", "Green", "Blue", "Yellow"]
+
+
+def played_game(turns: int = 40, seed: int = 0) -> GameLogic:
+    game_logic = GameLogic()
+    game_logic.start_game(["1", "22", "333"], seed=seed)
+    rng = random.Random(seed)
+    for _ in range(turns):
+        player_id = game_logic.get_current_player().id
+        playable = game_logic.get_playable_cards(player_id)
+        if not playable:
+            game_logic.draw_card(player_id)
+            continue
+        card = rng.choice(playable)
+        if game_logic.get_hand_size(player_id) == 2:
+            game_logic.say_uno(player_id)
+        game_logic.play_card(player_id, card.id)
+        if card.color == "Wild":
+            game_logic.change_wild_card_color(card.id, rng.choice(COLORS))
+        if game_logic.is_winner(player_id):
+            break
+    return game_logic
+
+
+def test_game_snapshot_round_trip():
+    for seed in range(10):
+        game_logic = played_game(seed=seed)
+        data = encode_game(game_logic)
+
+        restored, size = decode_game(data + b"trailing")
+
+        assert size == len(data)
+        assert restored.game_state == game_logic.game_state
+        for player in game_logic.game_state.players:
+            assert restored.get_playable_card_ids(player.id) == game_logic.get_playable_card_ids(player.id)
+            assert [card.code for card in restored.get_player_cards(player.id)] == \
+                [card.code for card in player.hand]
+
+
+def test_game_snapshot_rejects_other_data():
+    data = bytearray(encode_game(played_game()))
+    with pytest.raises(ValueError):
+        decode_game(b"XXXX" + bytes(data[4:]))
+    data[4] += 1
+    with pytest.raises(ValueError):
+        decode_game(bytes(data))
+
+
+def test_lobby_snapshot_round_trip():
+    waiting = LobbySnapshot.decode(LobbySnapshot(10, 20, None, [20, 30], None).encode())
+    assert (waiting.message_id, waiting.initiator_id, waiting.last_player_id, waiting.player_ids) == \
+        (10, 20, None, [20, 30])
+    assert waiting.game_logic is None
+
+    game_logic = played_game()
+    playing = LobbySnapshot.decode(LobbySnapshot(2 ** 63, 1, 333, [1, 22, 333], game_logic).encode())
+    assert (playing.message_id, playing.initiator_id, playing.last_player_id, playing.player_ids) == \
+        (2 ** 63, 1, 333, [1, 22, 333])
+    assert playing.game_logic.game_state == game_logic.game_state
+
+    with pytest.raises(ValueError):
+        LobbySnapshot.decode(b"UNOX" + LobbySnapshot(1, 1, None, [], None).encode()[4:])
+
+
+@pytest.fixture(params=["memory", "sqlite", "dbm"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        store = MemorySnapshotStore()
+    elif request.param == "sqlite":
+        store = SqliteSnapshotStore(str(tmp_path / "lobbies.db"))
+    else:
+        store = DbmSnapshotStore(str(tmp_path / "lobbies"))
+    yield store
+    store.close()
+
+
+def test_store_applies_writes_based_on_the_stored_version(store):
+    assert store.write_batch([((1, 2), 0, b"first"), ((1, 3), 0, b"other")], []) == []
+    assert store.write_batch([((1, 2), 1, b"second")], []) == []
+
+    assert sorted(store.load_all()) == [((1, 2), 2, b"second"), ((1, 3), 1, b"other")]
+    assert store.load_all(lambda key: key[1] == 3) == [((1, 3), 1, b"other")]
+
+
+def test_store_reports_version_conflicts(store):
+    store.write_batch([((1, 2), 0, b"mine")], [])
+    # Another process wrote the lobby since this one read version 1.
+    store.write_batch([((1, 2), 1, b"theirs")], [])
+
+    conflicts = store.write_batch([((1, 2), 1, b"stale"), ((1, 2), 0, b"new"), ((1, 3), 0, b"fresh")], [])
+
+    assert conflicts == [(1, 2), (1, 2)]
+    assert sorted(store.load_all()) == [((1, 2), 2, b"theirs"), ((1, 3), 1, b"fresh")]
+
+
+def test_store_deletes(store):
+    store.write_batch([((1, 2), 0, b"a"), ((1, 3), 0, b"b")], [])
+
+    assert store.write_batch([], [(1, 2), (4, 5)]) == []
+
+    assert store.load_all() == [((1, 3), 1, b"b")]
+    # A deleted lobby starts over at version 0.
+    assert store.write_batch([((1, 2), 0, b"c")], []) == []
+
+
+def test_sqlite_store_keeps_versions_across_connections(tmp_path):
+    path = str(tmp_path / "lobbies.db")
+    first = open_snapshot_store(f"sqlite:{path}")
+    second = open_snapshot_store(path)
+
+    first.write_batch([((1, 2), 0, b"first")], [])
+    assert second.write_batch([((1, 2), 1, b"second")], []) == []
+    assert first.write_batch([((1, 2), 1, b"stale")], []) == [(1, 2)]
+    assert first.load_all() == [((1, 2), 2, b"second")]
+
+    first.close()
+    second.close()
+
+
+def test_open_snapshot_store_rejects_unknown_kinds():
+    assert isinstance(open_snapshot_store("memory:"), MemorySnapshotStore)
+    with pytest.raises(ValueError):
+        open_snapshot_store("redis:localhost")
+
+
+def open_lobby(registry, message_class, user_class):
+    game_ui = registry.get_or_create(1, 2)
+    game_ui.players = [user_class(1), user_class(2)]
+    game_ui.initiator = game_ui.players[0]
+    game_ui.message = message_class()
+    game_ui.game_logic.start_game(["1", "2"], seed=0)
+    return game_ui
+
+
+def test_writer_releases_lobbies_another_process_wrote(tmp_path):
+    pytest.importorskip("discord")
+    from benchmarks.fakes import FakeMessage, FakeUser
+    from commands.game_registry import GameRegistry
+
+    async def run():
+        store = SqliteSnapshotStore(str(tmp_path / "lobbies.db"))
+        registry = GameRegistry()
+        writer = SnapshotWriter(store, interval=60)
+        registry.set_snapshots(writer)
+
+        game_ui = open_lobby(registry, FakeMessage, FakeUser)
+        registry.save_snapshot(game_ui)
+        await writer.flush()
+        assert writer.versions[game_ui.key] == 1
+
+        store.write_batch([(game_ui.key, 1, b"theirs")], [])
+        game_ui.game_logic.draw_card(game_ui.game_logic.get_current_player().id)
+        registry.save_snapshot(game_ui)
+        await writer.flush()
+
+        assert game_ui.key not in registry.games
+        assert game_ui.key not in writer.versions
+        assert writer.get_stats()["conflicts"] == 1
+        assert store.load_all() == [(game_ui.key, 2, b"theirs")]
+        store.close()
+
+    asyncio.run(run())
+
+
+def test_closed_lobby_does_not_overwrite_the_new_lobby():
+    pytest.importorskip("discord")
+    from benchmarks.fakes import FakeMessage, FakeUser
+    from commands.game_registry import GameRegistry
+
+    async def run():
+        store = MemorySnapshotStore()
+        registry = GameRegistry()
+        writer = SnapshotWriter(store, interval=60)
+        registry.set_snapshots(writer)
+
+        closed = open_lobby(registry, FakeMessage, FakeUser)
+        registry.save_snapshot(closed)
+        await writer.flush()
+        registry.remove(closed)
+
+        reopened = open_lobby(registry, FakeMessage, FakeUser)
+        assert reopened is not closed
+        registry.save_snapshot(reopened)
+        # A handler of the closed lobby finishes late and saves it again.
+        registry.save_snapshot(closed)
+        await writer.flush()
+
+        [(key, _, data)] = store.load_all()
+        assert key == reopened.key
+        assert LobbySnapshot.decode(data).message_id == reopened.message.id
+
+    asyncio.run(run())